@@ -0,0 +1,32 @@
+"""add reservation availability index
+
+Revision ID: 4f2a9c1d7e3b
+Revises: 93c8fc6bcbb9
+Create Date: 2026-10-18 10:12:41.512907
+
+"""
+from alembic import op
+from sqlalchemy import text
+
+
+revision = "4f2a9c1d7e3b"
+down_revision = "93c8fc6bcbb9"
+branch_labels = None
+depends_on = None
+
+index_name = "ix_reservation_room_id_dates_scheduled"
+
+
+def upgrade():
+    # Partial index, since CANCELED reservations never take part in the availability checks
+    op.create_index(
+        index_name,
+        "reservation",
+        ["room_id", "start_date", "end_date"],
+        postgresql_where=text("status = 'SCHEDULED'"),
+        sqlite_where=text("status = 'SCHEDULED'"),
+    )
+
+
+def downgrade():
+    op.drop_index(index_name, table_name="reservation")
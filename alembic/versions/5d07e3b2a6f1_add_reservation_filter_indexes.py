@@ -0,0 +1,34 @@
+"""add reservation filter indexes
+
+Revision ID: 5d07e3b2a6f1
+Revises: c81e5b0a94d2
+Create Date: 2026-10-18 14:26:09.437210
+
+"""
+from alembic import op
+
+
+revision = "5d07e3b2a6f1"
+down_revision = "c81e5b0a94d2"
+branch_labels = None
+depends_on = None
+
+room_id_index_name = "ix_reservation_room_id_id"
+guest_id_index_name = "ix_reservation_guest_id_id"
+end_date_index_name = "ix_reservation_end_date"
+
+
+def upgrade():
+    # The id is included so that the pages of the reservations of a room/guest are read in order, straight from the
+    # index (WHERE room_id = :room_id AND id > :after ORDER BY id LIMIT :limit)
+    op.create_index(room_id_index_name, "reservation", ["room_id", "id"])
+    op.create_index(guest_id_index_name, "reservation", ["guest_id", "id"])
+    # Date filters (i.e. the reservations active tonight) look for the reservations that end after a recent date,
+    # which are a small part of the history
+    op.create_index(end_date_index_name, "reservation", ["end_date"])
+
+
+def downgrade():
+    op.drop_index(end_date_index_name, table_name="reservation")
+    op.drop_index(guest_id_index_name, table_name="reservation")
+    op.drop_index(room_id_index_name, table_name="reservation")
@@ -0,0 +1,38 @@
+"""add reservation no overlap constraint
+
+Revision ID: c81e5b0a94d2
+Revises: 4f2a9c1d7e3b
+Create Date: 2026-10-18 11:03:27.180342
+
+"""
+from alembic import op
+
+revision = "c81e5b0a94d2"
+down_revision = "4f2a9c1d7e3b"
+branch_labels = None
+depends_on = None
+
+constraint_name = "excl_reservation_room_id_dates_scheduled"
+
+
+def upgrade():
+    # Exclusion constraints are Postgres specific. Other DBs (i.e. SQLite) rely on the checks done by the API
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    # The room_id is compared as a single-value range so that the constraint can be backed by a plain GiST index
+    # (no need for the btree_gist extension). Date ranges are inclusive ('[]') to match the way the API considers
+    # reservations to overlap
+    op.execute(
+        f"ALTER TABLE reservation ADD CONSTRAINT {constraint_name} EXCLUDE USING gist ("
+        f"int8range(room_id, room_id, '[]') WITH =, "
+        f"tstzrange(start_date, end_date, '[]') WITH &&"
+        f") WHERE (status = 'SCHEDULED')"
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.drop_constraint(constraint_name, "reservation")
@@ -0,0 +1,58 @@
+"""add change feed
+
+Revision ID: fe7e78def571
+Revises: 5d07e3b2a6f1
+Create Date: 2026-10-18 16:02:37.208114
+
+"""
+from alembic import op
+from sqlalchemy import BigInteger, Column, DateTime, String, Text, cast
+from sqlalchemy.sql import func
+
+
+revision = "fe7e78def571"
+down_revision = "5d07e3b2a6f1"
+branch_labels = None
+depends_on = None
+
+tables = ("guest", "room", "reservation")
+tombstone_index_name = "ix_tombstone_entity_type_xact_id_id"
+
+# Id of the transaction that wrote a row. xid8 can't be cast to bigint directly, but its text can
+xact_id = cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+
+
+def get_xact_id_index_name(table: str) -> str:
+    return f"ix_{table}_xact_id_id"
+
+
+def get_xact_id_column() -> Column:
+    return Column("xact_id", BigInteger, nullable=False, server_default=xact_id)
+
+
+def upgrade():
+    # Every write stamps the rows with the id of its transaction. The change feed reads them in that order, starting
+    # where the last sync left off, straight from the index
+    for table in tables:
+        op.add_column(table, get_xact_id_column())
+        op.create_index(get_xact_id_index_name(table), table, ["xact_id", "id"])
+
+    # Deleted entities leave a tombstone behind, so that the change feed can tell clients about them
+    op.create_table(
+        "tombstone",
+        Column("id", BigInteger, primary_key=True),
+        Column("entity_type", String, nullable=False),
+        Column("entity_id", BigInteger, nullable=False),
+        Column("created_at", DateTime(timezone=True), server_default=func.now()),
+        Column("updated_at", DateTime(timezone=True), onupdate=func.now()),
+        get_xact_id_column(),
+    )
+    op.create_index(tombstone_index_name, "tombstone", ["entity_type", "xact_id", "id"])
+
+
+def downgrade():
+    op.drop_index(tombstone_index_name, table_name="tombstone")
+    op.drop_table("tombstone")
+    for table in reversed(tables):
+        op.drop_index(get_xact_id_index_name(table), table_name=table)
+        op.drop_column(table, "xact_id")
@@ -0,0 +1,51 @@
+from typing import Callable
+
+from flask import Response, request
+
+from api.controllers.ConditionalRequests import ConditionalRequests
+from api.entities.CachedResponse import CachedResponse
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ResponseCache import ResponseCache
+from config.Compression import Compression
+
+
+class CachedResponses:
+    """
+    Helpers for the GET endpoints whose responses only change when their entities are written through the service
+    layer (i.e. the pages of rooms and guests), which are served from C{ResponseCache}. Responses are cached by URL and
+    accepted representation (like their ETag, see C{ConditionalRequests}). Hits skip the ORM, the encoder and the
+    compression altogether: the cached body is sent along with its headers, or the copy of it that was compressed for
+    an earlier request (see C{Compression.reuse_compressed_bodies}). Clients that already have it get a 304
+    """
+    @staticmethod
+    def respond(entity_class: type, build_response: Callable[[], Response]) -> Response:
+        """
+        Sends the cached response of the current request, or builds it and caches it
+        :param entity_class: SQLAlchemy entity class of the entities the response lists
+        :param build_response: function that builds the response of the current request, with its ETag
+        :return: response of the current request
+        """
+        key = (request.url, str(request.accept_mimetypes))
+        cached_response = ResponseCache().get(entity_class, key)
+        if cached_response is not None:
+            if ConditionalRequests.is_not_modified(cached_response.etag):
+                return ConditionalRequests.make_not_modified_response(cached_response.etag)
+            response = Response(cached_response.body, status=HttpStatuses.OK.value, headers=cached_response.headers)
+            Compression.reuse_compressed_bodies(response, cached_response.compressed_bodies)
+            return response
+
+        generation = ResponseCache().get_generation(entity_class)
+        response = build_response()
+        etag, _ = response.get_etag()
+        if response.status_code == HttpStatuses.OK.value and not response.is_streamed and etag is not None:
+            cached_response = CachedResponse(
+                response.get_data(),
+                [(k, v) for k, v in response.headers.items() if k in CachedResponses.__CACHED_HEADERS],
+                etag
+            )
+            ResponseCache().put(entity_class, key, cached_response, generation)
+            Compression.reuse_compressed_bodies(response, cached_response.compressed_bodies)
+        return response
+
+    """ Headers of the responses that are cached along with their body """
+    __CACHED_HEADERS = frozenset({"Content-Type", "Link", "ETag"})
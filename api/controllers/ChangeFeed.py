@@ -0,0 +1,130 @@
+import base64
+import binascii
+import json
+from typing import Optional
+
+from flask import Response, request
+from flask_restful import abort
+
+from api.controllers.Pagination import Pagination
+from api.entities.HttpStatuses import HttpStatuses
+from config.JSONSerializer import JSONSerializer
+from db.entities.Tombstone import Tombstone
+
+
+class ChangeFeed:
+    """
+    Helpers for the change feed endpoints, which list the entities of a resource that were created, updated or deleted
+    since the last sync of a client, so that downstream systems (i.e. housekeeping, channel managers) don't have to
+    download everything to find out what changed. Each sync costs as much as the amount of changes since the last one.
+
+    Responses hold the changed entities (as they are now), the deleted ones (their id and when they were deleted) and a
+    cursor. Clients send the cursor back in the C{since} query parameter to get the changes after those; without it,
+    every entity is listed. While C{has_more} is true, there are more changes to fetch right away
+    """
+    @staticmethod
+    def get_changes_args() -> tuple[int, Optional[tuple[int, int]], Optional[tuple[int, int]]]:
+        """
+        Parses the query parameters of the current request, failing the request if they have issues
+        :return: tuple with the max amount of changes (and of deletions) to list, and the points of the feed where the
+        last sync left off: the (xact_id, id) of the last changed entity, and the one of the last tombstone (C{None}
+        for the first sync)
+        """
+        limit, _ = Pagination.get_page_args()
+        if ChangeFeed.SINCE not in request.args:
+            return limit, None, None
+
+        points = ChangeFeed.__decode_cursor(request.args[ChangeFeed.SINCE])
+        if points is None:
+            abort(HttpStatuses.BAD_REQUEST.value,
+                  message=f"Invalid {ChangeFeed.SINCE}. Please provide the cursor of a previous sync")
+        return limit, points[0], points[1]
+
+    @staticmethod
+    def make_response(entities: list, tombstones: list[Tombstone], limit: int,
+                      after_change: Optional[tuple[int, int]],
+                      after_deletion: Optional[tuple[int, int]]) -> Response:
+        """
+        Builds the response of a sync. Callers fetch one change and one deletion more than the limit, so that we know
+        if there are more of them without counting the rows
+        :param entities: changed entities, in the order they changed, plus the first one of the next sync (if any)
+        :param tombstones: tombstones of the deleted entities, in the order they were deleted, plus the first one of the
+        next sync (if any)
+        :param limit: max amount of changes (and of deletions) to return
+        :param after_change: point of the feed where the changes of the last sync left off (see C{get_changes_args})
+        :param after_deletion: point of the feed where the deletions of the last sync left off
+        :return: response with the changes, the deletions and the cursor of the next sync
+        """
+        changes = entities[:limit]
+        deletions = tombstones[:limit]
+        if changes:
+            after_change = (changes[-1].xact_id, changes[-1].id)
+        if deletions:
+            after_deletion = (deletions[-1].xact_id, deletions[-1].id)
+
+        return JSONSerializer.jsonify({
+            ChangeFeed.__CHANGES: changes,
+            ChangeFeed.__DELETIONS: [{ChangeFeed.__ID: x.entity_id, ChangeFeed.__DELETED_AT: x.created_at}
+                                     for x in deletions],
+            ChangeFeed.__CURSOR: ChangeFeed.__encode_cursor(after_change, after_deletion),
+            ChangeFeed.__HAS_MORE: len(entities) > limit or len(tombstones) > limit,
+        })
+
+    @staticmethod
+    def __encode_cursor(after_change: Optional[tuple[int, int]],
+                        after_deletion: Optional[tuple[int, int]]) -> str:
+        """
+        :param after_change: (xact_id, id) of the last changed entity that was synced, if any
+        :param after_deletion: (xact_id, id) of the last tombstone that was synced, if any
+        :return: cursor that points right after them
+        """
+        points = [list(x) if x else None for x in (after_change, after_deletion)]
+        return base64.urlsafe_b64encode(json.dumps(points, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def __decode_cursor(cursor: str) -> Optional[tuple[Optional[tuple[int, int]], ...]]:
+        """
+        :param cursor: cursor built by C{__encode_cursor}
+        :return: tuple with the (xact_id, id) of the last changed entity and the one of the last tombstone the cursor
+        points after (each one C{None} if there wasn't any), or C{None} if the cursor isn't valid
+        """
+        try:
+            after_change, after_deletion = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            return ChangeFeed.__parse_point(after_change), ChangeFeed.__parse_point(after_deletion)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            return None
+
+    @staticmethod
+    def __parse_point(point: Optional[list]) -> Optional[tuple[int, int]]:
+        """
+        :param point: [xact_id, id] point of the feed, as encoded in a cursor, or C{None}
+        :return: (xact_id, id) tuple, or C{None} if there was no point
+        :raises ValueError: if the point isn't valid
+        """
+        if point is None:
+            return None
+        xact_id, entity_id = point
+        if any(not isinstance(x, int) or x <= 0 for x in (xact_id, entity_id)):
+            raise ValueError(f"Invalid point of the change feed: {point}")
+        return xact_id, entity_id
+
+    """ Query parameter with the cursor of the last sync """
+    SINCE = "since"
+
+    """ Key of the changed entities in the responses """
+    __CHANGES = "changes"
+
+    """ Key of the deleted entities in the responses """
+    __DELETIONS = "deletions"
+
+    """ Key of the id of a deleted entity """
+    __ID = "id"
+
+    """ Key of when an entity was deleted """
+    __DELETED_AT = "deleted_at"
+
+    """ Key of the cursor of the next sync in the responses """
+    __CURSOR = "cursor"
+
+    """ Key of whether there are more changes to fetch right away in the responses """
+    __HAS_MORE = "has_more"
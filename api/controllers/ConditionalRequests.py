@@ -0,0 +1,58 @@
+import hashlib
+
+from flask import Response, request
+
+from api.entities.HttpStatuses import HttpStatuses
+
+
+class ConditionalRequests:
+    """
+    Helpers for the GET endpoints that support conditional requests. Their responses carry a strong C{ETag} built from
+    the version of the entities they hold, which is fetched with a cheap query that doesn't load them (see the
+    C{get_version} methods of the services). Clients send it back in the C{If-None-Match} header, and get an empty
+    C{304 Not Modified} response if nothing changed, without the entities being loaded or serialized. The ETag turns
+    weak when the response is compressed (see C{Compression}), so it's compared with the weak comparison.
+    Rooms and guests are fetched from C{EntityCache} instead, so their ETag is built from the snapshot being sent (see
+    C{get_entity_version}): a version fetched from the DB could be newer than the cached body, and pin clients to it
+    """
+    @staticmethod
+    def make_etag(version: tuple) -> str:
+        """
+        Builds the ETag of the response for the current request. Besides the version of the entities, the body of the
+        response depends on the query parameters (i.e. the page, or its fields) and the representation the client
+        accepts (see C{Streaming}), so they're part of the ETag as well
+        :param version: version of the entities the response holds
+        :return: ETag of the response (unquoted)
+        """
+        representation = repr((request.full_path, str(request.accept_mimetypes), version))
+        return hashlib.sha1(representation.encode()).hexdigest()
+
+    @staticmethod
+    def get_entity_version(entity) -> tuple:
+        """
+        Builds the version of an entity that's already loaded, from its timestamps (the ones of
+        C{AbstractDAO.generic_get_version})
+        :param entity: SQLAlchemy entity, or a snapshot of it (see C{EntityCache})
+        :return: tuple that changes whenever the entity is updated
+        """
+        return entity.created_at, entity.updated_at
+
+    @staticmethod
+    def is_not_modified(etag: str) -> bool:
+        """
+        Checks if the client of the current request already has the response with the ETag
+        :param etag: ETag of the response (see C{make_etag})
+        :return: C{True} if the client sent the ETag in the C{If-None-Match} header, C{False} otherwise
+        """
+        return request.if_none_match.contains_weak(etag)
+
+    @staticmethod
+    def make_not_modified_response(etag: str) -> Response:
+        """
+        Builds the response for a client that already has the latest version of the response
+        :param etag: ETag of the response (see C{make_etag})
+        :return: empty 304 response
+        """
+        response = Response(status=HttpStatuses.NOT_MODIFIED.value)
+        response.set_etag(etag)
+        return response
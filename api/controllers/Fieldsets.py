@@ -0,0 +1,53 @@
+from typing import Any, Optional
+
+from flask import request
+from flask_restful import abort
+
+from api.entities.ErrorMessages import ErrorMessages
+from api.entities.HttpStatuses import HttpStatuses
+
+
+class Fieldsets:
+    """
+    Helpers for the GET endpoints that can return sparse fieldsets: clients list the fields they need in the C{fields}
+    query parameter (comma separated), and only those are loaded from the DB and serialized. The id of the entities is
+    always included
+    """
+    @staticmethod
+    def get_fields(response_fields: frozenset[str]) -> Optional[tuple[str, ...]]:
+        """
+        Parses the C{fields} query parameter of the current request, failing the request if it lists unknown fields
+        :param response_fields: fields that the entities of the endpoint have
+        :return: tuple with the id followed by the requested fields, or C{None} if every field was requested
+        """
+        if Fieldsets.FIELDS not in request.args:
+            return None
+
+        fields = [x.strip() for x in request.args[Fieldsets.FIELDS].split(",") if x.strip()]
+        unknown_fields = set(fields) - response_fields
+        if not fields or unknown_fields:
+            abort(HttpStatuses.BAD_REQUEST.value,
+                  message=ErrorMessages.UNKNOWN_FIELDS_ERROR_MESSAGE.value.replace(
+                      "FIELDS", ", ".join(sorted(unknown_fields))
+                  ).replace("ALLOWED", ", ".join(sorted(response_fields))))
+
+        # Fields are listed in the order they were requested, without duplicates
+        return tuple(dict.fromkeys([Fieldsets.__ID_FIELD] + fields))
+
+    @staticmethod
+    def trim(entity: Any, fields: Optional[tuple[str, ...]]) -> Any:
+        """
+        Trims an entity down to the requested fields, for serialization
+        :param entity: entity to trim
+        :param fields: fields to keep (see C{get_fields}), or C{None} to keep all of them
+        :return: dictionary with the requested fields of the entity, or the entity itself if every field was requested
+        """
+        if fields is None:
+            return entity
+        return {x: getattr(entity, x) for x in fields}
+
+    """ Query parameter with the fields to return """
+    FIELDS = "fields"
+
+    """ Field that identifies the entities, which is always returned """
+    __ID_FIELD = "id"
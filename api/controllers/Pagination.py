@@ -0,0 +1,90 @@
+import base64
+import binascii
+from typing import Optional
+from urllib.parse import urlencode
+
+from flask import Response, make_response, request
+from flask_restful import abort
+
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.QueryParameters import QueryParameters
+from api.entities.HttpStatuses import HttpStatuses
+from config.JSONSerializer import JSONSerializer
+
+
+class Pagination:
+    """
+    Helpers for the collection endpoints, which are paginated by id with a cursor (keyset pagination). Each page is
+    fetched with an indexed C{WHERE id > :cursor ORDER BY id LIMIT n} query, so deep pages cost the same as the first.
+
+    The cursor is opaque to clients: they get it from the C{Link} header (rel="next") of a page, and send it back as
+    the C{after} query parameter to get the next one
+    """
+    @staticmethod
+    def get_page_args() -> tuple[int, Optional[int]]:
+        """
+        Parses the pagination query parameters of the current request, failing the request if they have issues
+        :return: tuple with the page size and the id after which the page starts (C{None} for the first page)
+        """
+        limit = min(QueryParameters.get_positive_int(Pagination.LIMIT) or Pagination.__DEFAULT_PAGE_SIZE,
+                    Pagination.__MAX_PAGE_SIZE)
+
+        after_id = None
+        if Pagination.AFTER in request.args:
+            after_id = Pagination.__decode_cursor(request.args[Pagination.AFTER])
+            if after_id is None:
+                abort(HttpStatuses.BAD_REQUEST.value,
+                      message=f"Invalid {Pagination.AFTER}. Please provide the cursor of a previous page")
+        return limit, after_id
+
+    @staticmethod
+    def make_page_response(entities: list, limit: int, fields: Optional[tuple[str, ...]] = None) -> Response:
+        """
+        Builds the response for a page. Callers fetch one entity more than the page size, so that we know if there's
+        a next page without counting the rows. If there is, the response includes a C{Link} header pointing to it
+        :param entities: entities of the page, ordered by id, plus the first entity of the next page (if any)
+        :param limit: page size
+        :param fields: if included, only these fields of the entities are returned (see C{Fieldsets})
+        :return: response with the entities of the page
+        """
+        response = make_response(JSONSerializer.jsonify([Fieldsets.trim(x, fields) for x in entities[:limit]]),
+                                 HttpStatuses.OK.value)
+
+        if len(entities) > limit:
+            next_page_args = request.args.to_dict()
+            next_page_args[Pagination.AFTER] = Pagination.__encode_cursor(entities[limit - 1].id)
+            response.headers["Link"] = f'<{request.base_url}?{urlencode(next_page_args)}>; rel="next"'
+
+        return response
+
+    @staticmethod
+    def __encode_cursor(entity_id: int) -> str:
+        """
+        :param entity_id: id of the last entity of a page
+        :return: cursor that points right after the entity
+        """
+        return base64.urlsafe_b64encode(str(entity_id).encode()).decode().rstrip("=")
+
+    @staticmethod
+    def __decode_cursor(cursor: str) -> Optional[int]:
+        """
+        :param cursor: cursor built by C{__encode_cursor}
+        :return: id of the entity the cursor points after, or C{None} if the cursor isn't valid
+        """
+        try:
+            entity_id = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+        return QueryParameters.parse_positive_int(entity_id)
+
+    """ Query parameter with the max amount of entities per page """
+    LIMIT = "limit"
+
+    """ Query parameter with the cursor of the page """
+    AFTER = "after"
+
+    """ Amount of entities returned per page, if no limit is specified """
+    __DEFAULT_PAGE_SIZE = 50
+
+    """ Max amount of entities that can be returned per page """
+    __MAX_PAGE_SIZE = 500
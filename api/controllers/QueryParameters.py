@@ -0,0 +1,39 @@
+from typing import Optional
+
+from flask import request
+from flask_restful import abort
+
+from api.entities.HttpStatuses import HttpStatuses
+
+
+class QueryParameters:
+    """
+    Helpers to parse the query parameters of the current request that aren't tied to a single endpoint
+    """
+    @staticmethod
+    def get_positive_int(field: str) -> Optional[int]:
+        """
+        Parses an optional integer query parameter, failing the request if it's not a positive integer
+        :param field: name of the query parameter
+        :return: parsed integer, or C{None} if the parameter wasn't included
+        """
+        if field not in request.args:
+            return None
+
+        value = QueryParameters.parse_positive_int(request.args[field])
+        if value is None:
+            abort(HttpStatuses.BAD_REQUEST.value, message=f"Invalid {field}. Please provide a positive integer")
+        return value
+
+    @staticmethod
+    def parse_positive_int(value: str) -> Optional[int]:
+        """
+        Parses a positive integer. Only ASCII digits are accepted: C{str.isdigit} accepts other Unicode digits (i.e.
+        C{²}), which C{int} rejects
+        :param value: value to parse
+        :return: parsed integer, or C{None} if the value isn't a positive integer
+        """
+        if not value.isascii() or not value.isdigit():
+            return None
+        parsed_value = int(value)
+        return parsed_value if parsed_value > 0 else None
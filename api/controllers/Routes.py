@@ -11,24 +11,51 @@ class Routes(Enum):
     """ API routes pertaining operations with the Guest entity """
     GUESTS = f"{API_BASE}/guests"
 
+    """ API route to fetch the guests that changed since the last sync """
+    GUESTS_CHANGES = f"{GUESTS}/changes"
+
     """ API routes pertaining operations with the Guest entity by id """
     GUESTS_BY_ID = f"{GUESTS}/<int:guest_id>"
 
     """ API routes pertaining operations with the Room entity """
     ROOMS = f"{API_BASE}/rooms"
 
+    """ API route to fetch the rooms that changed since the last sync """
+    ROOMS_CHANGES = f"{ROOMS}/changes"
+
     """ API routes pertaining operations with the Room entity by id """
     ROOMS_BY_ID = f"{ROOMS}/<int:room_id>"
 
+    """ API route to fetch the free/occupied nights of several rooms """
+    ROOMS_CALENDAR = f"{ROOMS}/calendar"
+
+    """ API route to fetch the free/occupied nights of a room """
+    ROOMS_CALENDAR_BY_ID = f"{ROOMS_BY_ID}/calendar"
+
+    """ API route to search for the rooms that are available for a date range """
+    ROOMS_AVAILABLE = f"{ROOMS}/available"
+
     """ API routes pertaining operations with the Reservation entity """
     RESERVATIONS = f"{API_BASE}/reservations"
 
+    """ API route to fetch the reservations that changed since the last sync """
+    RESERVATIONS_CHANGES = f"{RESERVATIONS}/changes"
+
+    """ API route to create several reservations at once """
+    RESERVATIONS_BULK = f"{RESERVATIONS}/bulk"
+
     """ API routes pertaining operations with the Reservation entity by id """
     RESERVATIONS_BY_ID = f"{RESERVATIONS}/<int:reservation_id>"
 
     """ Custom method to quickly check the availability of a room """
     ROOM_AVAILABILITY = f"{API_BASE}/check_room_availability"
 
+    """ Custom method to check the availability of several rooms and date ranges at once """
+    ROOM_AVAILABILITY_BATCH = f"{ROOM_AVAILABILITY}/batch"
+
+    """ URL for the landing page """
+    INDEX = "/"
+
     """ URL for swagger UI """
     SWAGGER = "/swagger"
 
@@ -0,0 +1,43 @@
+from typing import Iterable, Optional
+
+from flask import Response, request, stream_with_context
+
+from api.controllers.Fieldsets import Fieldsets
+from config.JSONSerializer import JSONSerializer
+
+
+class Streaming:
+    """
+    Helpers for the collection endpoints that can stream all of their entities as newline delimited JSON (NDJSON), one
+    entity per line. Entities are serialized and sent as they're read from the DB, instead of building the whole list
+    and JSON string in memory before sending a byte. Clients ask for it with the C{Accept: application/x-ndjson} header
+    """
+    @staticmethod
+    def is_requested() -> bool:
+        """
+        Checks if the client of the current request prefers NDJSON over regular JSON
+        :return: C{True} if the response should be streamed, C{False} otherwise
+        """
+        return request.accept_mimetypes.best_match((Streaming.__JSON_MIMETYPE, Streaming.NDJSON_MIMETYPE)) == \
+            Streaming.NDJSON_MIMETYPE
+
+    @staticmethod
+    def make_response(entities: Iterable, fields: Optional[tuple[str, ...]] = None) -> Response:
+        """
+        Builds a response that streams the entities as NDJSON. The entities are iterated over while the response is
+        being sent, within the context of the request (i.e. its DB session)
+        :param entities: entities to stream, which are only read from the DB as they're iterated over
+        :param fields: if included, only these fields of the entities are streamed (see C{Fieldsets})
+        :return: streamed response
+        """
+        def generate_lines():
+            for entity in entities:
+                yield JSONSerializer.dumps(Fieldsets.trim(entity, fields)) + b"\n"
+
+        return Response(stream_with_context(generate_lines()), mimetype=Streaming.NDJSON_MIMETYPE)
+
+    """ Mimetype of newline delimited JSON """
+    NDJSON_MIMETYPE = "application/x-ndjson"
+
+    """ Mimetype of regular JSON, which is preferred when the client accepts both """
+    __JSON_MIMETYPE = "application/json"
@@ -0,0 +1,79 @@
+from datetime import datetime
+
+from flask import request
+from flask_restful import Resource, abort
+
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.Pagination import Pagination
+from api.controllers.QueryParameters import QueryParameters
+from api.controllers.custom.CustomFields import ALLOWED_GET_FIELDS, CustomFields, REQUIRED_GET_FIELDS
+from api.controllers.room.RoomFields import RESPONSE_FIELDS
+from api.entities.ErrorMessages import ErrorMessages
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.RoomService import RoomService
+from utils.DateUtils import DateUtils
+
+
+class AvailableRoomsController(Resource):
+    """
+    Custom controller to search for the rooms that are available for a date range and amount of guests
+    """
+    def get(self):
+        """
+        Method to handle http GET requests for this route.
+        This method lists the active rooms that can hold the amount of guests and are available between the specified
+        start and end dates. Results are paginated by id, like the rest of the collections (see C{Pagination}). The
+        C{fields} query parameter trims the rooms down to a sparse fieldset (see C{Fieldsets})
+        :return: HTTP Code indicating the result of the action and the page of available rooms
+        """
+        self.__validate_get(request.args)
+        start_date = self.__parse_date(CustomFields.START_DATE.value)
+        end_date = self.__parse_date(CustomFields.END_DATE.value)
+
+        # Check that start_date and end_date have tz info. Otherwise, reject the request
+        if start_date.tzinfo is None or end_date.tzinfo is None:
+            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
+
+        if end_date <= start_date:
+            abort(HttpStatuses.BAD_REQUEST.value, message="The end_date must be after the start_date")
+
+        guests = QueryParameters.get_positive_int(CustomFields.GUESTS.value)
+        limit, after_id = Pagination.get_page_args()
+        fields = Fieldsets.get_fields(RESPONSE_FIELDS)
+
+        # Fetch an extra room to know if there's a next page
+        rooms = RoomService.get_available(start_date, end_date, guests, limit + 1, after_id, fields)
+        return Pagination.make_page_response(rooms, limit, fields)
+
+    def __parse_date(self, field: str) -> datetime:
+        """
+        Parses a date query parameter, failing the request if it's not a valid ISO 8601 datetime
+        :param field: name of the query parameter
+        :return: parsed datetime
+        """
+        try:
+            return DateUtils.convert_str_to_datetime(request.args[field])
+        except ValueError:
+            abort(HttpStatuses.BAD_REQUEST.value, message=f"Invalid {field}. Please provide an ISO 8601 datetime")
+
+    def __validate_get(self, get_request: dict):
+        """
+        Performs validations on the GET request query parameters and fails the request if they have issues
+        :param get_request: GET request query parameters
+        """
+        error_message = ""
+
+        unknown_fields = get_request.keys() - ALLOWED_GET_FIELDS
+        if len(unknown_fields) > 0:
+            error_message = ErrorMessages.UNKNOWN_QUERY_PARAMETER_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(unknown_fields))
+
+        missing_required_fields = REQUIRED_GET_FIELDS - get_request.keys()
+        if len(missing_required_fields) > 0:
+            error_message = ErrorMessages.REQUEST_MISSING_REQUIRED_QUERY_PARAMETERS_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(missing_required_fields))
+
+        if error_message:
+            abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
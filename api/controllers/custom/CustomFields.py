@@ -10,6 +10,14 @@ class CustomFields(Enum):
 
     END_DATE = "end_date"
 
+    GUESTS = "guests"
+
+    LIMIT = "limit"
+
+    AFTER = "after"
+
+    FIELDS = "fields"
+
 
 """ Collection of allowed fields for the POST operation """
 ALLOWED_POST_FIELDS = frozenset((
@@ -31,3 +39,26 @@ REQUIRED_POST_FIELDS = frozenset((
 """ Make sure this collection makes sense """
 assert all([CustomFields(x) for x in REQUIRED_POST_FIELDS])
 assert REQUIRED_POST_FIELDS.issubset(ALLOWED_POST_FIELDS)
+
+""" Collection of allowed query parameters for the GET operation (listing available rooms) """
+ALLOWED_GET_FIELDS = frozenset((
+    CustomFields.START_DATE.value,
+    CustomFields.END_DATE.value,
+    CustomFields.GUESTS.value,
+    CustomFields.LIMIT.value,
+    CustomFields.AFTER.value,
+    CustomFields.FIELDS.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([CustomFields(x) for x in ALLOWED_GET_FIELDS])
+
+""" Collection of required query parameters for the GET operation (listing available rooms) """
+REQUIRED_GET_FIELDS = frozenset((
+    CustomFields.START_DATE.value,
+    CustomFields.END_DATE.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([CustomFields(x) for x in REQUIRED_GET_FIELDS])
+assert REQUIRED_GET_FIELDS.issubset(ALLOWED_GET_FIELDS)
@@ -0,0 +1,57 @@
+from flask import make_response, request
+from flask_restful import Resource, abort
+
+from api.controllers.custom.RoomAvailabilityController import RoomAvailabilityController
+from api.entities.ErrorMessages import ErrorMessages
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ReservationService import ReservationService
+from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
+
+
+class RoomAvailabilityBatchController(Resource):
+    """
+    Custom controller to check for the availability of several rooms and date ranges in a single request
+    """
+    def post(self):
+        """
+        Method to handle http POST requests for this route.
+        This method checks for the availability of each Room between the specified start and end dates
+        :return: list of booleans, in the same order as the request items. C{True} if the room is available for that
+        item, C{False} otherwise
+        """
+        self.__validate_post(request.json)
+
+        # Every item follows the same rules as a single availability request
+        availability_requests = [RoomAvailabilityController.parse_availability_request(x) for x in request.json]
+
+        missing_room_ids = RoomService.get_missing_ids({x[0] for x in availability_requests})
+        if missing_room_ids:
+            abort(HttpStatuses.NOT_FOUND.value,
+                  message=f"{ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value} "
+                          f"room_id(s): {', '.join(str(x) for x in sorted(missing_room_ids))}")
+
+        are_rooms_available = ReservationService.check_rooms_availability(availability_requests)
+        return make_response(JSONSerializer.jsonify(are_rooms_available), HttpStatuses.OK.value)
+
+    def __validate_post(self, post_request: list):
+        """
+        Performs validations on the POST request and fails the request if its data has issues
+        :param post_request: POST request data
+        """
+        error_message = ""
+
+        if not isinstance(post_request, list):
+            abort(HttpStatuses.BAD_REQUEST.value)
+
+        if len(post_request) <= 0:
+            error_message = ErrorMessages.EMPTY_BODY_ERROR_MESSAGE.value
+
+        if len(post_request) > RoomAvailabilityBatchController.__MAX_ITEMS:
+            error_message = f"A single request can check up to {RoomAvailabilityBatchController.__MAX_ITEMS} items"
+
+        if error_message:
+            abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
+
+    """ Max amount of items that can be checked in a single request """
+    __MAX_ITEMS = 1000
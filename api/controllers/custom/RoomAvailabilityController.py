@@ -1,4 +1,6 @@
-from flask import jsonify, make_response, request
+from datetime import datetime
+
+from flask import make_response, request
 from flask_restful import Resource, abort
 from sqlalchemy.exc import NoResultFound
 
@@ -7,6 +9,7 @@ from api.entities.ErrorMessages import ErrorMessages
 from api.entities.HttpStatuses import HttpStatuses
 from api.service.ReservationService import ReservationService
 from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
 from utils.DateUtils import DateUtils
 
 
@@ -20,43 +23,57 @@ class RoomAvailabilityController(Resource):
         This method checks for the availability of a given Room between the specified start and end dates
         :return: C{True} if the room is available, C{False} otherwise
         """
-        self.__validate_post(request.json)
-        start_date = DateUtils.convert_str_to_datetime(request.json[CustomFields.START_DATE.value])
-        end_date = DateUtils.convert_str_to_datetime(request.json[CustomFields.END_DATE.value])
-
-        # Check that start_date and end_date have tz info. Otherwise, reject the request
-        if start_date.tzinfo is None or end_date.tzinfo is None:
-            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
-
-        room_id = request.json[CustomFields.ROOM_ID.value]
+        room_id, start_date, end_date = RoomAvailabilityController.parse_availability_request(request.json)
         try:
             RoomService.get_by_id(room_id)
         except NoResultFound:
             abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
         is_room_available = ReservationService.check_room_availability(room_id, start_date, end_date)
-        return make_response(jsonify(is_room_available), HttpStatuses.OK.value)
+        return make_response(JSONSerializer.jsonify(is_room_available), HttpStatuses.OK.value)
 
-    def __validate_post(self, post_request: dict):
+    @staticmethod
+    def parse_availability_request(availability_request: dict) -> tuple[int, datetime, datetime]:
         """
-        Performs validations on the POST request and fails the request if its data has issues
-        :param post_request: POST request data
+        Validates an availability request (failing the http request if its data has issues) and parses its fields
+        :param availability_request: availability request data, with the room_id, start_date and end_date
+        :return: tuple of (room_id, start_date, end_date)
+        """
+        RoomAvailabilityController.__validate_availability_request(availability_request)
+        start_date = DateUtils.convert_str_to_datetime(availability_request[CustomFields.START_DATE.value])
+        end_date = DateUtils.convert_str_to_datetime(availability_request[CustomFields.END_DATE.value])
+
+        # Check that start_date and end_date have tz info. Otherwise, reject the request
+        if start_date.tzinfo is None or end_date.tzinfo is None:
+            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
+
+        return availability_request[CustomFields.ROOM_ID.value], start_date, end_date
+
+    @staticmethod
+    def __validate_availability_request(availability_request: dict):
+        """
+        Performs validations on the availability request and fails the request if its data has issues
+        :param availability_request: availability request data
         """
         error_message = ""
 
-        if not isinstance(post_request, dict):
+        if not isinstance(availability_request, dict):
             abort(HttpStatuses.BAD_REQUEST.value)
 
-        if len(post_request.keys()) <= 0:
+        if len(availability_request.keys()) <= 0:
             error_message = ErrorMessages.EMPTY_BODY_ERROR_MESSAGE.value
 
-        unknown_fields = post_request.keys() - ALLOWED_POST_FIELDS
+        room_id = availability_request.get(CustomFields.ROOM_ID.value)
+        if room_id is not None and (not isinstance(room_id, int) or room_id <= 0):
+            error_message = f"Invalid room_id {room_id}. Please provide a valid 'room_id'"
+
+        unknown_fields = availability_request.keys() - ALLOWED_POST_FIELDS
         if len(unknown_fields) > 0:
             error_message = ErrorMessages.UNKNOWN_VALUE_IN_REQUEST_BODY_ERROR_MESSAGE.value.replace(
                 "FIELDS",
                 ", ".join(unknown_fields))
 
-        missing_required_fields = REQUIRED_POST_FIELDS - post_request.keys()
+        missing_required_fields = REQUIRED_POST_FIELDS - availability_request.keys()
         if len(missing_required_fields) > 0:
             error_message = ErrorMessages.REQUEST_MISSING_REQUIRED_FIELDS_ERROR_MESSAGE.value.replace(
                 "FIELDS",
@@ -1,11 +1,14 @@
-from flask import jsonify, request
+from flask import request
 from flask_restful import Resource, abort
 from sqlalchemy.exc import NoResultFound
 
-from api.controllers.guest.GuestFields import ALLOWED_PUT_FIELDS, REQUIRED_PUT_FIELDS
+from api.controllers.ConditionalRequests import ConditionalRequests
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.guest.GuestFields import ALLOWED_PUT_FIELDS, REQUIRED_PUT_FIELDS, RESPONSE_FIELDS
 from api.entities.ErrorMessages import ErrorMessages
 from api.entities.HttpStatuses import HttpStatuses
 from api.service.GuestService import GuestService
+from config.JSONSerializer import JSONSerializer
 
 
 class GuestByIdController(Resource):
@@ -14,17 +17,28 @@ class GuestByIdController(Resource):
     """
     def get(self, guest_id: int):
         """
-        Method to handle http GET requests for this resource, which fetches a single guest
+        Method to handle http GET requests for this resource, which fetches a single guest.
+        The C{fields} query parameter trims it down to a sparse fieldset (see C{Fieldsets}). The response carries an
+        C{ETag}: if the guest didn't change, polling clients get a 304 (see C{ConditionalRequests})
         :param guest_id: id of the guest to be fetched
         :return: HTTP Code indicating the result of the action and the fetched resource
         """
+        fields = Fieldsets.get_fields(RESPONSE_FIELDS)
+
         guest = None
         try:
             guest = GuestService.get_by_id(guest_id)
         except NoResultFound:
             abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
-        return jsonify(guest)
+        # The guest may come from the cache, so its ETag is built from the version that's sent, not the one in the DB
+        etag = ConditionalRequests.make_etag(ConditionalRequests.get_entity_version(guest))
+        if ConditionalRequests.is_not_modified(etag):
+            return ConditionalRequests.make_not_modified_response(etag)
+
+        response = JSONSerializer.jsonify(Fieldsets.trim(guest, fields))
+        response.set_etag(etag)
+        return response
 
     def put(self, guest_id: int):
         """
@@ -36,12 +50,11 @@ class GuestByIdController(Resource):
 
         guest = None
         try:
-            GuestService.update(guest_id, request.json)
-            guest = GuestService.get_by_id(guest_id)
+            guest = GuestService.update(guest_id, request.json)
         except NoResultFound:
             abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
-        return jsonify(guest)
+        return JSONSerializer.jsonify(guest)
 
     def delete(self, guest_id: int):
         """
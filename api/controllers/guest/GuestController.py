@@ -1,11 +1,17 @@
-from flask import jsonify, make_response, request
+from flask import Response, make_response, request
 from flask_restful import Resource, abort
-from sqlalchemy.exc import NoResultFound
 
-from api.controllers.guest.GuestFields import ALLOWED_POST_FIELDS, REQUIRED_POST_FIELDS
+from api.controllers.CachedResponses import CachedResponses
+from api.controllers.ConditionalRequests import ConditionalRequests
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.Pagination import Pagination
+from api.controllers.guest.GuestFields import ALLOWED_GET_FIELDS, ALLOWED_POST_FIELDS, REQUIRED_POST_FIELDS, \
+    RESPONSE_FIELDS
 from api.entities.ErrorMessages import ErrorMessages
 from api.entities.HttpStatuses import HttpStatuses
 from api.service.GuestService import GuestService
+from config.JSONSerializer import JSONSerializer
+from db.entities.Guest import Guest
 
 
 class GuestController(Resource):
@@ -14,10 +20,15 @@ class GuestController(Resource):
     """
     def get(self):
         """
-        Method to handle http GET requests for this resource, which fetches all guests
-        :return: HTTP Code indicating the result of the action and the fetched resource
+        Method to handle http GET requests for this resource, which lists the guests a page at a time. Pages are
+        ordered by id: if there are more guests, the response includes a C{Link} header pointing to the next page.
+        The C{fields} query parameter trims the guests down to a sparse fieldset (see C{Fieldsets}).
+        Pages carry an C{ETag}: if none of their guests changed, polling clients get a 304 (see C{ConditionalRequests}).
+        Pages are cached until a guest is written (see C{CachedResponses})
+        :return: HTTP Code indicating the result of the action and the page of guests
         """
-        return jsonify(GuestService.get_all())
+        self.__validate_get(request.args)
+        return CachedResponses.respond(Guest, self.__get_page)
 
     def post(self):
         """
@@ -26,14 +37,25 @@ class GuestController(Resource):
         """
         self.__validate_post(request.json)
 
-        guest = None
-        try:
-            guest_id = GuestService.create(request.json)
-            guest = GuestService.get_by_id(guest_id)
-        except NoResultFound:
-            abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
+        guest = GuestService.create(request.json)
+        return make_response(JSONSerializer.jsonify(guest), HttpStatuses.CREATED.value)
 
-        return make_response(jsonify(guest), HttpStatuses.CREATED.value)
+    def __get_page(self) -> Response:
+        """
+        Builds the response with the page of guests of the current request
+        :return: response with the page of guests, or an empty 304 if the client already has it
+        """
+        limit, after_id = Pagination.get_page_args()
+        fields = Fieldsets.get_fields(RESPONSE_FIELDS)
+
+        etag = ConditionalRequests.make_etag(GuestService.get_page_version(after_id))
+        if ConditionalRequests.is_not_modified(etag):
+            return ConditionalRequests.make_not_modified_response(etag)
+
+        # Fetch an extra guest to know if there's a next page
+        response = Pagination.make_page_response(GuestService.get_page(limit + 1, after_id, fields), limit, fields)
+        response.set_etag(etag)
+        return response
 
     def __validate_post(self, create_request: dict):
         """
@@ -62,3 +84,13 @@ class GuestController(Resource):
 
         if error_message:
             abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
+
+    def __validate_get(self, get_request: dict):
+        """
+        Performs validations on the GET request query parameters and fails the request if they have issues
+        :param get_request: GET request query parameters
+        """
+        unknown_fields = get_request.keys() - ALLOWED_GET_FIELDS
+        if len(unknown_fields) > 0:
+            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.UNKNOWN_QUERY_PARAMETER_ERROR_MESSAGE.value
+                  .replace("FIELDS", ", ".join(unknown_fields)))
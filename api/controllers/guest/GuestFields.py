@@ -1,5 +1,9 @@
 from enum import Enum
 
+from api.controllers.ChangeFeed import ChangeFeed
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.Pagination import Pagination
+
 
 class GuestFields(Enum):
     """ Collection of fields related to the guest resource for validation purposes """
@@ -58,3 +62,30 @@ REQUIRED_PUT_FIELDS = frozenset(())
 """ Make sure this collection makes sense """
 assert all([GuestFields(x) for x in REQUIRED_PUT_FIELDS])
 assert REQUIRED_PUT_FIELDS.issubset(ALLOWED_PUT_FIELDS)
+
+""" Collection of allowed query parameters for the GET operation (listing the guests) """
+ALLOWED_GET_FIELDS = frozenset((
+    Pagination.LIMIT,
+    Pagination.AFTER,
+    Fieldsets.FIELDS,
+))
+
+""" Collection of allowed query parameters for the GET operation of the change feed of the guests """
+ALLOWED_CHANGES_GET_FIELDS = frozenset((
+    Pagination.LIMIT,
+    ChangeFeed.SINCE,
+))
+
+""" Collection of the fields of the guests in the responses, which can be requested as a sparse fieldset """
+RESPONSE_FIELDS = frozenset((
+    GuestFields.ID.value,
+    GuestFields.DOCUMENT.value,
+    GuestFields.FIRST_NAME.value,
+    GuestFields.LAST_NAME.value,
+    GuestFields.IS_ACTIVE.value,
+    GuestFields.CREATED_AT.value,
+    GuestFields.UPDATED_AT.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([GuestFields(x) for x in RESPONSE_FIELDS])
@@ -0,0 +1,133 @@
+from flask import make_response, request
+from flask_restful import Resource, abort
+
+from api.controllers.reservation.ReservationFields import ALLOWED_BULK_POST_FIELDS, ALLOWED_POST_FIELDS, \
+    REQUIRED_BULK_POST_FIELDS, REQUIRED_POST_FIELDS, ReservationFields
+from api.entities.APIErrors import ReservationError
+from api.entities.ErrorMessages import ErrorMessages
+from api.entities.HttpStatuses import HttpStatuses
+from api.entities.ReservationStatus import ReservationStatus
+from api.service.ReservationService import ReservationService
+from config.JSONSerializer import JSONSerializer
+from utils.DateUtils import DateUtils
+
+
+class ReservationBulkController(Resource):
+    """
+    Controller to create several reservations in a single request (i.e. group bookings)
+    """
+    def post(self):
+        """
+        Method to handle http POST requests for this resource.
+        Every reservation follows the same rules as the ones created one at a time, and they are all created in a
+        single transaction. By default, no reservation is created unless all of them are valid. If C{all_or_nothing}
+        is C{false}, the valid ones are created regardless of the others
+        :return: HTTP Code indicating the result of the action, and the result of each reservation in the same order
+        """
+        self.__validate_post(request.json)
+        create_requests = request.json[ReservationFields.RESERVATIONS.value]
+        all_or_nothing = request.json.get(ReservationFields.ALL_OR_NOTHING.value, True)
+
+        # Reservations with invalid values are failed right away, the rest go through the business logic validations
+        results = [self.__validate_item(x) for x in create_requests]
+        valid_create_requests = [x for x, error in zip(create_requests, results) if error is None]
+        if valid_create_requests and (not all_or_nothing or len(valid_create_requests) == len(create_requests)):
+            created_results = iter(ReservationService.create_many(valid_create_requests, all_or_nothing))
+            results = [next(created_results) if x is None else x for x in results]
+        else:
+            not_created_error = ReservationError(ErrorMessages.RESERVATION_NOT_CREATED_ERROR_MESSAGE.value)
+            results = [not_created_error if x is None else x for x in results]
+
+        created = sum(not isinstance(x, ReservationError) for x in results)
+        if created == len(results):
+            status_code = HttpStatuses.CREATED.value
+        elif created == 0:
+            status_code = HttpStatuses.BAD_REQUEST.value
+        else:
+            status_code = HttpStatuses.MULTI_STATUS.value
+
+        return make_response(JSONSerializer.jsonify([
+            {"status": HttpStatuses.BAD_REQUEST.value, "message": x.args[0]} if isinstance(x, ReservationError) else
+            {"status": HttpStatuses.CREATED.value, "reservation": x}
+            for x in results
+        ]), status_code)
+
+    def __validate_item(self, create_request: dict):
+        """
+        Performs validations on one of the reservations of the request. Unlike the rest of the validations, this one
+        doesn't fail the request, so that the other reservations can still be created
+        :param create_request: data of the reservation
+        :return: C{None} if the reservation is valid, or a C{ReservationError} describing its issues otherwise
+        """
+        if not isinstance(create_request, dict) or len(create_request.keys()) <= 0:
+            return ReservationError(ErrorMessages.EMPTY_BODY_ERROR_MESSAGE.value)
+
+        unknown_fields = create_request.keys() - ALLOWED_POST_FIELDS
+        if len(unknown_fields) > 0:
+            return ReservationError(ErrorMessages.UNKNOWN_VALUE_IN_REQUEST_BODY_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(unknown_fields)))
+
+        missing_required_fields = REQUIRED_POST_FIELDS - create_request.keys()
+        if len(missing_required_fields) > 0:
+            return ReservationError(ErrorMessages.REQUEST_MISSING_REQUIRED_FIELDS_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(missing_required_fields)))
+
+        for field in (ReservationFields.ROOM_ID, ReservationFields.GUEST_ID, ReservationFields.AMOUNT_OF_GUESTS):
+            value = create_request.get(field.value, 1)
+            if type(value) is not int or value <= 0:
+                return ReservationError(f"Invalid {field.value}. Please provide a positive integer")
+
+        for field in (ReservationFields.START_DATE, ReservationFields.END_DATE):
+            try:
+                DateUtils.convert_str_to_datetime(create_request[field.value])
+            except (TypeError, ValueError):
+                return ReservationError(f"Invalid {field.value}. Please provide an ISO 8601 datetime")
+
+        # Convert status field if found in the payload (from string to enum type)
+        if ReservationFields.STATUS.value in create_request:
+            try:
+                create_request[ReservationFields.STATUS.value] = ReservationStatus(
+                    create_request[ReservationFields.STATUS.value]
+                )
+            except ValueError:
+                return ReservationError(f"Invalid {ReservationFields.STATUS.value}. Please provide one of: "
+                                        f"{', '.join(x.value for x in ReservationStatus)}")
+        return None
+
+    def __validate_post(self, create_request: dict):
+        """
+        Performs validations on the POST request and fails the request if its data has issues
+        :param create_request: POST request data
+        """
+        error_message = ""
+
+        if not isinstance(create_request, dict):
+            abort(HttpStatuses.BAD_REQUEST.value)
+
+        unknown_fields = create_request.keys() - ALLOWED_BULK_POST_FIELDS
+        if len(unknown_fields) > 0:
+            error_message = ErrorMessages.UNKNOWN_VALUE_IN_REQUEST_BODY_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(unknown_fields))
+
+        missing_required_fields = REQUIRED_BULK_POST_FIELDS - create_request.keys()
+        if len(missing_required_fields) > 0:
+            error_message = ErrorMessages.REQUEST_MISSING_REQUIRED_FIELDS_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(missing_required_fields))
+        elif not isinstance(create_request[ReservationFields.RESERVATIONS.value], list) or \
+                len(create_request[ReservationFields.RESERVATIONS.value]) <= 0:
+            error_message = f"Please provide a non-empty list of {ReservationFields.RESERVATIONS.value}"
+        elif len(create_request[ReservationFields.RESERVATIONS.value]) > ReservationBulkController.__MAX_ITEMS:
+            error_message = f"A single request can create up to {ReservationBulkController.__MAX_ITEMS} reservations"
+
+        if not isinstance(create_request.get(ReservationFields.ALL_OR_NOTHING.value, True), bool):
+            error_message = f"Invalid {ReservationFields.ALL_OR_NOTHING.value}. Please provide a boolean"
+
+        if error_message:
+            abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
+
+    """ Max amount of reservations that can be created in a single request """
+    __MAX_ITEMS = 1000
@@ -1,14 +1,17 @@
-from flask import jsonify, request
+from flask import request
 from flask_restful import Resource, abort
 from sqlalchemy.exc import NoResultFound
 
-from api.controllers.reservation.ReservationFields import ALLOWED_PUT_FIELDS, REQUIRED_PUT_FIELDS, ReservationFields
+from api.controllers.ConditionalRequests import ConditionalRequests
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.reservation.ReservationFields import ALLOWED_PUT_FIELDS, REQUIRED_PUT_FIELDS, RESPONSE_FIELDS, \
+    ReservationFields
+from api.entities.APIErrors import ReservationError
 from api.entities.ErrorMessages import ErrorMessages
 from api.entities.HttpStatuses import HttpStatuses
 from api.entities.ReservationStatus import ReservationStatus
-from api.service.GuestService import GuestService
 from api.service.ReservationService import ReservationService
-from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
 
 
 class ReservationByIdController(Resource):
@@ -17,17 +20,31 @@ class ReservationByIdController(Resource):
     """
     def get(self, reservation_id: int):
         """
-        Method to handle http GET requests for this resource, which fetches a single reservation
+        Method to handle http GET requests for this resource, which fetches a single reservation.
+        The C{fields} query parameter trims it down to a sparse fieldset (see C{Fieldsets}). The response carries an
+        C{ETag}: if the reservation didn't change, polling clients get a 304 (see C{ConditionalRequests})
         :param reservation_id: id of the reservation to be fetched
         :return: HTTP Code indicating the result of the action and the fetched resource
         """
+        fields = Fieldsets.get_fields(RESPONSE_FIELDS)
+
+        version = ReservationService.get_version(reservation_id)
+        if version is None:
+            abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
+
+        etag = ConditionalRequests.make_etag(version)
+        if ConditionalRequests.is_not_modified(etag):
+            return ConditionalRequests.make_not_modified_response(etag)
+
         reservation = None
         try:
             reservation = ReservationService.get_by_id(reservation_id)
         except NoResultFound:
             abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
-        return jsonify(reservation)
+        response = JSONSerializer.jsonify(Fieldsets.trim(reservation, fields))
+        response.set_etag(etag)
+        return response
 
     def put(self, reservation_id: int):
         """
@@ -43,12 +60,13 @@ class ReservationByIdController(Resource):
 
         reservation = None
         try:
-            ReservationService.update(reservation_id, request.json)
-            reservation = ReservationService.get_by_id(reservation_id)
+            reservation = ReservationService.update(reservation_id, request.json)
+        except ReservationError as res_error:
+            abort(HttpStatuses.BAD_REQUEST.value, message=res_error.args[0])
         except NoResultFound:
             abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
-        return jsonify(reservation)
+        return JSONSerializer.jsonify(reservation)
 
     def delete(self, reservation_id: int):
         """
@@ -88,21 +106,5 @@ class ReservationByIdController(Resource):
                 "FIELDS",
                 ", ".join(missing_required_fields))
 
-        # Validate linked entities beforehand so we can be explicit about what's missing in the error message
-        # should any of them not exist
-        if ReservationFields.GUEST_ID.value in update_request:
-            guest_id = update_request[ReservationFields.GUEST_ID.value]
-            try:
-                GuestService.get_by_id(guest_id)
-            except NoResultFound:
-                error_message = f"Resource Guest with id {guest_id} does not exist. Please provide a valid 'guest_id'"
-
-        if ReservationFields.ROOM_ID.value in update_request:
-            room_id = update_request[ReservationFields.ROOM_ID.value]
-            try:
-                RoomService.get_by_id(room_id)
-            except NoResultFound:
-                error_message = f"Resource Room with id {room_id} does not exist. Please provide a valid 'room_id'"
-
         if error_message:
             abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
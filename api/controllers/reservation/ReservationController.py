@@ -1,15 +1,24 @@
-from flask import jsonify, make_response, request
+from datetime import date, datetime
+from typing import Optional
+
+from flask import make_response, request
 from flask_restful import Resource, abort
-from sqlalchemy.exc import NoResultFound
 
-from api.controllers.reservation.ReservationFields import ALLOWED_POST_FIELDS, REQUIRED_POST_FIELDS, ReservationFields
+from api.controllers.ConditionalRequests import ConditionalRequests
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.Pagination import Pagination
+from api.controllers.QueryParameters import QueryParameters
+from api.controllers.Streaming import Streaming
+from api.controllers.reservation.ReservationFields import ALLOWED_GET_FIELDS, ALLOWED_POST_FIELDS, \
+    REQUIRED_POST_FIELDS, RESPONSE_FIELDS, ReservationFields
 from api.entities.APIErrors import ReservationError
 from api.entities.ErrorMessages import ErrorMessages
 from api.entities.HttpStatuses import HttpStatuses
+from api.entities.ReservationFilters import ReservationFilters
 from api.entities.ReservationStatus import ReservationStatus
-from api.service.GuestService import GuestService
 from api.service.ReservationService import ReservationService
-from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
+from utils.DateUtils import DateUtils
 
 
 class ReservationController(Resource):
@@ -18,10 +27,47 @@ class ReservationController(Resource):
     """
     def get(self):
         """
-        Method to handle http GET requests for this resource, which fetches all reservations
-        :return: HTTP Code indicating the result of the action and the fetched resources
+        Method to handle http GET requests for this resource, which lists the reservations a page at a time. Pages are
+        ordered by id: if there are more reservations, the response includes a C{Link} header pointing to the next page.
+        Reservations can be filtered by room_id, guest_id, status, starts_before, ends_after, active_on and in_house_on
+        (dates, see C{ReservationFilters}), and trimmed down to a sparse fieldset with the C{fields} query parameter
+        (see C{Fieldsets}).
+
+        Clients that accept NDJSON get every matching reservation instead, streamed one per line (see C{Streaming}),
+        in which case the pagination query parameters are ignored.
+        Responses carry an C{ETag}: if none of their reservations changed, polling clients get a 304 (see
+        C{ConditionalRequests})
+        :return: HTTP Code indicating the result of the action and the page of reservations
         """
-        return jsonify(ReservationService.get_all())
+        self.__validate_get(request.args)
+        limit, after_id = Pagination.get_page_args()
+        fields = Fieldsets.get_fields(RESPONSE_FIELDS)
+        filters = ReservationFilters(
+            room_id=QueryParameters.get_positive_int(ReservationFields.ROOM_ID.value),
+            guest_id=QueryParameters.get_positive_int(ReservationFields.GUEST_ID.value),
+            status=self.__parse_status(ReservationFields.STATUS.value),
+            starts_before=self.__parse_datetime(ReservationFields.STARTS_BEFORE.value),
+            ends_after=self.__parse_datetime(ReservationFields.ENDS_AFTER.value),
+            active_on=self.__parse_date(ReservationFields.ACTIVE_ON.value),
+            in_house_on=self.__parse_date(ReservationFields.IN_HOUSE_ON.value)
+        )
+
+        is_streamed = Streaming.is_requested()
+        if is_streamed:
+            after_id = None
+
+        etag = ConditionalRequests.make_etag(ReservationService.get_page_version(after_id, filters))
+        if ConditionalRequests.is_not_modified(etag):
+            return ConditionalRequests.make_not_modified_response(etag)
+
+        if is_streamed:
+            response = Streaming.make_response(ReservationService.stream(filters, fields), fields)
+        else:
+            # Fetch an extra reservation to know if there's a next page
+            response = Pagination.make_page_response(ReservationService.get_page(limit + 1, after_id, filters, fields),
+                                                     limit, fields)
+        response.set_etag(etag)
+        return response
 
     def post(self):
         """
@@ -36,14 +82,11 @@ class ReservationController(Resource):
 
         reservation = None
         try:
-            reservation_id = ReservationService.create(request.json)
-            reservation = ReservationService.get_by_id(reservation_id)
+            reservation = ReservationService.create(request.json)
         except ReservationError as res_error:
             abort(HttpStatuses.BAD_REQUEST.value, message=res_error.args[0])
-        except NoResultFound:
-            abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
-        return make_response(jsonify(reservation), HttpStatuses.CREATED.value)
+        return make_response(JSONSerializer.jsonify(reservation), HttpStatuses.CREATED.value)
 
     def __validate_post(self, create_request: dict):
         """
@@ -70,21 +113,63 @@ class ReservationController(Resource):
                 "FIELDS",
                 ", ".join(missing_required_fields))
 
-        # Validate linked entities beforehand so we can be explicit about what's missing in the error message
-        # should any of them not exist
-        if ReservationFields.GUEST_ID.value in create_request:
-            guest_id = create_request[ReservationFields.GUEST_ID.value]
-            try:
-                GuestService.get_by_id(guest_id)
-            except NoResultFound:
-                error_message = f"Resource Guest with id {guest_id} does not exist. Please provide a valid 'guest_id'"
-
-        if ReservationFields.ROOM_ID.value in create_request:
-            room_id = create_request[ReservationFields.ROOM_ID.value]
-            try:
-                RoomService.get_by_id(room_id)
-            except NoResultFound:
-                error_message = f"Resource Room with id {room_id} does not exist. Please provide a valid 'room_id'"
-
         if error_message:
             abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
+
+    def __validate_get(self, get_request: dict):
+        """
+        Performs validations on the GET request query parameters and fails the request if they have issues
+        :param get_request: GET request query parameters
+        """
+        unknown_fields = get_request.keys() - ALLOWED_GET_FIELDS
+        if len(unknown_fields) > 0:
+            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.UNKNOWN_QUERY_PARAMETER_ERROR_MESSAGE.value
+                  .replace("FIELDS", ", ".join(unknown_fields)))
+
+    def __parse_status(self, field: str) -> Optional[ReservationStatus]:
+        """
+        Parses an optional reservation status query parameter, failing the request if it's not a valid status
+        :param field: name of the query parameter
+        :return: parsed status, or C{None} if the parameter wasn't included
+        """
+        if field not in request.args:
+            return None
+
+        try:
+            return ReservationStatus(request.args[field])
+        except ValueError:
+            abort(HttpStatuses.BAD_REQUEST.value, message=f"Invalid {field}. Please provide one of: "
+                                                          f"{', '.join(x.value for x in ReservationStatus)}")
+
+    def __parse_datetime(self, field: str) -> Optional[datetime]:
+        """
+        Parses an optional datetime query parameter, failing the request if it's not a valid ISO 8601 datetime with
+        timezone info
+        :param field: name of the query parameter
+        :return: parsed datetime, or C{None} if the parameter wasn't included
+        """
+        if field not in request.args:
+            return None
+
+        try:
+            value = DateUtils.convert_str_to_datetime(request.args[field])
+        except ValueError:
+            abort(HttpStatuses.BAD_REQUEST.value, message=f"Invalid {field}. Please provide an ISO 8601 datetime")
+
+        if value.tzinfo is None:
+            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
+        return value
+
+    def __parse_date(self, field: str) -> Optional[date]:
+        """
+        Parses an optional date query parameter, failing the request if it's not a valid ISO 8601 date (YYYY-MM-DD)
+        :param field: name of the query parameter
+        :return: parsed date, or C{None} if the parameter wasn't included
+        """
+        if field not in request.args:
+            return None
+
+        try:
+            return date.fromisoformat(request.args[field])
+        except ValueError:
+            abort(HttpStatuses.BAD_REQUEST.value, message=f"Invalid {field}. Please provide an ISO 8601 date")
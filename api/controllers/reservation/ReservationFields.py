@@ -1,5 +1,9 @@
 from enum import Enum
 
+from api.controllers.ChangeFeed import ChangeFeed
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.Pagination import Pagination
+
 
 class ReservationFields(Enum):
     """ Collection of fields related to the reservation resource for validation purposes """
@@ -22,6 +26,18 @@ class ReservationFields(Enum):
 
     UPDATED_AT = "updated_at"
 
+    RESERVATIONS = "reservations"
+
+    ALL_OR_NOTHING = "all_or_nothing"
+
+    STARTS_BEFORE = "starts_before"
+
+    ENDS_AFTER = "ends_after"
+
+    ACTIVE_ON = "active_on"
+
+    IN_HOUSE_ON = "in_house_on"
+
 
 """ Collection of allowed fields for the POST operation """
 ALLOWED_POST_FIELDS = frozenset((
@@ -67,3 +83,64 @@ REQUIRED_PUT_FIELDS = frozenset(())
 """ Make sure this collection makes sense """
 assert all([ReservationFields(x) for x in REQUIRED_PUT_FIELDS])
 assert REQUIRED_PUT_FIELDS.issubset(ALLOWED_PUT_FIELDS)
+
+""" Collection of allowed fields for the bulk POST operation """
+ALLOWED_BULK_POST_FIELDS = frozenset((
+    ReservationFields.RESERVATIONS.value,
+    ReservationFields.ALL_OR_NOTHING.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([ReservationFields(x) for x in ALLOWED_BULK_POST_FIELDS])
+
+""" Collection of required fields for the bulk POST operation """
+REQUIRED_BULK_POST_FIELDS = frozenset((
+    ReservationFields.RESERVATIONS.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([ReservationFields(x) for x in REQUIRED_BULK_POST_FIELDS])
+assert REQUIRED_BULK_POST_FIELDS.issubset(ALLOWED_BULK_POST_FIELDS)
+
+""" Collection of filters for the GET operation (listing the reservations) """
+GET_FILTER_FIELDS = frozenset((
+    ReservationFields.ROOM_ID.value,
+    ReservationFields.GUEST_ID.value,
+    ReservationFields.STATUS.value,
+    ReservationFields.STARTS_BEFORE.value,
+    ReservationFields.ENDS_AFTER.value,
+    ReservationFields.ACTIVE_ON.value,
+    ReservationFields.IN_HOUSE_ON.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([ReservationFields(x) for x in GET_FILTER_FIELDS])
+
+""" Collection of allowed query parameters for the GET operation (listing the reservations) """
+ALLOWED_GET_FIELDS = GET_FILTER_FIELDS | frozenset((
+    Pagination.LIMIT,
+    Pagination.AFTER,
+    Fieldsets.FIELDS,
+))
+
+""" Collection of allowed query parameters for the GET operation of the change feed of the reservations """
+ALLOWED_CHANGES_GET_FIELDS = frozenset((
+    Pagination.LIMIT,
+    ChangeFeed.SINCE,
+))
+
+""" Collection of the fields of the reservations in the responses, which can be requested as a sparse fieldset """
+RESPONSE_FIELDS = frozenset((
+    ReservationFields.ID.value,
+    ReservationFields.GUEST_ID.value,
+    ReservationFields.ROOM_ID.value,
+    ReservationFields.START_DATE.value,
+    ReservationFields.END_DATE.value,
+    ReservationFields.AMOUNT_OF_GUESTS.value,
+    ReservationFields.STATUS.value,
+    ReservationFields.CREATED_AT.value,
+    ReservationFields.UPDATED_AT.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([ReservationFields(x) for x in RESPONSE_FIELDS])
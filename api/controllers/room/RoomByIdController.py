@@ -1,11 +1,14 @@
-from flask import jsonify, request
+from flask import request
 from flask_restful import Resource, abort
 from sqlalchemy.exc import NoResultFound
 
-from api.controllers.room.RoomFields import ALLOWED_PUT_FIELDS, REQUIRED_PUT_FIELDS
+from api.controllers.ConditionalRequests import ConditionalRequests
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.room.RoomFields import ALLOWED_PUT_FIELDS, REQUIRED_PUT_FIELDS, RESPONSE_FIELDS
 from api.entities.ErrorMessages import ErrorMessages
 from api.entities.HttpStatuses import HttpStatuses
 from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
 
 
 class RoomByIdController(Resource):
@@ -14,17 +17,28 @@ class RoomByIdController(Resource):
     """
     def get(self, room_id: int):
         """
-        Method to handle http GET requests for this resource, which fetches a single room
+        Method to handle http GET requests for this resource, which fetches a single room.
+        The C{fields} query parameter trims it down to a sparse fieldset (see C{Fieldsets}). The response carries an
+        C{ETag}: if the room didn't change, polling clients get a 304 (see C{ConditionalRequests})
         :param room_id: id of the room to be fetched
         :return: HTTP Code indicating the result of the action and the fetched resource
         """
+        fields = Fieldsets.get_fields(RESPONSE_FIELDS)
+
         room = None
         try:
             room = RoomService.get_by_id(room_id)
         except NoResultFound:
             abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
-        return jsonify(room)
+        # The room may come from the cache, so its ETag is built from the version that's sent, not the one in the DB
+        etag = ConditionalRequests.make_etag(ConditionalRequests.get_entity_version(room))
+        if ConditionalRequests.is_not_modified(etag):
+            return ConditionalRequests.make_not_modified_response(etag)
+
+        response = JSONSerializer.jsonify(Fieldsets.trim(room, fields))
+        response.set_etag(etag)
+        return response
 
     def put(self, room_id: int):
         """
@@ -36,12 +50,11 @@ class RoomByIdController(Resource):
 
         room = None
         try:
-            RoomService.update(room_id, request.json)
-            room = RoomService.get_by_id(room_id)
+            room = RoomService.update(room_id, request.json)
         except NoResultFound:
             abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
 
-        return jsonify(room)
+        return JSONSerializer.jsonify(room)
 
     def delete(self, room_id: int):
         """
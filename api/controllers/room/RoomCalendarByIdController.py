@@ -0,0 +1,24 @@
+from flask_restful import Resource, abort
+
+from api.entities.ErrorMessages import ErrorMessages
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ReservationService import ReservationService
+from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
+
+
+class RoomCalendarByIdController(Resource):
+    """
+    Controller for the calendar of a single room
+    """
+    def get(self, room_id: int):
+        """
+        Method to handle http GET requests for this resource, which fetches the free/occupied nights of the room for
+        the whole booking window
+        :param room_id: id of the room whose calendar is fetched
+        :return: HTTP Code indicating the result of the action and the calendar of the room
+        """
+        if RoomService.get_missing_ids({room_id}):
+            abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
+
+        return JSONSerializer.jsonify(ReservationService.get_rooms_calendar([room_id])[0])
@@ -0,0 +1,74 @@
+from flask import request
+from flask_restful import Resource, abort
+
+from api.controllers.QueryParameters import QueryParameters
+from api.controllers.room.RoomFields import ALLOWED_CALENDAR_GET_FIELDS, REQUIRED_CALENDAR_GET_FIELDS, RoomFields
+from api.entities.ErrorMessages import ErrorMessages
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ReservationService import ReservationService
+from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
+
+
+class RoomCalendarController(Resource):
+    """
+    Controller for the calendar of several rooms at once
+    """
+    def get(self):
+        """
+        Method to handle http GET requests for this resource, which fetches the free/occupied nights of the rooms
+        listed in the C{room_ids} query parameter (comma separated) for the whole booking window
+        :return: HTTP Code indicating the result of the action and the calendar of each room, in the requested order
+        """
+        self.__validate_get(request.args)
+        room_ids = self.__parse_room_ids(request.args[RoomFields.ROOM_IDS.value])
+
+        missing_room_ids = RoomService.get_missing_ids(set(room_ids))
+        if missing_room_ids:
+            abort(HttpStatuses.NOT_FOUND.value,
+                  message=f"{ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value} "
+                          f"room_id(s): {', '.join(str(x) for x in sorted(missing_room_ids))}")
+
+        return JSONSerializer.jsonify(ReservationService.get_rooms_calendar(room_ids))
+
+    def __parse_room_ids(self, room_ids: str) -> list[int]:
+        """
+        Parses the comma separated room ids, failing the request if they're not positive integers or there are too many
+        :param room_ids: value of the C{room_ids} query parameter
+        :return: list of unique room ids, in the order they were requested
+        """
+        values = [QueryParameters.parse_positive_int(x.strip()) for x in room_ids.split(",")]
+        if None in values:
+            abort(HttpStatuses.BAD_REQUEST.value,
+                  message=f"Invalid {RoomFields.ROOM_IDS.value}. Please provide comma separated positive integers")
+
+        parsed_room_ids = list(dict.fromkeys(values))
+        if len(parsed_room_ids) > RoomCalendarController.__MAX_ROOMS:
+            abort(HttpStatuses.BAD_REQUEST.value,
+                  message=f"The calendar can be fetched for up to {RoomCalendarController.__MAX_ROOMS} rooms at once")
+        return parsed_room_ids
+
+    def __validate_get(self, get_request: dict):
+        """
+        Performs validations on the GET request query parameters and fails the request if they have issues
+        :param get_request: GET request query parameters
+        """
+        error_message = ""
+
+        unknown_fields = get_request.keys() - ALLOWED_CALENDAR_GET_FIELDS
+        if len(unknown_fields) > 0:
+            error_message = ErrorMessages.UNKNOWN_QUERY_PARAMETER_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(unknown_fields))
+
+        missing_required_fields = REQUIRED_CALENDAR_GET_FIELDS - get_request.keys()
+        if len(missing_required_fields) > 0:
+            error_message = ErrorMessages.REQUEST_MISSING_REQUIRED_QUERY_PARAMETERS_ERROR_MESSAGE.value.replace(
+                "FIELDS",
+                ", ".join(missing_required_fields))
+
+        if error_message:
+            abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
+
+    """ Max amount of rooms whose calendar can be fetched in a single request """
+    __MAX_ROOMS = 200
@@ -0,0 +1,37 @@
+from flask import request
+from flask_restful import Resource, abort
+
+from api.controllers.ChangeFeed import ChangeFeed
+from api.controllers.room.RoomFields import ALLOWED_CHANGES_GET_FIELDS
+from api.entities.ErrorMessages import ErrorMessages
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.RoomService import RoomService
+
+
+class RoomChangesController(Resource):
+    """
+    Controller for the change feed of the rooms
+    """
+    def get(self):
+        """
+        Method to handle http GET requests for this resource, which lists the rooms that were created, updated or
+        deleted since the C{since} cursor of the last sync (see C{ChangeFeed})
+        :return: HTTP Code indicating the result of the action, the changed and deleted rooms, and the cursor of the
+        next sync
+        """
+        self.__validate_get(request.args)
+        limit, after_change, after_deletion = ChangeFeed.get_changes_args()
+
+        # Fetch an extra change and deletion to know if there are more of them
+        rooms, tombstones = RoomService.get_changes(limit + 1, after_change, after_deletion)
+        return ChangeFeed.make_response(rooms, tombstones, limit, after_change, after_deletion)
+
+    def __validate_get(self, get_request: dict):
+        """
+        Performs validations on the GET request query parameters and fails the request if they have issues
+        :param get_request: GET request query parameters
+        """
+        unknown_fields = get_request.keys() - ALLOWED_CHANGES_GET_FIELDS
+        if len(unknown_fields) > 0:
+            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.UNKNOWN_QUERY_PARAMETER_ERROR_MESSAGE.value
+                  .replace("FIELDS", ", ".join(unknown_fields)))
@@ -1,11 +1,17 @@
-from flask import jsonify, make_response, request
+from flask import Response, make_response, request
 from flask_restful import Resource, abort
-from sqlalchemy.exc import NoResultFound
 
-from api.controllers.room.RoomFields import ALLOWED_POST_FIELDS, REQUIRED_POST_FIELDS
+from api.controllers.CachedResponses import CachedResponses
+from api.controllers.ConditionalRequests import ConditionalRequests
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.Pagination import Pagination
+from api.controllers.room.RoomFields import ALLOWED_GET_FIELDS, ALLOWED_POST_FIELDS, REQUIRED_POST_FIELDS, \
+    RESPONSE_FIELDS
 from api.entities.ErrorMessages import ErrorMessages
 from api.entities.HttpStatuses import HttpStatuses
 from api.service.RoomService import RoomService
+from config.JSONSerializer import JSONSerializer
+from db.entities.Room import Room
 
 
 class RoomController(Resource):
@@ -14,10 +20,15 @@ class RoomController(Resource):
     """
     def get(self):
         """
-        Method to handle http GET requests for this resource, which fetches all rooms
-        :return: HTTP Code indicating the result of the action and the fetched resources
+        Method to handle http GET requests for this resource, which lists the rooms a page at a time. Pages are
+        ordered by id: if there are more rooms, the response includes a C{Link} header pointing to the next page.
+        The C{fields} query parameter trims the rooms down to a sparse fieldset (see C{Fieldsets}).
+        Pages carry an C{ETag}: if none of their rooms changed, polling clients get a 304 (see C{ConditionalRequests}).
+        Pages are cached until a room is written (see C{CachedResponses})
+        :return: HTTP Code indicating the result of the action and the page of rooms
         """
-        return jsonify(RoomService.get_all())
+        self.__validate_get(request.args)
+        return CachedResponses.respond(Room, self.__get_page)
 
     def post(self):
         """
@@ -26,14 +37,25 @@ class RoomController(Resource):
         """
         self.__validate_post(request.json)
 
-        room = None
-        try:
-            room_id = RoomService.create(request.json)
-            room = RoomService.get_by_id(room_id)
-        except NoResultFound:
-            abort(HttpStatuses.NOT_FOUND.value, message=ErrorMessages.RESOURCE_NOT_FOUND_ERROR_MESSAGE.value)
+        room = RoomService.create(request.json)
+        return make_response(JSONSerializer.jsonify(room), HttpStatuses.CREATED.value)
 
-        return make_response(jsonify(room), HttpStatuses.CREATED.value)
+    def __get_page(self) -> Response:
+        """
+        Builds the response with the page of rooms of the current request
+        :return: response with the page of rooms, or an empty 304 if the client already has it
+        """
+        limit, after_id = Pagination.get_page_args()
+        fields = Fieldsets.get_fields(RESPONSE_FIELDS)
+
+        etag = ConditionalRequests.make_etag(RoomService.get_page_version(after_id))
+        if ConditionalRequests.is_not_modified(etag):
+            return ConditionalRequests.make_not_modified_response(etag)
+
+        # Fetch an extra room to know if there's a next page
+        response = Pagination.make_page_response(RoomService.get_page(limit + 1, after_id, fields), limit, fields)
+        response.set_etag(etag)
+        return response
 
     def __validate_post(self, create_request: dict):
         """
@@ -62,3 +84,13 @@ class RoomController(Resource):
 
         if error_message:
             abort(HttpStatuses.BAD_REQUEST.value, message=error_message)
+
+    def __validate_get(self, get_request: dict):
+        """
+        Performs validations on the GET request query parameters and fails the request if they have issues
+        :param get_request: GET request query parameters
+        """
+        unknown_fields = get_request.keys() - ALLOWED_GET_FIELDS
+        if len(unknown_fields) > 0:
+            abort(HttpStatuses.BAD_REQUEST.value, message=ErrorMessages.UNKNOWN_QUERY_PARAMETER_ERROR_MESSAGE.value
+                  .replace("FIELDS", ", ".join(unknown_fields)))
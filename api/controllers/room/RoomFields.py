@@ -1,5 +1,9 @@
 from enum import Enum
 
+from api.controllers.ChangeFeed import ChangeFeed
+from api.controllers.Fieldsets import Fieldsets
+from api.controllers.Pagination import Pagination
+
 
 class RoomFields(Enum):
     """ Collection of fields related to the room resource for validation purposes """
@@ -16,6 +20,8 @@ class RoomFields(Enum):
 
     UPDATED_AT = "updated_at"
 
+    ROOM_IDS = "room_ids"
+
 
 """ Collection of allowed fields for the POST operation """
 ALLOWED_POST_FIELDS = frozenset((
@@ -52,3 +58,46 @@ REQUIRED_PUT_FIELDS = frozenset(())
 """ Make sure this collection makes sense """
 assert all([RoomFields(x) for x in REQUIRED_PUT_FIELDS])
 assert REQUIRED_PUT_FIELDS.issubset(ALLOWED_PUT_FIELDS)
+
+""" Collection of allowed query parameters for the GET operation of the calendar of several rooms """
+ALLOWED_CALENDAR_GET_FIELDS = frozenset((
+    RoomFields.ROOM_IDS.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([RoomFields(x) for x in ALLOWED_CALENDAR_GET_FIELDS])
+
+""" Collection of required query parameters for the GET operation of the calendar of several rooms """
+REQUIRED_CALENDAR_GET_FIELDS = frozenset((
+    RoomFields.ROOM_IDS.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([RoomFields(x) for x in REQUIRED_CALENDAR_GET_FIELDS])
+assert REQUIRED_CALENDAR_GET_FIELDS.issubset(ALLOWED_CALENDAR_GET_FIELDS)
+
+""" Collection of allowed query parameters for the GET operation (listing the rooms) """
+ALLOWED_GET_FIELDS = frozenset((
+    Pagination.LIMIT,
+    Pagination.AFTER,
+    Fieldsets.FIELDS,
+))
+
+""" Collection of allowed query parameters for the GET operation of the change feed of the rooms """
+ALLOWED_CHANGES_GET_FIELDS = frozenset((
+    Pagination.LIMIT,
+    ChangeFeed.SINCE,
+))
+
+""" Collection of the fields of the rooms in the responses, which can be requested as a sparse fieldset """
+RESPONSE_FIELDS = frozenset((
+    RoomFields.ID.value,
+    RoomFields.NAME.value,
+    RoomFields.CAPACITY.value,
+    RoomFields.IS_ACTIVE.value,
+    RoomFields.CREATED_AT.value,
+    RoomFields.UPDATED_AT.value,
+))
+
+""" Make sure this collection makes sense """
+assert all([RoomFields(x) for x in RESPONSE_FIELDS])
@@ -0,0 +1,13 @@
+from dataclasses import dataclass, field
+
+
+@dataclass
+class CachedResponse:
+    """
+    Response kept in memory to be sent again (see C{ResponseCache}): its encoded C{body}, the C{headers} that go along
+    with it, its C{etag} (unquoted), and the copies of the body compressed so far, by encoding
+    """
+    body: bytes
+    headers: list[tuple[str, str]]
+    etag: str
+    compressed_bodies: dict[str, bytes] = field(default_factory=dict)
@@ -21,5 +21,19 @@ class ErrorMessages(Enum):
     """ Error message in case a request is missing required fields """
     REQUEST_MISSING_REQUIRED_FIELDS_ERROR_MESSAGE = "The following fields were missing from the request body: {FIELDS}"
 
+    """ Error message in case an unknown query parameter is included in the request """
+    UNKNOWN_QUERY_PARAMETER_ERROR_MESSAGE = "An unknown query parameter was found in the request: {FIELDS}"
+
+    """ Error message in case a request asks for fields that the entities don't have (see C{Fieldsets}) """
+    UNKNOWN_FIELDS_ERROR_MESSAGE = "Unknown fields were requested: {FIELDS}. Please choose among: {ALLOWED}"
+
+    """ Error message in case a request is missing required query parameters """
+    REQUEST_MISSING_REQUIRED_QUERY_PARAMETERS_ERROR_MESSAGE = "The following query parameters were missing from the " \
+                                                              "request: {FIELDS}"
+
     """ The provided datetime fields do not contain TZ information """
     TIMEZONE_MISSING_FROM_DATE_FIELDS = "Please make sure dates include timezone info"
+
+    """ Error message for the valid reservations of a bulk request that weren't created, due to other ones failing """
+    RESERVATION_NOT_CREATED_ERROR_MESSAGE = "The reservation is valid, but it wasn't created since other " \
+                                            "reservations in the request failed"
@@ -23,6 +23,22 @@ class HttpStatuses(Enum):
     """
     NO_CONTENT = 204
 
+    """
+        Request succeeded, returning only the range of the resource that was asked for.
+    """
+    PARTIAL_CONTENT = 206
+
+    """
+        Request succeeded only in part. The body holds the result of each of its parts.
+    """
+    MULTI_STATUS = 207
+
+    # 3XX Http Statuses
+    """
+        The resource hasn't changed since the version the client has cached (conditional GET), so no body is returned.
+    """
+    NOT_MODIFIED = 304
+
     # 4XX Http Statuses
     """
         Request could not be understood by the server due to malformed syntax. The request should
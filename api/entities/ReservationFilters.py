@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Optional
+
+from api.entities.ReservationStatus import ReservationStatus
+
+
+@dataclass
+class ReservationFilters:
+    """
+    Filters for listing reservations. Listed reservations match all of the included filters: C{starts_before} and
+    C{ends_after} are timezone aware datetimes, C{active_on} matches the reservations that take up part of that day
+    (in UTC), and C{in_house_on} the ones that stay the night after it (leaving out the ones that end during the day)
+    """
+    room_id: Optional[int] = None
+    guest_id: Optional[int] = None
+    status: Optional[ReservationStatus] = None
+    starts_before: Optional[datetime] = None
+    ends_after: Optional[datetime] = None
+    active_on: Optional[date] = None
+    in_house_on: Optional[date] = None
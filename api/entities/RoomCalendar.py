@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class RoomCalendar:
+    """
+    Free/occupied nights of a room for the whole booking window. Dates are ISO 8601 strings, and C{nights} holds one
+    item per night, in order, with its C{date} and whether the room C{is_available} for it
+    """
+    room_id: int
+    start_date: str
+    end_date: str
+    nights: list[dict]
@@ -0,0 +1,136 @@
+import logging
+from typing import Iterable, Optional
+
+from api.service.EntityCache import EntityCache
+from api.service.ResponseCache import ResponseCache
+from api.service.RoomAvailabilityIndex import RoomAvailabilityIndex
+from db.entities.Guest import Guest
+from db.entities.Reservation import Reservation
+from db.entities.Room import Room
+from utils.InvalidationBus import InvalidationBus
+from utils.singleton import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class CacheInvalidator(metaclass=Singleton):
+    """
+    Keeps the in-process caches of the service layer (C{EntityCache}, C{ResponseCache} and C{RoomAvailabilityIndex})
+    coherent across the processes serving the app. The writes update the caches of their own process, and then publish
+    what they changed through an C{InvalidationBus}, so that the rest of the processes drop it right away instead of
+    serving it until it expires. Without a bus (i.e. scripts using the services directly), nothing is published
+    """
+    def __init__(self):
+        self.__bus: Optional[InvalidationBus] = None
+
+    def set_bus(self, bus: Optional[InvalidationBus]):
+        """
+        Starts publishing to (and receiving from) the given bus, stopping the previous one, if any
+        :param bus: bus shared by the processes serving the app, or C{None} to stop publishing
+        """
+        if self.__bus is not None:
+            self.__bus.stop()
+        self.__bus = bus
+        if bus is not None:
+            bus.subscribe(CacheInvalidator.__apply)
+            bus.start()
+
+    def get_bus(self) -> Optional[InvalidationBus]:
+        """
+        :return: bus the invalidations are published to, if any
+        """
+        return self.__bus
+
+    def room_changed(self, room_id: int, reservations_changed: bool = False):
+        """
+        Publishes that a room was created, updated or deleted
+        :param room_id: id of the room
+        :param reservations_changed: if C{True}, the reservations of the room changed too (i.e. the room was deleted)
+        """
+        keys = [CacheInvalidator.__make_key(CacheInvalidator.__ROOM, room_id)]
+        if reservations_changed:
+            keys.append(CacheInvalidator.__make_key(CacheInvalidator.__ROOM_RESERVATIONS, room_id))
+        self.__publish(keys)
+
+    def guest_changed(self, guest_id: int, room_ids: Iterable[int] = ()):
+        """
+        Publishes that a guest was created, updated or deleted
+        :param guest_id: id of the guest
+        :param room_ids: rooms whose reservations changed along with the guest (i.e. the ones of its reservations, when
+        it was deleted)
+        """
+        self.__publish([CacheInvalidator.__make_key(CacheInvalidator.__GUEST, guest_id)] +
+                       [CacheInvalidator.__make_key(CacheInvalidator.__ROOM_RESERVATIONS, x) for x in set(room_ids)])
+
+    def room_reservations_changed(self, room_ids: Iterable[int], created_reservation_ids: Iterable[int] = ()):
+        """
+        Publishes that reservations of the rooms were created, updated or deleted
+        :param room_ids: ids of the rooms
+        :param created_reservation_ids: ids of the reservations that were created, which may have been looked up while
+        they were missing
+        """
+        keys = [CacheInvalidator.__make_key(CacheInvalidator.__ROOM_RESERVATIONS, x) for x in set(room_ids)]
+        keys.extend(CacheInvalidator.__make_key(CacheInvalidator.__RESERVATION, x) for x in created_reservation_ids)
+        self.__publish(keys)
+
+    def __publish(self, keys: list[str]):
+        """
+        Publishes the keys, if there's a bus. The writes are already committed by then, so a failure to publish them
+        doesn't fail the write: the caches of the other processes expire eventually
+        :param keys: keys of the cached values that changed
+        """
+        if self.__bus is None:
+            return
+        try:
+            self.__bus.publish(keys)
+        except Exception:
+            logger.exception("Couldn't publish the cache invalidations %s", keys)
+
+    @staticmethod
+    def __apply(keys: list[str]):
+        """
+        Drops the cached values changed by the writes of another process
+        :param keys: keys published by the other process
+        """
+        for key in keys:
+            if key == InvalidationBus.ALL:
+                EntityCache().clear()
+                ResponseCache().clear()
+                RoomAvailabilityIndex().clear()
+                continue
+
+            key_type, _, entity_id = key.partition(CacheInvalidator.__SEPARATOR)
+            if key_type == CacheInvalidator.__ROOM:
+                EntityCache().invalidate(Room, int(entity_id))
+                ResponseCache().invalidate(Room)
+            elif key_type == CacheInvalidator.__GUEST:
+                EntityCache().invalidate(Guest, int(entity_id))
+                ResponseCache().invalidate(Guest)
+            elif key_type == CacheInvalidator.__RESERVATION:
+                EntityCache().invalidate(Reservation, int(entity_id))
+            elif key_type == CacheInvalidator.__ROOM_RESERVATIONS:
+                RoomAvailabilityIndex().invalidate_room(int(entity_id))
+
+    @staticmethod
+    def __make_key(key_type: str, entity_id: int) -> str:
+        """
+        :param key_type: what changed (i.e. C{__ROOM})
+        :param entity_id: id of the entity that changed
+        :return: key published for the change
+        """
+        return f"{key_type}{CacheInvalidator.__SEPARATOR}{entity_id}"
+
+    """ Type of the keys of the rooms """
+    __ROOM = Room.__tablename__
+
+    """ Type of the keys of the guests """
+    __GUEST = Guest.__tablename__
+
+    """ Type of the keys of the reservations """
+    __RESERVATION = Reservation.__tablename__
+
+    """ Type of the keys of the reservations of the rooms """
+    __ROOM_RESERVATIONS = "room_reservations"
+
+    """ Separates the type of a key from the id of the entity """
+    __SEPARATOR = ":"
@@ -0,0 +1,181 @@
+import dataclasses
+from threading import Lock
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy.exc import NoResultFound
+
+from utils.LRUCache import LRUCache
+from utils.singleton import Singleton
+
+
+class EntityCache(metaclass=Singleton):
+    """
+    In-process read-through cache of the entities that barely ever change (i.e. rooms and guests), so that looking
+    them up by id doesn't go to the DB every time. Each entity class gets its own LRU cache, bounded in size and with
+    a TTL, so that writes made by other processes are eventually picked up.
+
+    Entities are cached as snapshots: frozen dataclasses with the same fields, detached from any DB session. They can't
+    be modified, nor lazy load anything, so they're safe to share between requests. The writes made through the
+    service layer invalidate the entities they change (see C{invalidate})
+
+    The ids that were looked up and not found are remembered for a short while too, so that lookups of missing entities
+    (i.e. by scrapers, or by clients probing ids) are answered without going to the DB. Creating an entity invalidates
+    its id, in case it was looked up before it existed
+    """
+    def __init__(self):
+        self.__caches: dict[type, LRUCache] = {}
+        # Ids of the entities of each class that are known to be missing
+        self.__missing_ids: dict[type, LRUCache] = {}
+        self.__snapshot_classes: dict[type, type] = {}
+        # Counts the invalidations, so that entities loaded while one of them happened aren't cached (see C{get})
+        self.__invalidations = 0
+        self.__lock = Lock()
+
+    def get(self, entity_class: type, entity_id: int, loader: Callable[[], Any]) -> Any:
+        """
+        Fetches the snapshot of an entity. If it isn't cached, the entity is loaded, and its snapshot is cached
+        :param entity_class: SQLAlchemy entity class
+        :param entity_id: id of the entity
+        :param loader: function that loads the entity from the DB, raising C{NoResultFound} if it doesn't exist (the
+        id is then remembered as missing). Other errors aren't cached
+        :return: snapshot of the entity
+        :raises sqlalchemy.exc.NoResultFound: if the entity doesn't exist
+        """
+        cache = self.__get_cache(entity_class)
+        snapshot = cache.get(entity_id)
+        if snapshot is not None:
+            return snapshot
+        if self.__get_cache(entity_class, missing=True).get(entity_id):
+            raise NoResultFound(f"No {entity_class.__tablename__} with id {entity_id} was found")
+
+        invalidations = self.__invalidations
+        try:
+            entity = loader()
+        except NoResultFound:
+            self.__add_missing_id(entity_class, entity_id, invalidations)
+            raise
+        snapshot = self.__make_snapshot(entity)
+        with self.__lock:
+            # If the entity was invalidated while it was being loaded, the loaded one may be older than the update
+            if invalidations == self.__invalidations:
+                cache.put(entity_id, snapshot)
+        return snapshot
+
+    def find(self, entity_class: type, entity_id: int, finder: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """
+        Looks up something about an entity that isn't cached itself (i.e. its version, or an entity that changes too
+        often to be cached), unless the entity is known to be missing
+        :param entity_class: SQLAlchemy entity class
+        :param entity_id: id of the entity
+        :param finder: function that looks the entity up in the DB, returning C{None} if it doesn't exist (the id is
+        then remembered as missing)
+        :return: result of the lookup, or C{None} if the entity doesn't exist
+        """
+        if self.__get_cache(entity_class, missing=True).get(entity_id):
+            return None
+
+        invalidations = self.__invalidations
+        result = finder()
+        if result is None:
+            self.__add_missing_id(entity_class, entity_id, invalidations)
+        return result
+
+    def get_cached_ids(self, entity_class: type, entity_ids: Iterable[int]) -> set[int]:
+        """
+        Checks which of the entities are cached, without affecting the LRU order nor the counters. Cached entities are
+        known to exist, since deleting them invalidates them
+        :param entity_class: SQLAlchemy entity class
+        :param entity_ids: ids of the entities to look for
+        :return: set with the ids of the entities that are cached
+        """
+        cache = self.__get_cache(entity_class)
+        return {x for x in entity_ids if cache.peek(x) is not None}
+
+    def invalidate(self, entity_class: type, entity_id: int):
+        """
+        Drops the snapshot of an entity, and forgets if it was missing, so that it's loaded again on its next lookup.
+        Callers invalidate entities once their changes (including their creation) are committed
+        :param entity_class: SQLAlchemy entity class
+        :param entity_id: id of the entity that changed
+        """
+        with self.__lock:
+            self.__invalidations += 1
+            self.__get_cache(entity_class).pop(entity_id)
+            self.__get_cache(entity_class, missing=True).pop(entity_id)
+
+    def clear(self):
+        """
+        Drops every snapshot and missing id, and resets the counters
+        """
+        with self.__lock:
+            self.__invalidations += 1
+            for cache in list(self.__caches.values()) + list(self.__missing_ids.values()):
+                cache.clear()
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        :return: counters of the cache of each entity class (see C{LRUCache.get_stats}), by table name
+        """
+        return {entity_class.__tablename__: cache.get_stats() for entity_class, cache in list(self.__caches.items())}
+
+    def get_missing_stats(self) -> dict[str, dict]:
+        """
+        :return: counters of the missing ids of each entity class (see C{LRUCache.get_stats}), by table name. Hits are
+        lookups answered without going to the DB
+        """
+        return {entity_class.__tablename__: cache.get_stats()
+                for entity_class, cache in list(self.__missing_ids.items())}
+
+    def __get_cache(self, entity_class: type, missing: bool = False) -> LRUCache:
+        """
+        :param entity_class: SQLAlchemy entity class
+        :param missing: if C{True}, the cache of the missing ids is returned instead
+        :return: cache of the snapshots of the entities of the class (or of its missing ids), created on its first use
+        """
+        if missing:
+            caches, max_size, ttl_seconds = self.__missing_ids, EntityCache.__MAX_MISSING_IDS, \
+                EntityCache.__MISSING_TTL_SECONDS
+        else:
+            caches, max_size, ttl_seconds = self.__caches, EntityCache.__MAX_ENTITIES, EntityCache.__TTL_SECONDS
+        cache = caches.get(entity_class)
+        if cache is None:
+            cache = caches.setdefault(entity_class, LRUCache(max_size, ttl_seconds))
+        return cache
+
+    def __add_missing_id(self, entity_class: type, entity_id: int, invalidations: int):
+        """
+        Remembers that an entity is missing, unless it was invalidated (i.e. created) since it was looked up
+        :param entity_class: SQLAlchemy entity class
+        :param entity_id: id of the entity that wasn't found
+        :param invalidations: amount of invalidations before the entity was looked up
+        """
+        with self.__lock:
+            if invalidations == self.__invalidations:
+                self.__get_cache(entity_class, missing=True).put(entity_id, True)
+
+    def __make_snapshot(self, entity: Any) -> Any:
+        """
+        Copies the fields of an entity into a frozen dataclass with the same fields, which serializes the same way
+        :param entity: SQLAlchemy entity, with every field loaded
+        :return: snapshot of the entity
+        """
+        snapshot_class = self.__snapshot_classes.get(entity.__class__)
+        if snapshot_class is None:
+            snapshot_class = self.__snapshot_classes.setdefault(entity.__class__, dataclasses.make_dataclass(
+                f"{entity.__class__.__name__}Snapshot",
+                [(x.name, x.type) for x in dataclasses.fields(entity)],
+                frozen=True
+            ))
+        return snapshot_class(**{x.name: getattr(entity, x.name) for x in dataclasses.fields(entity)})
+
+    """ Max amount of entities of each class kept in memory """
+    __MAX_ENTITIES = 4096
+
+    """ Amount of seconds after which an entity is loaded again, to pick up writes from other processes """
+    __TTL_SECONDS = 60
+
+    """ Max amount of missing ids of each class kept in memory """
+    __MAX_MISSING_IDS = 16384
+
+    """ Amount of seconds after which a missing id is looked up again """
+    __MISSING_TTL_SECONDS = 10
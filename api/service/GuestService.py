@@ -1,8 +1,16 @@
 import functools
+from typing import Optional
 
+from api.service.CacheInvalidator import CacheInvalidator
+from api.service.EntityCache import EntityCache
+from api.service.ResponseCache import ResponseCache
+from api.service.RoomAvailabilityIndex import RoomAvailabilityIndex
 from db.GuestDAO import GuestDAO
 from db.ReservationDAO import ReservationDAO
+from db.TombstoneDAO import TombstoneDAO
 from db.entities.Guest import Guest
+from db.entities.Reservation import Reservation
+from db.entities.Tombstone import Tombstone
 
 
 class GuestService:
@@ -17,24 +25,78 @@ class GuestService:
         """
         return GuestDAO.get_all()
 
+    @staticmethod
+    def get_page(limit: int, after_id: Optional[int] = None, fields: Optional[tuple[str, ...]] = None) -> list[Guest]:
+        """
+        Lists a page of the guests in the db, regardless of status, ordered by id
+        :param limit: max amount of guests to list
+        :param after_id: if included, only guests with a greater id are listed (i.e. the last id of the previous page)
+        :param fields: if included, only these fields of the guests are loaded
+        :return: List of guests
+        """
+        assert isinstance(limit, int), type(limit)
+        assert limit > 0, limit
+        assert after_id is None or after_id > 0, after_id
+        assert fields is None or isinstance(fields, tuple), type(fields)
+        return GuestDAO.get_page(limit, after_id, fields)
+
+    @staticmethod
+    def get_page_version(after_id: Optional[int] = None) -> tuple:
+        """
+        Fetches the version of the guests a page can hold, without loading them, to tell if the page changed
+        :param after_id: if included, only guests with a greater id are considered (i.e. the cursor of the page)
+        :return: tuple that changes whenever one of the guests is created, updated or deleted
+        """
+        assert after_id is None or after_id > 0, after_id
+        return tuple(GuestDAO.get_page_version(after_id))
+
+    @staticmethod
+    def get_changes(limit: int, after_change: Optional[tuple[int, int]] = None,
+                    after_deletion: Optional[tuple[int, int]] = None) -> tuple[list[Guest], list[Tombstone]]:
+        """
+        Lists the guests that were created, updated or deleted since the last sync of a client (change feed)
+        :param limit: max amount of changed guests, and of deleted ones, to list
+        :param after_change: if included, only guests that changed after this (xact_id, id) point are listed (i.e.
+        the ones of the last guest of the previous sync)
+        :param after_deletion: if included, only guests deleted after this (xact_id, id) point are listed (i.e. the
+        ones of the last tombstone of the previous sync)
+        :return: tuple with the list of changed guests and the list of the tombstones of the deleted ones, in the order
+        they changed
+        """
+        assert isinstance(limit, int), type(limit)
+        assert limit > 0, limit
+        assert after_change is None or isinstance(after_change, tuple), type(after_change)
+        assert after_deletion is None or isinstance(after_deletion, tuple), type(after_deletion)
+        return GuestDAO.get_changes(limit, after_change), TombstoneDAO.get_page(Guest, limit, after_deletion)
+
     @staticmethod
     def get_by_id(guest_id: int) -> Guest:
         """
         Fetches a single guest given a matching id
         :param guest_id: Id of the guest being fetched
-        :return: Guest entity if found
+        :return: Guest entity if found. It's a read-only snapshot, shared with other requests (see C{EntityCache})
         :raises sqlalchemy.orm.exc.NoResultFound: when no matching guest is found
         """
         assert isinstance(guest_id, int), type(guest_id)
         assert guest_id > 0
-        return GuestDAO.get(guest_id)
+        return EntityCache().get(Guest, guest_id, lambda: GuestDAO.get(guest_id))
+
+    @staticmethod
+    def get_many(guest_ids: set[int]) -> list[Guest]:
+        """
+        Fetches several guests with a single query
+        :param guest_ids: Ids of the guests being fetched
+        :return: List of the matching guests. Missing guests are left out
+        """
+        assert isinstance(guest_ids, set), type(guest_ids)
+        return GuestDAO.get_many(guest_ids)
 
     @staticmethod
-    def create(create_request: dict) -> int:
+    def create(create_request: dict) -> Guest:
         """
         Creates a guest based on the specified create_request dict
         :param create_request: dictionary specifying the values for the guest properties
-        :return id of the newly created resource
+        :return the newly created guest, along with the values generated by the DB (i.e. id, created_at)
         """
         assert isinstance(create_request, dict), type(create_request)
         assert len(create_request.keys()) > 0
@@ -47,14 +109,19 @@ class GuestService:
         GuestDAO.begin()
         GuestDAO.save(guest)
         GuestDAO.commit()
-        return guest.id
+        # The id of the guest may have been looked up before it was taken
+        EntityCache().invalidate(Guest, guest.id)
+        ResponseCache().invalidate(Guest)
+        CacheInvalidator().guest_changed(guest.id)
+        return guest
 
     @staticmethod
-    def update(guest_id: int, update_request: dict):
+    def update(guest_id: int, update_request: dict) -> Guest:
         """
         Updates a guest based on the specified update_request dict
         :param guest_id: Guest id we want to update
         :param update_request: Fields we want to replace of the existing guest
+        :return the updated guest, along with the values generated by the DB (i.e. updated_at)
         :raises sqlalchemy.orm.exc.NoResultFound: when no matching guest is found for the update
         """
         assert isinstance(guest_id, int), type(guest_id)
@@ -70,6 +137,10 @@ class GuestService:
         GuestDAO.begin()
         GuestDAO.save(guest)
         GuestDAO.commit()
+        EntityCache().invalidate(Guest, guest_id)
+        ResponseCache().invalidate(Guest)
+        CacheInvalidator().guest_changed(guest_id)
+        return guest
 
     @staticmethod
     def delete(guest_id: int):
@@ -84,11 +155,21 @@ class GuestService:
 
         guest = GuestDAO.get(guest_id)
         linked_reservations = ReservationDAO.get_reservations_for_guest(guest_id)
+        linked_reservation_rooms = [(x.room_id, x.id) for x in linked_reservations]
 
         GuestDAO.begin()
         for reservation in linked_reservations:
             ReservationDAO.delete(reservation)
         GuestDAO.flush()
         GuestDAO.delete(guest)
+        # Leave tombstones behind for the change feed
+        TombstoneDAO.save_many(Reservation, [x for _, x in linked_reservation_rooms])
+        TombstoneDAO.save_many(Guest, [guest_id])
         GuestDAO.commit()
 
+        EntityCache().invalidate(Guest, guest_id)
+        ResponseCache().invalidate(Guest)
+        for room_id, reservation_id in linked_reservation_rooms:
+            RoomAvailabilityIndex().remove_reservation(room_id, reservation_id)
+        CacheInvalidator().guest_changed(guest_id, [x for x, _ in linked_reservation_rooms])
+
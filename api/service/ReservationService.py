@@ -1,17 +1,29 @@
 import functools
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, Union
 
 from pytz import utc
+from sqlalchemy.exc import IntegrityError
 
 from api.controllers.reservation.ReservationFields import ReservationFields
 from api.entities.APIErrors import ReservationError
 from api.entities.ErrorMessages import ErrorMessages
+from api.entities.ReservationFilters import ReservationFilters
 from api.entities.ReservationStatus import ReservationStatus
+from api.entities.RoomCalendar import RoomCalendar
+from api.service.CacheInvalidator import CacheInvalidator
+from api.service.EntityCache import EntityCache
 from api.service.GuestService import GuestService
+from api.service.RoomAvailabilityIndex import RoomAvailabilityIndex
 from api.service.RoomService import RoomService
 from db.ReservationDAO import ReservationDAO
+from db.TombstoneDAO import TombstoneDAO
+from db.entities.Guest import Guest
 from db.entities.Reservation import Reservation
+from db.entities.Room import Room
+from db.entities.Tombstone import Tombstone
 from utils.DateUtils import DateUtils
+from utils.IntervalIndex import IntervalIndex
 
 
 class ReservationService:
@@ -26,6 +38,85 @@ class ReservationService:
         """
         return ReservationDAO.get_all()
 
+    @staticmethod
+    def get_page(limit: int, after_id: Optional[int] = None, filters: Optional[ReservationFilters] = None,
+                 fields: Optional[tuple[str, ...]] = None) -> list[Reservation]:
+        """
+        Lists a page of the reservations in the db matching the filters, ordered by id
+        :param limit: max amount of reservations to list
+        :param after_id: if included, only reservations with a greater id are listed (i.e. the last id of the previous
+        page)
+        :param filters: if included, filters the reservations have to match (i.e. the ones active tonight)
+        :param fields: if included, only these fields of the reservations are loaded
+        :return: List of reservations
+        """
+        assert isinstance(limit, int), type(limit)
+        assert limit > 0, limit
+        assert after_id is None or after_id > 0, after_id
+        assert filters is None or isinstance(filters, ReservationFilters), type(filters)
+        assert fields is None or isinstance(fields, tuple), type(fields)
+        return ReservationDAO.get_page(limit, after_id, filters, fields)
+
+    @staticmethod
+    def get_page_version(after_id: Optional[int] = None, filters: Optional[ReservationFilters] = None) -> tuple:
+        """
+        Fetches the version of the reservations a page (or stream) can hold, without loading them, to tell if it changed
+        :param after_id: if included, only reservations with a greater id are considered (i.e. the cursor of the page)
+        :param filters: if included, filters the reservations have to match
+        :return: tuple that changes whenever one of the reservations is created, updated or deleted
+        """
+        assert after_id is None or after_id > 0, after_id
+        assert filters is None or isinstance(filters, ReservationFilters), type(filters)
+        return tuple(ReservationDAO.get_page_version(after_id, filters))
+
+    @staticmethod
+    def get_changes(limit: int, after_change: Optional[tuple[int, int]] = None,
+                    after_deletion: Optional[tuple[int, int]] = None) -> tuple[list[Reservation], list[Tombstone]]:
+        """
+        Lists the reservations that were created, updated or deleted since the last sync of a client (change feed)
+        :param limit: max amount of changed reservations, and of deleted ones, to list
+        :param after_change: if included, only reservations that changed after this (xact_id, id) point are
+        listed (i.e. the ones of the last reservation of the previous sync)
+        :param after_deletion: if included, only reservations deleted after this (xact_id, id) point are listed
+        (i.e. the ones of the last tombstone of the previous sync)
+        :return: tuple with the list of changed reservations and the list of the tombstones of the deleted ones, in
+        the order they changed
+        """
+        assert isinstance(limit, int), type(limit)
+        assert limit > 0, limit
+        assert after_change is None or isinstance(after_change, tuple), type(after_change)
+        assert after_deletion is None or isinstance(after_deletion, tuple), type(after_deletion)
+        return ReservationDAO.get_changes(limit, after_change), \
+            TombstoneDAO.get_page(Reservation, limit, after_deletion)
+
+    @staticmethod
+    def get_version(reservation_id: int) -> Optional[tuple]:
+        """
+        Fetches the version of a single reservation, without loading it, to tell if it changed
+        :param reservation_id: Id of the reservation
+        :return: tuple that changes whenever the reservation is updated, or C{None} if no matching reservation is found.
+        Reservations that were recently found missing aren't looked up again (see C{EntityCache})
+        """
+        assert isinstance(reservation_id, int), type(reservation_id)
+        assert reservation_id > 0, reservation_id
+        version = EntityCache().find(Reservation, reservation_id, lambda: ReservationDAO.get_version(reservation_id))
+        return tuple(version) if version else None
+
+    @staticmethod
+    def stream(filters: Optional[ReservationFilters] = None,
+               fields: Optional[tuple[str, ...]] = None) -> Iterator[Reservation]:
+        """
+        Iterates over all the reservations in the db matching the filters, ordered by id. Reservations are read from
+        the DB a batch at a time as they're iterated over, so that even the whole table can be gone through (i.e. for
+        exports) without holding it in memory
+        :param filters: if included, filters the reservations have to match
+        :param fields: if included, only these fields of the reservations are loaded
+        :return: iterator of reservations
+        """
+        assert filters is None or isinstance(filters, ReservationFilters), type(filters)
+        assert fields is None or isinstance(fields, tuple), type(fields)
+        return ReservationDAO.stream(filters, fields)
+
     @staticmethod
     def get_by_id(reservation_id: int) -> Reservation:
         """
@@ -39,11 +130,11 @@ class ReservationService:
         return ReservationDAO.get(reservation_id)
 
     @staticmethod
-    def create(create_request: dict) -> int:
+    def create(create_request: dict) -> Reservation:
         """
         Creates a reservation based on the specified create_request dict
         :param create_request: dictionary specifying the values for the reservation properties
-        :return id of the newly created resource
+        :return the newly created reservation, along with the values generated by the DB (i.e. id, created_at)
         :raise ReservationError: if any business logic issues are found with the creation request, this error is raised
         with a relevant description of the error so that the caller can take action.
         """
@@ -59,22 +150,91 @@ class ReservationService:
         if reservation.start_date.tzinfo is None or reservation.end_date.tzinfo is None:
             raise ReservationError(ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
 
-        # Start performing some validations for the reservation
-        ReservationService.__validate_reservation_dates(reservation)
-        ReservationService.__validate_room_and_guest(reservation)
-        ReservationService.__validate_reservation_scheduling_conflicts(reservation)
+        ReservationDAO.begin()
+        try:
+            # Locks the room until the reservation is committed, so that the scheduling conflicts check can't be
+            # raced by another booking for the same room
+            RoomService.lock(reservation.room_id)
+
+            # Start performing some validations for the reservation
+            ReservationService.__validate_reservation_dates(reservation)
+            ReservationService.__validate_booking(reservation, check_scheduling_conflicts=True)
+
+            ReservationDAO.save(reservation)
+            ReservationDAO.commit()
+        except Exception as error:
+            ReservationService.__handle_write_error(create_request[ReservationFields.ROOM_ID.value], error)
+
+        ReservationService.__update_availability_index(reservation)
+        # The id of the reservation may have been looked up before it was taken
+        EntityCache().invalidate(Reservation, reservation.id)
+        CacheInvalidator().room_reservations_changed([reservation.room_id], created_reservation_ids=[reservation.id])
+        return reservation
+
+    @staticmethod
+    def create_many(create_requests: list[dict],
+                    all_or_nothing: bool = True) -> list[Union[Reservation, ReservationError]]:
+        """
+        Creates several reservations at once (i.e. group bookings), in a single transaction. Each reservation follows
+        the same rules as the ones created through C{create}, and it's also checked for scheduling conflicts with the
+        reservations before it in the list. Rooms, guests and the existing reservations are all loaded upfront, and the
+        valid reservations are inserted with a single multi-row statement
+        :param create_requests: dictionaries specifying the values for the properties of each reservation
+        :param all_or_nothing: if C{True}, no reservation is created unless all of them are valid. Otherwise, the valid
+        ones are created
+        :return: list with the created reservation, or the error that prevented its creation, for each create request
+        in the same order
+        """
+        assert isinstance(create_requests, list), type(create_requests)
+        assert len(create_requests) > 0
+
+        results = [ReservationService.__build_reservation(x) for x in create_requests]
+        reservations = [x for x in results if isinstance(x, Reservation)]
 
         ReservationDAO.begin()
-        ReservationDAO.save(reservation)
-        ReservationDAO.commit()
-        return reservation.id
+        try:
+            # Locks every room involved until the reservations are committed (see C{create})
+            rooms = {x.id: x for x in RoomService.get_many_for_update({x.room_id for x in reservations})}
+            guests = {x.id: x for x in GuestService.get_many({x.guest_id for x in reservations})}
+            scheduled_reservations = ReservationService.__load_scheduled_reservations(reservations)
+
+            for i, reservation in enumerate(results):
+                if isinstance(reservation, Reservation):
+                    try:
+                        ReservationService.__validate_bulk_reservation(
+                            reservation, -(i + 1), rooms, guests, scheduled_reservations
+                        )
+                    except ReservationError as error:
+                        results[i] = error
+
+            reservations = [x for x in results if isinstance(x, Reservation)]
+            if not reservations or (all_or_nothing and len(reservations) < len(results)):
+                ReservationDAO.rollback()
+                not_created_error = ReservationError(ErrorMessages.RESERVATION_NOT_CREATED_ERROR_MESSAGE.value)
+                return [x if isinstance(x, ReservationError) else not_created_error for x in results]
+
+            created_reservations = ReservationDAO.insert_many(reservations)
+            ReservationDAO.commit()
+        except Exception:
+            ReservationDAO.rollback()
+            raise
+
+        for reservation in created_reservations:
+            ReservationService.__update_availability_index(reservation)
+            EntityCache().invalidate(Reservation, reservation.id)
+        CacheInvalidator().room_reservations_changed([x.room_id for x in created_reservations],
+                                                     created_reservation_ids=[x.id for x in created_reservations])
+
+        created_reservations = iter(created_reservations)
+        return [next(created_reservations) if isinstance(x, Reservation) else x for x in results]
 
     @staticmethod
-    def update(reservation_id: int, update_request: dict):
+    def update(reservation_id: int, update_request: dict) -> Reservation:
         """
         Updates a reservation based on the specified update_request dict
         :param reservation_id: Reservation id we want to update
         :param update_request: Fields we want to replace of the existing reservation
+        :return the updated reservation, along with the values generated by the DB (i.e. updated_at)
         :raises sqlalchemy.orm.exc.NoResultFound: when no matching reservation is found for the update
         :raise ReservationError: if any business logic issues are found with the update request, this error is raised
         with a relevant description of the error so that the caller can take action.
@@ -85,31 +245,48 @@ class ReservationService:
         assert len(update_request.keys()) > 0
 
         reservation = ReservationDAO.get(reservation_id)
-        set_field = functools.partial(setattr, reservation)
-        for k, v in update_request.items():
-            set_field(k, v)
-
-        # Check that start_date and end_date have tz info. Otherwise, reject the request
-        if reservation.start_date.tzinfo is None or reservation.end_date.tzinfo is None:
-            raise ReservationError(ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
-
-        # Start performing some validations for the reservation
-        ReservationService.__validate_room_and_guest(reservation)
-
-        # If any of these fields are included in the update request AND the room has a status of
-        # C{ReservationStatus.SCHEDULED}, we have to do some checks for the dates
-        if (ReservationFields.ROOM_ID.value in update_request or
-            ReservationFields.STATUS.value in update_request or
-            ReservationFields.START_DATE.value in update_request or
-            ReservationFields.END_DATE.value in update_request) and \
-                reservation.status is ReservationStatus.SCHEDULED:
-
-            ReservationService.__validate_reservation_dates(reservation)
-            ReservationService.__validate_reservation_scheduling_conflicts(reservation)
+        previous_room_id = reservation.room_id
+        room_id = update_request.get(ReservationFields.ROOM_ID.value, previous_room_id)
 
+        # Changes to the reservation are flushed inside of this transaction, so they are discarded if any of the
+        # validations fail
         ReservationDAO.begin()
-        ReservationDAO.save(reservation)
-        ReservationDAO.commit()
+        try:
+            # Locks the room the reservation ends up in, before any changes are flushed (see C{create})
+            RoomService.lock(room_id)
+
+            set_field = functools.partial(setattr, reservation)
+            for k, v in update_request.items():
+                set_field(k, v)
+
+            # Check that start_date and end_date have tz info. Otherwise, reject the request
+            if reservation.start_date.tzinfo is None or reservation.end_date.tzinfo is None:
+                raise ReservationError(ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
+
+            # If any of these fields are included in the update request AND the room has a status of
+            # C{ReservationStatus.SCHEDULED}, we have to do some checks for the dates
+            check_scheduling_conflicts = (ReservationFields.ROOM_ID.value in update_request or
+                                          ReservationFields.STATUS.value in update_request or
+                                          ReservationFields.START_DATE.value in update_request or
+                                          ReservationFields.END_DATE.value in update_request) and \
+                reservation.status is ReservationStatus.SCHEDULED
+            if check_scheduling_conflicts:
+                ReservationService.__validate_reservation_dates(reservation)
+
+            # Start performing some validations for the reservation
+            ReservationService.__validate_booking(reservation, check_scheduling_conflicts)
+
+            ReservationDAO.save(reservation)
+            ReservationDAO.commit()
+        except Exception as error:
+            # The availability index could have loaded the changes that were flushed inside of the transaction
+            RoomAvailabilityIndex().invalidate_room(previous_room_id)
+            RoomAvailabilityIndex().invalidate_room(room_id)
+            ReservationService.__handle_write_error(room_id, error)
+
+        ReservationService.__update_availability_index(reservation, previous_room_id)
+        CacheInvalidator().room_reservations_changed([previous_room_id, reservation.room_id])
+        return reservation
 
     @staticmethod
     def delete(reservation_id: int):
@@ -122,10 +299,16 @@ class ReservationService:
         assert reservation_id > 0, reservation_id
 
         reservation = ReservationDAO.get(reservation_id)
+        room_id = reservation.room_id
         ReservationDAO.begin()
         ReservationDAO.delete(reservation)
+        # Leave a tombstone behind for the change feed
+        TombstoneDAO.save_many(Reservation, [reservation_id])
         ReservationDAO.commit()
 
+        RoomAvailabilityIndex().remove_reservation(room_id, reservation_id)
+        CacheInvalidator().room_reservations_changed([room_id])
+
     @staticmethod
     def check_room_availability(room_id: int, start_date: datetime, end_date: datetime,
                                 reservation_id: int = None) -> bool:
@@ -142,70 +325,256 @@ class ReservationService:
         :return: C{False} if at least 1 reservation of this room overlaps with the desired start/end dates.
         Otherwise, C{True} is returned.
         """
-        # Grab all SCHEDULED reservations (namely, weed out the CANCELED ones) for the desired room_id
-        reservations = [x for x in ReservationService.get_all() if
-                        x.status is ReservationStatus.SCHEDULED and
-                        x.room_id == room_id]
+        # The in-process index only holds SCHEDULED reservations (namely, it weeds out the CANCELED ones) for each room
+        return RoomAvailabilityIndex().is_available(room_id, start_date, end_date, reservation_id)
+
+    @staticmethod
+    def check_rooms_availability(availability_requests: list[tuple[int, datetime, datetime]]) -> list[bool]:
+        """
+        Checks the availability of several rooms/date ranges at once. See C{check_room_availability}
 
-        # If this parameter is defined, we want to remove that Reservation from the list of potential conflicting
-        # reservations
-        if reservation_id:
-            reservations = [x for x in reservations if x.id != reservation_id]
+        :param availability_requests: list of (room_id, start_date, end_date) tuples to check
+        :return: list with the availability of each request, in the same order
+        """
+        assert isinstance(availability_requests, list), type(availability_requests)
+        return RoomAvailabilityIndex().are_available(availability_requests)
+
+    @staticmethod
+    def get_rooms_calendar(room_ids: list[int]) -> list[RoomCalendar]:
+        """
+        Gets the free/occupied nights of several rooms for the whole booking window. That is, from today (in UTC)
+        until the last night a reservation can currently end on. Nights are UTC calendar days, and a night is
+        occupied if any SCHEDULED reservation of the room touches it.
+
+        :param room_ids: Rooms to get the calendar for
+        :return: list with the calendar of each room, in the same order
+        """
+        assert isinstance(room_ids, list), type(room_ids)
+
+        first_night = datetime.now(tz=utc).date()
+        nights = ReservationService.__MAX_DAYS_IN_ADVANCE + ReservationService.__MAX_STAY_DAYS + 1
+        occupancy = RoomAvailabilityIndex().get_occupancy(
+            room_ids, DateUtils.convert_date_to_epoch_days(first_night), nights
+        )
+
+        dates = [(first_night + timedelta(days=i)).isoformat() for i in range(nights)]
+        return [
+            RoomCalendar(
+                room_id=room_id,
+                start_date=dates[0],
+                end_date=dates[-1],
+                nights=[
+                    {"date": night_date, "is_available": (occupancy[room_id] >> i) & 1 == 0}
+                    for i, night_date in enumerate(dates)
+                ]
+            )
+            for room_id in room_ids
+        ]
 
-        for reservation in reservations:
-            if DateUtils.check_if_date_ranges_overlap(
-                    start_date, end_date, reservation.start_date, reservation.end_date
-            ):
-                return False
+    @staticmethod
+    def __validate_booking(reservation: Reservation, check_scheduling_conflicts: bool):
+        """
+        Validates the room, the guest and (optionally) the scheduling conflicts of the reservation, with the details
+        fetched by a single query
 
-        return True
+        :param reservation: Reservation entity to make the validations upon
+        :param check_scheduling_conflicts: if C{True}, the reservation is also checked for scheduling conflicts
+        :raise ReservationError: if any business logic issues are found with the reservation, this error is raised
+        with a relevant description of the error so that the caller can take action.
+        """
+        # The room is locked by the caller, so the reservations of the room can't change until it's committed. They're
+        # read from the DB rather than the in-process availability index, which could be missing the writes of other
+        # workers. On Postgres, an exclusion constraint still backs this check up (see C{__handle_write_error})
+        booking_details = ReservationDAO.get_booking_details(
+            reservation.room_id, reservation.guest_id, reservation.start_date, reservation.end_date, reservation.id
+        )
+        ReservationService.__validate_room_and_guest(
+            reservation, booking_details.room_is_active, booking_details.room_capacity, booking_details.guest_is_active
+        )
+        if check_scheduling_conflicts:
+            ReservationService.__validate_reservation_scheduling_conflicts(
+                reservation, booking_details.has_overlapping_reservations
+            )
 
     @staticmethod
-    def __validate_reservation_scheduling_conflicts(reservation: Reservation):
+    def __validate_reservation_scheduling_conflicts(reservation: Reservation, has_overlapping_reservations: bool):
         """
         Performs validations upon the reservation related to prevent scheduling conflicts with other qualifying
         reservations.
 
         :param reservation: Reservation entity to make the validations upon
+        :param has_overlapping_reservations: whether the room has other SCHEDULED reservations overlapping this one
         :raise ReservationError: if any business logic issues are found with the reservation, this error is raised
         with a relevant description of the error so that the caller can take action.
         """
-        if not ReservationService.check_room_availability(
-                reservation.room_id, reservation.start_date, reservation.end_date, reservation.id
+        if has_overlapping_reservations:
+            raise ReservationService.__build_scheduling_conflict_error(reservation.room_id)
+
+    @staticmethod
+    def __build_reservation(create_request: dict) -> Union[Reservation, ReservationError]:
+        """
+        Builds a reservation entity for one of the requests of C{create_many}, and validates its dates
+
+        :param create_request: dictionary specifying the values for the reservation properties
+        :return: the reservation entity, or the error that prevents its creation
+        """
+        reservation = Reservation()
+        reservation.status = ReservationStatus.SCHEDULED
+        set_field = functools.partial(setattr, reservation)
+        for k, v in create_request.items():
+            set_field(k, v)
+
+        # Check that start_date and end_date have tz info. Otherwise, reject the request
+        if reservation.start_date.tzinfo is None or reservation.end_date.tzinfo is None:
+            return ReservationError(ErrorMessages.TIMEZONE_MISSING_FROM_DATE_FIELDS.value)
+
+        try:
+            ReservationService.__validate_reservation_dates(reservation)
+        except ReservationError as error:
+            return error
+        return reservation
+
+    @staticmethod
+    def __load_scheduled_reservations(reservations: list[Reservation]) -> dict[int, IntervalIndex]:
+        """
+        Loads the SCHEDULED reservations that could conflict with any of the given ones, with a single query
+
+        :param reservations: Reservation entities that are going to be created
+        :return: dictionary with an index of the SCHEDULED reservations of each room
+        """
+        if not reservations:
+            return {}
+
+        room_ids = {x.room_id for x in reservations}
+        spans_by_room = {room_id: [] for room_id in room_ids}
+        for room_id, reservation_id, start_date, end_date in ReservationDAO.get_scheduled_reservation_spans(
+                room_ids, min(x.start_date for x in reservations), max(x.end_date for x in reservations)
         ):
-            raise ReservationError(
-                f"The room you're attempting to reserve (room_id: {reservation.room_id}) is not available between the "
-                f"specified start_date and end_date. Please change them and try again."
+            spans_by_room[room_id].append((
+                reservation_id,
+                DateUtils.convert_datetime_to_epoch_microseconds(start_date),
+                DateUtils.convert_datetime_to_epoch_microseconds(end_date)
+            ))
+        return {room_id: IntervalIndex(spans) for room_id, spans in spans_by_room.items()}
+
+    @staticmethod
+    def __validate_bulk_reservation(reservation: Reservation, key: int, rooms: dict[int, Room],
+                                    guests: dict[int, Guest], scheduled_reservations: dict[int, IntervalIndex]):
+        """
+        Performs the validations of one of the reservations of C{create_many}, against the preloaded rooms, guests and
+        SCHEDULED reservations. If it's valid and SCHEDULED, it's added to the SCHEDULED reservations, so that the
+        following reservations are checked against it too
+
+        :param reservation: Reservation entity to make the validations upon
+        :param key: key to identify the reservation among the SCHEDULED reservations, which can't match any id
+        :param rooms: rooms of the reservations, by id
+        :param guests: guests of the reservations, by id
+        :param scheduled_reservations: index of the SCHEDULED reservations of each room
+        :raise ReservationError: if any business logic issues are found with the reservation, this error is raised
+        with a relevant description of the error so that the caller can take action.
+        """
+        room = rooms.get(reservation.room_id)
+        guest = guests.get(reservation.guest_id)
+        ReservationService.__validate_room_and_guest(
+            reservation,
+            None if room is None else room.is_active,
+            None if room is None else room.capacity,
+            None if guest is None else guest.is_active
+        )
+
+        if ReservationStatus(reservation.status) is ReservationStatus.SCHEDULED:
+            room_reservations = scheduled_reservations[reservation.room_id]
+            start = DateUtils.convert_datetime_to_epoch_microseconds(reservation.start_date)
+            end = DateUtils.convert_datetime_to_epoch_microseconds(reservation.end_date)
+            if room_reservations.overlaps(start, end):
+                raise ReservationService.__build_scheduling_conflict_error(reservation.room_id)
+            room_reservations.add(key, start, end)
+
+    @staticmethod
+    def __handle_write_error(room_id: int, error: Exception):
+        """
+        Rolls back the current transaction after an error while writing a reservation. Scheduling conflicts detected
+        by the DB are translated into a C{ReservationError}
+
+        :param room_id: Room of the reservation that was being written
+        :param error: error raised while writing the reservation
+        :raise ReservationError: if the DB detected a scheduling conflict with another reservation
+        :raise Exception: the original error, for any other issue
+        """
+        ReservationDAO.rollback()
+        if isinstance(error, IntegrityError) and ReservationDAO.is_scheduling_conflict(error):
+            raise ReservationService.__build_scheduling_conflict_error(room_id) from error
+        raise error
+
+    @staticmethod
+    def __update_availability_index(reservation: Reservation, previous_room_id: int = None):
+        """
+        Keeps the availability index current after a reservation has been written
+
+        :param reservation: Reservation entity that was written
+        :param previous_room_id: if included, the room the reservation belonged to before being written
+        """
+        availability_index = RoomAvailabilityIndex()
+        if previous_room_id and previous_room_id != reservation.room_id:
+            availability_index.remove_reservation(previous_room_id, reservation.id)
+
+        if reservation.status is ReservationStatus.SCHEDULED:
+            availability_index.add_reservation(
+                reservation.room_id, reservation.id, reservation.start_date, reservation.end_date
             )
+        else:
+            availability_index.remove_reservation(reservation.room_id, reservation.id)
 
     @staticmethod
-    def __validate_room_and_guest(reservation: Reservation):
+    def __build_scheduling_conflict_error(room_id: int) -> ReservationError:
+        """
+        Builds the error used when a reservation conflicts with another qualifying reservation
+
+        :param room_id: Room of the reservation that has the scheduling conflict
+        :return: error with a relevant description so that the caller can take action
+        """
+        return ReservationError(
+            f"The room you're attempting to reserve (room_id: {room_id}) is not available between the "
+            f"specified start_date and end_date. Please change them and try again."
+        )
+
+    @staticmethod
+    def __validate_room_and_guest(reservation: Reservation, room_is_active: Optional[bool],
+                                  room_capacity: Optional[int], guest_is_active: Optional[bool]):
         """
         Performs validations upon the reservation related to the guest_id, room_id and amount_of_guests to make sure
         that they comply with the desired business logic
 
         :param reservation: Reservation entity to make the validations upon
+        :param room_is_active: whether the room of the reservation is active, C{None} if the room doesn't exist
+        :param room_capacity: capacity of the room of the reservation, C{None} if the room doesn't exist
+        :param guest_is_active: whether the guest of the reservation is active, C{None} if the guest doesn't exist
         :raise ReservationError: if any business logic issues are found with the reservation, this error is raised
         with a relevant description of the error so that the caller can take action.
         """
+        if room_is_active is None:
+            raise ReservationError(f"Resource Room with id {reservation.room_id} does not exist. Please provide a "
+                                   f"valid 'room_id'")
+        if guest_is_active is None:
+            raise ReservationError(f"Resource Guest with id {reservation.guest_id} does not exist. Please provide a "
+                                   f"valid 'guest_id'")
+
         booking_error_message = ""
 
         # Validate that the room being reserved is active
-        room = RoomService.get_by_id(reservation.room_id)
-        if not room.is_active:
+        if not room_is_active:
             booking_error_message = f"The room you're attempting to reserve (room_id: {reservation.room_id}) is NOT " \
                                     f"active"
 
         # Validate that the guest trying to make the reservation is active
-        guest = GuestService.get_by_id(reservation.guest_id)
-        if not guest.is_active:
+        if not guest_is_active:
             booking_error_message = f"The guest attempting to make the reservation (guest_id: {reservation.guest_id})" \
                                     f" is NOT active"
 
         # Check that the room can hold the amount of guests in the reservation
-        if reservation.amount_of_guests and room.capacity and reservation.amount_of_guests > room.capacity:
+        if reservation.amount_of_guests and room_capacity and reservation.amount_of_guests > room_capacity:
             booking_error_message = f"The room you're trying to reserve (room_id: {reservation.room_id})  is too " \
-                                    f"small, it can only hold {room.capacity} guest(s)"
+                                    f"small, it can only hold {room_capacity} guest(s)"
 
         if booking_error_message:
             raise ReservationError(booking_error_message)
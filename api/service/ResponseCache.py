@@ -0,0 +1,90 @@
+from threading import Lock
+from typing import Hashable, Optional
+
+from api.entities.CachedResponse import CachedResponse
+from utils.LRUCache import LRUCache
+from utils.singleton import Singleton
+
+
+class ResponseCache(metaclass=Singleton):
+    """
+    In-process cache of the responses of the listings of the entities that barely ever change (i.e. the pages of rooms
+    and guests), already encoded. Each entity class gets its own LRU cache, and the writes made through the service
+    layer drop every response of the class of the entity they change (see C{invalidate}), since any of its pages may
+    hold it. Responses also expire after a while, so that writes made outside of the service layer are picked up.
+
+    Responses are keyed by the generation of their class as well, which every invalidation bumps: the responses cached
+    before are never read again, and they age out of the LRU cache
+    """
+    def __init__(self):
+        self.__caches: dict[type, LRUCache] = {}
+        self.__generations: dict[type, int] = {}
+        self.__lock = Lock()
+
+    def get(self, entity_class: type, key: Hashable) -> Optional[CachedResponse]:
+        """
+        :param entity_class: SQLAlchemy entity class of the entities the response lists
+        :param key: key of the response (i.e. its URL)
+        :return: the cached response, or C{None} if it isn't cached
+        """
+        return self.__get_cache(entity_class).get((self.get_generation(entity_class), key))
+
+    def get_generation(self, entity_class: type) -> int:
+        """
+        :param entity_class: SQLAlchemy entity class
+        :return: counter of the invalidations of the class, to be taken before a response is built (see C{put})
+        """
+        return self.__generations.get(entity_class, 0)
+
+    def put(self, entity_class: type, key: Hashable, response: CachedResponse, generation: int):
+        """
+        Caches a response, under the generation of its class from before it was built. If the class was invalidated in
+        the meantime, the response may be outdated, but it's never read
+        :param entity_class: SQLAlchemy entity class of the entities the response lists
+        :param key: key of the response (i.e. its URL)
+        :param response: response to cache
+        :param generation: counter of the invalidations of the class before the response was built
+        (see C{get_generation})
+        """
+        self.__get_cache(entity_class).put((generation, key), response)
+
+    def invalidate(self, entity_class: type):
+        """
+        Drops every response of a class, so that they're built again on their next request. Callers invalidate the
+        class of an entity once its changes (including its creation or deletion) are committed
+        :param entity_class: SQLAlchemy entity class of the entity that changed
+        """
+        with self.__lock:
+            self.__generations[entity_class] = self.get_generation(entity_class) + 1
+
+    def clear(self):
+        """
+        Drops every response, and resets the counters
+        """
+        with self.__lock:
+            for entity_class, cache in self.__caches.items():
+                self.__generations[entity_class] = self.get_generation(entity_class) + 1
+                cache.clear()
+
+    def get_stats(self) -> dict[str, dict]:
+        """
+        :return: counters of the cache of each entity class (see C{LRUCache.get_stats}), by table name
+        """
+        return {entity_class.__tablename__: cache.get_stats() for entity_class, cache in list(self.__caches.items())}
+
+    def __get_cache(self, entity_class: type) -> LRUCache:
+        """
+        :param entity_class: SQLAlchemy entity class
+        :return: cache of the responses of the class, created on its first use
+        """
+        cache = self.__caches.get(entity_class)
+        if cache is None:
+            cache = self.__caches.setdefault(entity_class,
+                                             LRUCache(ResponseCache.__MAX_RESPONSES, ResponseCache.__TTL_SECONDS))
+        return cache
+
+    """ Max amount of responses of each class kept in memory """
+    __MAX_RESPONSES = 1024
+
+    """ Amount of seconds after which a response is built again, to pick up writes made outside of the service layer """
+    __TTL_SECONDS = 60
@@ -0,0 +1,303 @@
+import itertools
+from datetime import datetime
+from threading import RLock
+from typing import Iterable
+
+from db.ReservationDAO import ReservationDAO
+from utils.DateUtils import DateUtils
+from utils.IntervalIndex import IntervalIndex
+from utils.LRUCache import LRUCache
+from utils.singleton import Singleton
+
+
+class RoomAvailabilityIndex(metaclass=Singleton):
+    """
+    In-process index of the SCHEDULED reservations of each room, used to answer availability checks without going to
+    the DB. Rooms are loaded lazily on their first check, and only the most recently checked ones are kept in memory.
+
+    The index is kept current by the writes made through the service layer. Entries also expire after a while, so that
+    writes made by other processes are eventually picked up.
+
+    The answers to the availability checks are memoized as well, keyed by the version of the reservations of the room:
+    every change to them (see C{add_reservation}, C{remove_reservation} and C{invalidate_room}) bumps the version of the
+    room, so the answers given before are never read again, and they age out of the LRU memo. Dropping every room (see
+    C{clear}) bumps the epoch of the index instead, which is part of the version of every room
+    """
+    def __init__(self):
+        self.__rooms = LRUCache(RoomAvailabilityIndex.__MAX_ROOMS, RoomAvailabilityIndex.__TTL_SECONDS)
+        # Version of the reservations of each room that changed, taken from a single counter so that they never repeat
+        self.__versions: dict[int, int] = {}
+        self.__version_counter = itertools.count(1)
+        # Bumped whenever every room is dropped, along with the versions of the rooms
+        self.__epoch = 0
+        # Answers to the availability checks, by (room_id, start_date, end_date, excluded_reservation_id, version)
+        self.__answers = LRUCache(RoomAvailabilityIndex.__MAX_ANSWERS, RoomAvailabilityIndex.__TTL_SECONDS)
+        # Bitmasks of the occupied nights of each room, along with the index they were built from
+        self.__occupancy = LRUCache(RoomAvailabilityIndex.__MAX_ROOMS)
+        # Guards the indexes of the rooms, which aren't safe to read while they're being modified
+        self.__lock = RLock()
+
+    def is_available(self, room_id: int, start_date: datetime, end_date: datetime,
+                     excluded_reservation_id: int = None) -> bool:
+        """
+        Checks if the room has no SCHEDULED reservations overlapping the given date range
+        :param room_id: Room we're going to check the availability for
+        :param start_date: start of the date range to check
+        :param end_date: end of the date range to check
+        :param excluded_reservation_id: if included, that reservation is taken out of consideration
+        :return: C{True} if the room is available, C{False} otherwise
+        """
+        key = (room_id, start_date, end_date, excluded_reservation_id, self.__get_version(room_id))
+        available = self.__answers.get(key)
+        if available is None:
+            room_index = self.__get_room_indexes([room_id])[room_id]
+            with self.__lock:
+                available = not room_index.overlaps(
+                    DateUtils.convert_datetime_to_epoch_microseconds(start_date),
+                    DateUtils.convert_datetime_to_epoch_microseconds(end_date),
+                    excluded_reservation_id
+                )
+            # If the room changed in the meantime, the answer is stored under a version that's never read again
+            self.__answers.put(key, available)
+        return available
+
+    def are_available(self, availability_requests: list[tuple[int, datetime, datetime]]) -> list[bool]:
+        """
+        Checks the availability of several rooms/date ranges at once. The rooms that aren't in memory yet are all
+        loaded with a single query
+        :param availability_requests: list of (room_id, start_date, end_date) tuples to check
+        :return: list with the availability of each request, in the same order (see C{is_available})
+        """
+        keys = [(room_id, start_date, end_date, None, self.__get_version(room_id))
+                for room_id, start_date, end_date in availability_requests]
+        answers = [self.__answers.get(x) for x in keys]
+        missing_keys = [x for x, available in zip(keys, answers) if available is None]
+        if not missing_keys:
+            return answers
+
+        room_indexes = self.__get_room_indexes({x[0] for x in missing_keys})
+        with self.__lock:
+            for i, (room_id, start_date, end_date, _, _) in enumerate(keys):
+                if answers[i] is None:
+                    answers[i] = not room_indexes[room_id].overlaps(
+                        DateUtils.convert_datetime_to_epoch_microseconds(start_date),
+                        DateUtils.convert_datetime_to_epoch_microseconds(end_date)
+                    )
+                    self.__answers.put(keys[i], answers[i])
+        return answers
+
+    def get_occupancy(self, room_ids: Iterable[int], first_night: int, nights: int) -> dict[int, int]:
+        """
+        Gets the occupied nights of each room as a bitmask, where bit i is set if the room has a SCHEDULED reservation
+        during the night C{first_night + i}. Nights are counted in days since the unix epoch (in UTC), and a reservation
+        occupies every night from the one it starts on, to the one it ends on.
+        Checking if a range of nights is free then becomes a bitmask AND.
+
+        The bitmask of each room is kept in memory, and it's updated as reservations are added to the room
+        :param room_ids: Rooms to get the occupancy for. The ones that aren't in memory yet are loaded with a single
+        query
+        :param first_night: first night of the bitmask
+        :param nights: amount of nights in the bitmask
+        :return: dictionary with the bitmask of each room
+        """
+        room_indexes = self.__get_room_indexes(room_ids)
+        occupancy = {}
+        with self.__lock:
+            for room_id, room_index in room_indexes.items():
+                room_occupancy = self.__occupancy.peek(room_id)
+                # Bitmasks are rebuilt when the index of the room is reloaded, or when the nights move (i.e. a new day)
+                if room_occupancy is None or room_occupancy[:3] != (room_index, first_night, nights):
+                    room_occupancy = (
+                        room_index, first_night, nights,
+                        RoomAvailabilityIndex.__build_occupancy(room_index, first_night, nights)
+                    )
+                    self.__occupancy.put(room_id, room_occupancy)
+                occupancy[room_id] = room_occupancy[3]
+        return occupancy
+
+    def add_reservation(self, room_id: int, reservation_id: int, start_date: datetime, end_date: datetime):
+        """
+        Adds (or moves) a SCHEDULED reservation in the index of the room. Rooms that haven't been loaded yet are left
+        alone, since they'll pick up the reservation when they are
+        :param room_id: Room of the reservation
+        :param reservation_id: id of the reservation
+        :param start_date: start_date of the reservation
+        :param end_date: end_date of the reservation
+        """
+        room_index = self.__rooms.peek(room_id)
+        if room_index is None:
+            self.__bump_version(room_id)
+            return
+
+        start = DateUtils.convert_datetime_to_epoch_microseconds(start_date)
+        end = DateUtils.convert_datetime_to_epoch_microseconds(end_date)
+        with self.__lock:
+            self.__bump_version(room_id)
+            # Moving a reservation can free up nights, so the bitmask of the room is rebuilt in that case
+            if reservation_id in room_index:
+                self.__occupancy.pop(room_id)
+            room_index.add(reservation_id, start, end)
+
+            room_occupancy = self.__occupancy.peek(room_id)
+            if room_occupancy is not None and room_occupancy[0] is room_index:
+                _, first_night, nights, occupied_nights = room_occupancy
+                occupied_nights |= RoomAvailabilityIndex.__get_nights_mask(start, end, first_night, nights)
+                self.__occupancy.put(room_id, (room_index, first_night, nights, occupied_nights))
+
+    def remove_reservation(self, room_id: int, reservation_id: int):
+        """
+        Removes a reservation from the index of the room, if it's there
+        :param room_id: Room of the reservation
+        :param reservation_id: id of the reservation
+        """
+        room_index = self.__rooms.peek(room_id)
+        if room_index is None:
+            self.__bump_version(room_id)
+            return
+
+        with self.__lock:
+            room_index.remove(reservation_id)
+            self.__occupancy.pop(room_id)
+            self.__bump_version(room_id)
+
+    def invalidate_room(self, room_id: int):
+        """
+        Drops the index of a room, so that it's loaded again on its next check
+        :param room_id: Room to drop
+        """
+        with self.__lock:
+            self.__rooms.pop(room_id)
+            self.__occupancy.pop(room_id)
+            self.__bump_version(room_id)
+
+    def clear(self):
+        """
+        Drops the index of every room, and every memoized answer. The epoch is bumped as well, so that the rooms being
+        loaded in the meantime (which may be missing the changes that led to this) aren't kept
+        """
+        with self.__lock:
+            self.__epoch += 1
+            self.__versions.clear()
+            self.__rooms.clear()
+            self.__occupancy.clear()
+            self.__answers.clear()
+
+    def get_stats(self) -> dict:
+        """
+        :return: counters of the LRU cache holding the rooms (see C{LRUCache.get_stats})
+        """
+        return self.__rooms.get_stats()
+
+    def get_answer_stats(self) -> dict:
+        """
+        :return: counters of the memoized answers to the availability checks (see C{LRUCache.get_stats}), along with
+        their C{hit_rate} (the share of checks answered from the memo), to tune the size of the memo
+        """
+        stats = self.__answers.get_stats()
+        checks = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / checks if checks else 0.0
+        return stats
+
+    def __get_room_indexes(self, room_ids: Iterable[int]) -> dict[int, IntervalIndex]:
+        """
+        Gets the indexes of the given rooms. The ones that aren't in memory yet are all loaded with a single query
+        :param room_ids: Rooms to get the indexes for
+        :return: dictionary with the index of each room
+        """
+        room_indexes = {}
+        for room_id in set(room_ids):
+            room_index = self.__rooms.get(room_id)
+            if room_index is not None:
+                room_indexes[room_id] = room_index
+
+        missing_room_ids = set(room_ids) - room_indexes.keys()
+        if missing_room_ids:
+            versions = {x: self.__get_version(x) for x in missing_room_ids}
+            loaded_room_indexes = RoomAvailabilityIndex.__load_rooms(missing_room_ids)
+            with self.__lock:
+                for room_id, room_index in loaded_room_indexes.items():
+                    # Rooms that changed while they were being loaded may be missing the change, so they're only used
+                    # for this check
+                    if self.__get_version(room_id) == versions[room_id]:
+                        self.__rooms.put(room_id, room_index)
+                    room_indexes[room_id] = room_index
+        return room_indexes
+
+    def __get_version(self, room_id: int) -> tuple[int, int]:
+        """
+        :param room_id: Room to get the version for
+        :return: version of the reservations of the room, as the epoch of the index and the version of the room within
+        it
+        """
+        with self.__lock:
+            return self.__epoch, self.__versions.get(room_id, 0)
+
+    def __bump_version(self, room_id: int):
+        """
+        Bumps the version of the reservations of a room after they changed, so that the answers memoized before aren't
+        read again. Callers bump it once the change is in place
+        :param room_id: Room whose reservations changed
+        """
+        with self.__lock:
+            self.__versions[room_id] = next(self.__version_counter)
+
+    @staticmethod
+    def __build_occupancy(room_index: IntervalIndex, first_night: int, nights: int) -> int:
+        """
+        Builds the bitmask of the occupied nights of a room (see C{get_occupancy})
+        :param room_index: index of the reservations of the room
+        :param first_night: first night of the bitmask
+        :param nights: amount of nights in the bitmask
+        :return: bitmask of the occupied nights
+        """
+        occupied_nights = 0
+        for _, start, end in room_index.iter_overlapping(
+                first_night * RoomAvailabilityIndex.__MICROSECONDS_PER_DAY,
+                (first_night + nights) * RoomAvailabilityIndex.__MICROSECONDS_PER_DAY - 1
+        ):
+            occupied_nights |= RoomAvailabilityIndex.__get_nights_mask(start, end, first_night, nights)
+        return occupied_nights
+
+    @staticmethod
+    def __get_nights_mask(start: int, end: int, first_night: int, nights: int) -> int:
+        """
+        Builds the bitmask of the nights occupied by a reservation (see C{get_occupancy})
+        :param start: start of the reservation, in microseconds since the unix epoch
+        :param end: end of the reservation, in microseconds since the unix epoch
+        :param first_night: first night of the bitmask
+        :param nights: amount of nights in the bitmask
+        :return: bitmask of the nights occupied by the reservation
+        """
+        start_night = max(start // RoomAvailabilityIndex.__MICROSECONDS_PER_DAY, first_night)
+        end_night = min(end // RoomAvailabilityIndex.__MICROSECONDS_PER_DAY, first_night + nights - 1)
+        if start_night > end_night:
+            return 0
+        return ((1 << (end_night - start_night + 1)) - 1) << (start_night - first_night)
+
+    @staticmethod
+    def __load_rooms(room_ids: Iterable[int]) -> dict[int, IntervalIndex]:
+        """
+        Builds the indexes for the given rooms from their SCHEDULED reservations in the DB, with a single query
+        :param room_ids: Rooms to load
+        :return: dictionary with the index of the reservations of each room
+        """
+        spans_by_room = {room_id: [] for room_id in room_ids}
+        for room_id, reservation_id, start_date, end_date in ReservationDAO.get_scheduled_reservation_spans(room_ids):
+            spans_by_room[room_id].append((
+                reservation_id,
+                DateUtils.convert_datetime_to_epoch_microseconds(start_date),
+                DateUtils.convert_datetime_to_epoch_microseconds(end_date)
+            ))
+        return {room_id: IntervalIndex(spans) for room_id, spans in spans_by_room.items()}
+
+    """ Max amount of rooms kept in memory """
+    __MAX_ROOMS = 1024
+
+    """ Max amount of answers to availability checks kept in memory """
+    __MAX_ANSWERS = 65536
+
+    """ Amount of seconds after which the index of a room is loaded again, to pick up writes from other processes """
+    __TTL_SECONDS = 60
+
+    """ Amount of microseconds in a day, to turn the bounds of the reservations into nights """
+    __MICROSECONDS_PER_DAY = 24 * 60 * 60 * 1000 * 1000
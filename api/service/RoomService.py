@@ -1,8 +1,17 @@
 import functools
+from datetime import datetime
+from typing import Optional
 
+from api.service.CacheInvalidator import CacheInvalidator
+from api.service.EntityCache import EntityCache
+from api.service.ResponseCache import ResponseCache
+from api.service.RoomAvailabilityIndex import RoomAvailabilityIndex
 from db.ReservationDAO import ReservationDAO
 from db.RoomDAO import RoomDAO
+from db.TombstoneDAO import TombstoneDAO
+from db.entities.Reservation import Reservation
 from db.entities.Room import Room
+from db.entities.Tombstone import Tombstone
 
 
 class RoomService:
@@ -17,24 +26,124 @@ class RoomService:
         """
         return RoomDAO.get_all()
 
+    @staticmethod
+    def get_page(limit: int, after_id: Optional[int] = None, fields: Optional[tuple[str, ...]] = None) -> list[Room]:
+        """
+        Lists a page of the rooms in the db, regardless of status, ordered by id
+        :param limit: max amount of rooms to list
+        :param after_id: if included, only rooms with a greater id are listed (i.e. the last id of the previous page)
+        :param fields: if included, only these fields of the rooms are loaded
+        :return: List of rooms
+        """
+        assert isinstance(limit, int), type(limit)
+        assert limit > 0, limit
+        assert after_id is None or after_id > 0, after_id
+        assert fields is None or isinstance(fields, tuple), type(fields)
+        return RoomDAO.get_page(limit, after_id, fields)
+
+    @staticmethod
+    def get_page_version(after_id: Optional[int] = None) -> tuple:
+        """
+        Fetches the version of the rooms a page can hold, without loading them, to tell if the page changed
+        :param after_id: if included, only rooms with a greater id are considered (i.e. the cursor of the page)
+        :return: tuple that changes whenever one of the rooms is created, updated or deleted
+        """
+        assert after_id is None or after_id > 0, after_id
+        return tuple(RoomDAO.get_page_version(after_id))
+
+    @staticmethod
+    def get_changes(limit: int, after_change: Optional[tuple[int, int]] = None,
+                    after_deletion: Optional[tuple[int, int]] = None) -> tuple[list[Room], list[Tombstone]]:
+        """
+        Lists the rooms that were created, updated or deleted since the last sync of a client (change feed)
+        :param limit: max amount of changed rooms, and of deleted ones, to list
+        :param after_change: if included, only rooms that changed after this (xact_id, id) point are listed (i.e.
+        the ones of the last room of the previous sync)
+        :param after_deletion: if included, only rooms deleted after this (xact_id, id) point are listed (i.e. the
+        ones of the last tombstone of the previous sync)
+        :return: tuple with the list of changed rooms and the list of the tombstones of the deleted ones, in the order
+        they changed
+        """
+        assert isinstance(limit, int), type(limit)
+        assert limit > 0, limit
+        assert after_change is None or isinstance(after_change, tuple), type(after_change)
+        assert after_deletion is None or isinstance(after_deletion, tuple), type(after_deletion)
+        return RoomDAO.get_changes(limit, after_change), TombstoneDAO.get_page(Room, limit, after_deletion)
+
     @staticmethod
     def get_by_id(room_id: int) -> Room:
         """
         Fetches a single room given a matching id
         :param room_id: Id of the room being fetched
-        :return: Room entity if found
+        :return: Room entity if found. It's a read-only snapshot, shared with other requests (see C{EntityCache})
         :raises sqlalchemy.orm.exc.NoResultFound: when no matching room is found
         """
         assert isinstance(room_id, int), type(room_id)
         assert room_id > 0, room_id
-        return RoomDAO.get(room_id)
+        return EntityCache().get(Room, room_id, lambda: RoomDAO.get(room_id))
 
     @staticmethod
-    def create(create_request: dict) -> int:
+    def lock(room_id: int):
+        """
+        Locks a room until the end of the current transaction. Other transactions trying to lock the same room wait
+        until this one is done. Missing rooms are left alone
+        :param room_id: Id of the room being locked
+        """
+        assert isinstance(room_id, int), type(room_id)
+        assert room_id > 0, room_id
+        RoomDAO.lock(room_id)
+
+    @staticmethod
+    def get_many_for_update(room_ids: set[int]) -> list[Room]:
+        """
+        Fetches several rooms, and locks them until the end of the current transaction (see C{lock})
+        :param room_ids: Ids of the rooms being fetched
+        :return: List of the matching rooms. Missing rooms are left out
+        """
+        assert isinstance(room_ids, set), type(room_ids)
+        return RoomDAO.get_many_for_update(room_ids)
+
+    @staticmethod
+    def get_available(start_date: datetime, end_date: datetime, guests: Optional[int], limit: int,
+                      after_id: Optional[int] = None, fields: Optional[tuple[str, ...]] = None) -> list[Room]:
+        """
+        Lists the active rooms that can hold the amount of guests and are available between start_date and end_date
+        :param start_date: start of the desired date range
+        :param end_date: end of the desired date range
+        :param guests: if included, only rooms that can hold this amount of guests are listed
+        :param limit: max amount of rooms to list
+        :param after_id: if included, only rooms with a greater id are listed (i.e. the last id of the previous page)
+        :param fields: if included, only these fields of the rooms are loaded
+        :return: List of available rooms, ordered by id
+        """
+        assert isinstance(start_date, datetime), type(start_date)
+        assert isinstance(end_date, datetime), type(end_date)
+        assert end_date > start_date
+        assert isinstance(limit, int), type(limit)
+        assert limit > 0, limit
+        assert fields is None or isinstance(fields, tuple), type(fields)
+        return RoomDAO.get_available(start_date, end_date, guests, limit, after_id, fields)
+
+    @staticmethod
+    def get_missing_ids(room_ids: set[int]) -> set[int]:
+        """
+        Checks which of the given room ids don't belong to an existing room. Cached rooms are known to exist (see
+        C{EntityCache}), so the rest are looked for with a single query, if there are any
+        :param room_ids: Ids of the rooms to look for
+        :return: set with the ids that don't match any room
+        """
+        assert isinstance(room_ids, set), type(room_ids)
+        uncached_room_ids = room_ids - EntityCache().get_cached_ids(Room, room_ids)
+        if not uncached_room_ids:
+            return set()
+        return uncached_room_ids - RoomDAO.get_existing_ids(uncached_room_ids)
+
+    @staticmethod
+    def create(create_request: dict) -> Room:
         """
         Creates a room based on the specified create_request dict
         :param create_request: dictionary specifying the values for the room properties
-        :return id of the newly created resource
+        :return the newly created room, along with the values generated by the DB (i.e. id, created_at)
         """
         assert isinstance(create_request, dict), type(create_request)
         assert len(create_request.keys()) > 0
@@ -47,14 +156,19 @@ class RoomService:
         RoomDAO.begin()
         RoomDAO.save(room)
         RoomDAO.commit()
-        return room.id
+        # The id of the room may have been looked up before it was taken
+        EntityCache().invalidate(Room, room.id)
+        ResponseCache().invalidate(Room)
+        CacheInvalidator().room_changed(room.id)
+        return room
 
     @staticmethod
-    def update(room_id: int, update_request: dict):
+    def update(room_id: int, update_request: dict) -> Room:
         """
         Updates a room based on the specified update_request dict
         :param room_id: Room id we want to update
         :param update_request: Fields we want to replace of the existing room
+        :return the updated room, along with the values generated by the DB (i.e. updated_at)
         :raises sqlalchemy.orm.exc.NoResultFound: when no matching room is found for the update
         """
         assert isinstance(room_id, int), type(room_id)
@@ -70,6 +184,10 @@ class RoomService:
         RoomDAO.begin()
         RoomDAO.save(room)
         RoomDAO.commit()
+        EntityCache().invalidate(Room, room_id)
+        ResponseCache().invalidate(Room)
+        CacheInvalidator().room_changed(room_id)
+        return room
 
     @staticmethod
     def delete(room_id: int):
@@ -90,4 +208,12 @@ class RoomService:
             ReservationDAO.delete(reservation)
         RoomDAO.flush()
         RoomDAO.delete(room)
+        # Leave tombstones behind for the change feed
+        TombstoneDAO.save_many(Reservation, [x.id for x in linked_reservations])
+        TombstoneDAO.save_many(Room, [room_id])
         RoomDAO.commit()
+
+        EntityCache().invalidate(Room, room_id)
+        ResponseCache().invalidate(Room)
+        RoomAvailabilityIndex().invalidate_room(room_id)
+        CacheInvalidator().room_changed(room_id, reservations_changed=True)
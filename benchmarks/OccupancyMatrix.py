@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class OccupancyMatrix:
+    """
+    Builds and queries boolean rooms x nights matrices, where cell (i, j) is C{True} if the room in position i is
+    occupied during night j of the matrix. It's meant for bulk questions (i.e. which rooms are free on each night of
+    next week), which are answered with array operations instead of checking each room/reservation pair in Python.
+
+    Nights are positions within the matrix. A reservation occupies every night from its start night to its end night,
+    both included, and the parts of it outside the matrix are ignored.
+
+    The API answers its availability checks and calendars from C{RoomAvailabilityIndex} instead, so this only backs the
+    benchmarks, where NumPy (a development dependency) is installed.
+    """
+    @staticmethod
+    def build(rooms: int, nights: int, room_indexes: np.ndarray, start_nights: np.ndarray,
+              end_nights: np.ndarray) -> np.ndarray:
+        """
+        Builds the occupancy matrix from the SCHEDULED reservations of the rooms.
+        Each reservation adds 1 on its start night and subtracts 1 after its end night, so a cumulative sum along the
+        nights marks every night in between, no matter how many reservations there are
+        :param rooms: amount of rooms (rows) in the matrix
+        :param nights: amount of nights (columns) in the matrix
+        :param room_indexes: position of the room of each reservation
+        :param start_nights: start night of each reservation
+        :param end_nights: end night of each reservation
+        :return: boolean matrix of shape (rooms, nights)
+        """
+        assert rooms >= 0 and nights >= 0, (rooms, nights)
+        assert len(room_indexes) == len(start_nights) == len(end_nights)
+
+        room_indexes = np.asarray(room_indexes, dtype=np.int64)
+        start_nights = np.clip(np.asarray(start_nights, dtype=np.int64), 0, None)
+        end_nights = np.clip(np.asarray(end_nights, dtype=np.int64), None, nights - 1)
+
+        # Reservations that end before the first night or start after the last one don't occupy any night
+        in_range = start_nights <= end_nights
+        room_indexes = room_indexes[in_range]
+
+        # The extra column receives the -1 of the reservations that end on the last night
+        row_size = nights + 1
+        changes = (np.bincount(room_indexes * row_size + start_nights[in_range], minlength=rooms * row_size)
+                   - np.bincount(room_indexes * row_size + end_nights[in_range] + 1, minlength=rooms * row_size))
+        return np.cumsum(changes.reshape(rooms, row_size), axis=1)[:, :nights] > 0
+
+    @staticmethod
+    def get_free_rooms(occupancy: np.ndarray, start_night: int, end_night: int) -> np.ndarray:
+        """
+        Checks which rooms are free for every night of a range
+        :param occupancy: occupancy matrix (see C{build})
+        :param start_night: first night of the range
+        :param end_night: last night of the range
+        :return: boolean array with an item per room, C{True} if the room is free for the whole range
+        """
+        assert 0 <= start_night <= end_night < occupancy.shape[1], (start_night, end_night)
+        return ~occupancy[:, start_night:end_night + 1].any(axis=1)
+
+    @staticmethod
+    def are_free(occupancy: np.ndarray, room_indexes: np.ndarray, start_nights: np.ndarray,
+                 end_nights: np.ndarray) -> np.ndarray:
+        """
+        Checks several rooms/night ranges at once. Occupied nights are counted with a cumulative sum along the nights,
+        so each check takes the same time no matter how long its range is
+        :param occupancy: occupancy matrix (see C{build})
+        :param room_indexes: position of the room of each check
+        :param start_nights: first night of each check
+        :param end_nights: last night of each check
+        :return: boolean array with an item per check, C{True} if the room is free for the whole range
+        """
+        occupied_nights = np.zeros((occupancy.shape[0], occupancy.shape[1] + 1), dtype=np.int32)
+        np.cumsum(occupancy, axis=1, out=occupied_nights[:, 1:])
+
+        room_indexes = np.asarray(room_indexes, dtype=np.int64)
+        return (occupied_nights[room_indexes, np.asarray(end_nights) + 1]
+                - occupied_nights[room_indexes, np.asarray(start_nights)]) == 0
@@ -0,0 +1,114 @@
+"""
+Benchmark of the booking throughput under contention: several threads, each with its own client (and therefore its own
+DB session), try to book random, mostly overlapping, date ranges for a handful of rooms at the same time. Bookings for
+the same room wait on its row lock, while the ones for different rooms go on in parallel.
+
+Unlike the rest of the benchmarks, it needs the test DB (see /test/config/conf.yaml), whose tables it creates and drops.
+
+Run it from the root of the repository with: python -m benchmarks.benchmark_concurrent_bookings
+"""
+import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from alembic.command import downgrade, upgrade
+from alembic.config import Config
+from flask import Flask
+from pytz import utc
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from config.CreateApp import create_app
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+from test.config import MOCK_DATABASE_URL
+
+""" Amount of threads booking rooms at the same time """
+WORKERS = 8
+
+""" Amount of rooms the workers compete for """
+ROOMS = 4
+
+""" Amount of bookings each worker attempts """
+ATTEMPTS_PER_WORKER = 100
+
+
+def create_rooms_and_guest() -> tuple[list[int], int]:
+    """
+    Creates the rooms that the workers compete for, and a guest to book them
+    :return: tuple with the ids of the rooms, and the id of the guest
+    """
+    rooms = []
+    for i in range(ROOMS):
+        room = Room()
+        room.init_fields(f"Room {i}", 2)
+        rooms.append(room)
+    guest = Guest()
+    guest.init_fields("123", "Jorge", "Ocampo")
+
+    AbstractDAO.begin()
+    for room in rooms:
+        RoomDAO.save(room)
+    GuestDAO.save(guest)
+    AbstractDAO.commit()
+    return [x.id for x in rooms], guest.id
+
+
+def book(app: Flask, worker: int, room_ids: list[int], guest_id: int) -> list[int]:
+    """
+    Attempts the bookings of a worker
+    :param app: app to book the rooms through
+    :param worker: number of the worker, which seeds its random date ranges
+    :param room_ids: rooms to book
+    :param guest_id: guest of the bookings
+    :return: status code of each attempt
+    """
+    client = app.test_client()
+    rng = random.Random(worker)
+    base_date = datetime.now(tz=utc).replace(minute=0, second=0, microsecond=0)
+    status_codes = []
+    for _ in range(ATTEMPTS_PER_WORKER):
+        start_date = base_date + timedelta(hours=rng.randint(24, 24 * 10))
+        response = client.post(Routes.RESERVATIONS.value, json={
+            "room_id": rng.choice(room_ids),
+            "guest_id": guest_id,
+            "start_date": start_date.isoformat(),
+            "end_date": (start_date + timedelta(hours=rng.randint(6, 48))).isoformat(),
+            "amount_of_guests": 1
+        })
+        status_codes.append(response.status_code)
+    return status_codes
+
+
+def main():
+    os.environ["DATABASE_URL"] = MOCK_DATABASE_URL
+    app = create_app(True)
+    alembic_config = Config("alembic.ini")
+    upgrade(alembic_config, "head")
+    try:
+        with app.app_context():
+            room_ids, guest_id = create_rooms_and_guest()
+            AbstractDAO.get_connection().remove()
+
+        started_at = time.perf_counter()
+        with ThreadPoolExecutor(WORKERS) as executor:
+            status_codes = [x for worker_status_codes in
+                            executor.map(lambda worker: book(app, worker, room_ids, guest_id), range(WORKERS))
+                            for x in worker_status_codes]
+        elapsed_seconds = time.perf_counter() - started_at
+    finally:
+        downgrade(alembic_config, "base")
+
+    print(f"{len(status_codes)} booking attempts for {ROOMS} rooms with {WORKERS} workers")
+    print(f"Throughput: {len(status_codes) / elapsed_seconds:8.0f} attempts/s")
+    print(f"Booked:     {status_codes.count(HttpStatuses.CREATED.value):8d}")
+    print(f"Conflicts:  {status_codes.count(HttpStatuses.BAD_REQUEST.value):8d}")
+
+
+if __name__ == "__main__":
+    main()
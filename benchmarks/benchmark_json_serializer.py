@@ -0,0 +1,78 @@
+"""
+Benchmark of C{JSONSerializer} against C{flask.jsonify} with C{CustomJSONEncoder}, which the responses used to go
+through. Serializes a page of 10k reservations, like the ones the collection endpoints and the NDJSON stream send.
+
+Run it from the root of the repository with: python -m benchmarks.benchmark_json_serializer
+"""
+import time
+from datetime import datetime, timedelta
+from typing import Callable
+
+from flask import Flask, jsonify
+from pytz import utc
+
+from api.entities.ReservationStatus import ReservationStatus
+from config.JSONEncoder import CustomJSONEncoder
+from config.JSONSerializer import JSONSerializer
+from db.entities.Reservation import Reservation
+
+""" Amount of reservations to serialize """
+RESERVATIONS = 10_000
+
+""" Amount of times each serializer runs, keeping the fastest one """
+RUNS = 5
+
+
+def build_reservations() -> list[Reservation]:
+    """
+    Builds the reservations in memory, with all of their fields set like the ones loaded from the DB
+    :return: list of reservations
+    """
+    created_at = datetime(2021, 9, 1, 10, 30, 15, 123456, tzinfo=utc)
+    reservations = []
+    for i in range(RESERVATIONS):
+        reservation = Reservation()
+        reservation.init_fields(i % 100 + 1, i % 1000 + 1, created_at + timedelta(days=i),
+                                created_at + timedelta(days=i + 2), 2, ReservationStatus.SCHEDULED)
+        reservation.id = i + 1
+        reservation.created_at = created_at
+        reservation.updated_at = created_at + timedelta(hours=i)
+        reservations.append(reservation)
+    return reservations
+
+
+def time_serializer(serialize: Callable[[], bytes]) -> tuple[float, bytes]:
+    """
+    :param serialize: function that serializes the reservations
+    :return: tuple with the seconds of the fastest run, and the JSON it returned
+    """
+    best_seconds = float("inf")
+    for _ in range(RUNS):
+        started_at = time.perf_counter()
+        output = serialize()
+        best_seconds = min(best_seconds, time.perf_counter() - started_at)
+    return best_seconds, output
+
+
+def main():
+    app = Flask(__name__)
+    app.json_encoder = CustomJSONEncoder
+    reservations = build_reservations()
+
+    with app.app_context():
+        jsonify_seconds, jsonify_output = time_serializer(lambda: jsonify(reservations).get_data())
+        stdlib_seconds, stdlib_output = time_serializer(lambda: JSONSerializer.dumps_with_stdlib(reservations))
+        serializer_seconds, serializer_output = time_serializer(lambda: JSONSerializer.jsonify(reservations).get_data())
+
+    assert stdlib_output + b"\n" == jsonify_output
+    assert serializer_output == jsonify_output
+    print(f"{RESERVATIONS} reservations, {len(jsonify_output) / 1024:.0f} KiB of JSON")
+    print(f"jsonify + CustomJSONEncoder: {jsonify_seconds * 1000:8.1f} ms")
+    print(f"JSONSerializer (stdlib):     {stdlib_seconds * 1000:8.1f} ms "
+          f"({jsonify_seconds / stdlib_seconds:.1f}x faster)")
+    print(f"JSONSerializer:              {serializer_seconds * 1000:8.1f} ms "
+          f"({jsonify_seconds / serializer_seconds:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
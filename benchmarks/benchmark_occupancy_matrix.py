@@ -0,0 +1,105 @@
+"""
+Benchmark of the occupancy matrix against checking each room/night pair with C{DateUtils.check_if_date_ranges_overlap}.
+Answers "which rooms are free on each night of next week" for 1k rooms and 100k SCHEDULED reservations.
+
+Run it from the root of the repository with: python -m benchmarks.benchmark_occupancy_matrix
+"""
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+import numpy as np
+from pytz import utc
+
+from benchmarks.OccupancyMatrix import OccupancyMatrix
+from utils.DateUtils import DateUtils
+
+""" Amount of rooms in the hotel """
+ROOMS = 1_000
+
+""" Amount of SCHEDULED reservations, spread over the rooms """
+RESERVATIONS = 100_000
+
+""" Amount of nights to check """
+NIGHTS = 7
+
+""" Days over which the reservations are spread, so that they only rarely overlap """
+HORIZON_DAYS = 365 * 3
+
+
+def build_reservations(rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    :param rng: random generator, so that both approaches get the same reservations
+    :return: arrays with the room index, start night and end night of each reservation
+    """
+    room_indexes = rng.integers(0, ROOMS, RESERVATIONS)
+    start_nights = rng.integers(-HORIZON_DAYS // 2, HORIZON_DAYS // 2, RESERVATIONS)
+    end_nights = start_nights + rng.integers(0, 3, RESERVATIONS)
+    return room_indexes, start_nights, end_nights
+
+
+def group_date_ranges_by_room(room_indexes: np.ndarray, start_nights: np.ndarray, end_nights: np.ndarray,
+                              first_night: datetime) -> dict[int, list[tuple[datetime, datetime]]]:
+    """
+    Turns the reservations into the date ranges the loop works with, from noon of their start night to noon of their
+    end night. This isn't timed, since it stands for loading the reservations
+    :return: dictionary with the date ranges of the reservations of each room
+    """
+    date_ranges_by_room = defaultdict(list)
+    for room_index, start_night, end_night in zip(room_indexes.tolist(), start_nights.tolist(), end_nights.tolist()):
+        date_ranges_by_room[room_index].append((
+            first_night + timedelta(days=start_night, hours=12),
+            first_night + timedelta(days=end_night, hours=12, seconds=1)
+        ))
+    return date_ranges_by_room
+
+
+def check_with_a_loop(date_ranges_by_room: dict[int, list[tuple[datetime, datetime]]],
+                      first_night: datetime) -> list[list[bool]]:
+    """
+    Checks every room/night pair against the reservations of the room, one date range at a time
+    :return: rooms x nights list, C{True} if the room is free that night
+    """
+    free_nights = []
+    for room_index in range(ROOMS):
+        free_nights.append([])
+        for night in range(NIGHTS):
+            night_start = first_night + timedelta(days=night)
+            night_end = night_start + timedelta(days=1) - timedelta(microseconds=1)
+            free_nights[-1].append(not any(
+                DateUtils.check_if_date_ranges_overlap(night_start, night_end, start_date, end_date)
+                for start_date, end_date in date_ranges_by_room[room_index]
+            ))
+    return free_nights
+
+
+def check_with_the_matrix(room_indexes: np.ndarray, start_nights: np.ndarray, end_nights: np.ndarray) -> np.ndarray:
+    """
+    Builds the occupancy matrix for the nights to check
+    :return: rooms x nights matrix, C{True} if the room is free that night
+    """
+    return ~OccupancyMatrix.build(ROOMS, NIGHTS, room_indexes, start_nights, end_nights)
+
+
+def main():
+    reservations = build_reservations(np.random.default_rng(42))
+    first_night = datetime.now(tz=utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+    date_ranges_by_room = group_date_ranges_by_room(*reservations, first_night)
+
+    started_at = time.perf_counter()
+    loop_result = check_with_a_loop(date_ranges_by_room, first_night)
+    loop_seconds = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    matrix_result = check_with_the_matrix(*reservations)
+    matrix_seconds = time.perf_counter() - started_at
+
+    assert matrix_result.tolist() == loop_result
+    print(f"{ROOMS} rooms, {RESERVATIONS} reservations, {NIGHTS} nights")
+    print(f"Per-pair loop:    {loop_seconds * 1000:10.1f} ms")
+    print(f"Occupancy matrix: {matrix_seconds * 1000:10.1f} ms ({loop_seconds / matrix_seconds:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+import os
+import zlib
+from typing import Callable, Iterable, Iterator
+
+from flask import Flask, Response, current_app, request
+
+from api.entities.HttpStatuses import HttpStatuses
+
+try:
+    import brotli
+except ImportError:
+    # brotli is optional: without it, clients that accept it get the next best encoding
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    # zstandard is optional: without it, clients that accept it get the next best encoding
+    zstandard = None
+
+
+class Compression:
+    """
+    Compresses the responses with the best encoding the client accepts (C{Accept-Encoding} header): gzip is always
+    available, and brotli and zstd are used when their packages are installed.
+
+    Responses smaller than the C{COMPRESSION_MIN_SIZE} setting (in bytes) are sent as they are, since compressing them
+    barely saves anything. Streamed responses (see C{Streaming}) are compressed chunk by chunk as they're sent, instead
+    of being buffered. Files that never change (i.e. the landing page and the swagger config) are compressed once, with
+    the highest level of each encoding, when the app is created (see C{precompress}), and responses sent over and over
+    with the same body (i.e. cached ones) are compressed once per encoding (see C{reuse_compressed_bodies})
+    """
+    @staticmethod
+    def init_app(app: Flask):
+        """
+        Sets up the compression of the responses of an app
+        :param app: app whose responses to compress
+        """
+        app.config.setdefault(Compression.MIN_SIZE_CONFIG,
+                              int(os.environ.get(Compression.MIN_SIZE_CONFIG, Compression.__DEFAULT_MIN_SIZE)))
+        app.extensions[Compression.__EXTENSION] = {}
+        app.after_request(Compression.compress_response)
+
+    @staticmethod
+    def precompress(app: Flask, path: str, data: bytes):
+        """
+        Compresses the body of a route in every available encoding, so that its responses don't have to be compressed
+        :param app: app that serves the route (see C{init_app})
+        :param path: path of the route
+        :param data: uncompressed body of the responses of the route
+        """
+        bodies = {x: Compression.__compress(data, x, Compression.__STATIC_LEVELS[x])
+                  for x in Compression.get_encodings()}
+        bodies[Compression.__IDENTITY] = data
+        app.extensions[Compression.__EXTENSION][path] = bodies
+
+    @staticmethod
+    def reuse_compressed_bodies(response: Response, compressed_bodies: dict[str, bytes]):
+        """
+        Makes the compression of a response reuse the copies of its body that were compressed for earlier responses
+        with the same body, and keep the copy compressed for it along with them
+        :param response: response that isn't compressed yet
+        :param compressed_bodies: copies of the body of the response compressed so far, by encoding
+        """
+        setattr(response, Compression.__COMPRESSED_BODIES, compressed_bodies)
+
+    @staticmethod
+    def get_encodings() -> tuple[str, ...]:
+        """
+        :return: tuple with the encodings that are available, from the most preferred to the least
+        """
+        return tuple(x for x, module in ((Compression.BROTLI, brotli), (Compression.ZSTD, zstandard),
+                                         (Compression.GZIP, zlib)) if module is not None)
+
+    @staticmethod
+    def compress_response(response: Response) -> Response:
+        """
+        Compresses the response of the current request if the client accepts an available encoding
+        :param response: response of the current request
+        :return: the same response, compressed if possible
+        """
+        precompressed = current_app.extensions[Compression.__EXTENSION].get(request.path)
+        if precompressed is not None and response.status_code == HttpStatuses.OK.value and \
+                response.content_length == len(precompressed[Compression.__IDENTITY]):
+            response.vary.add(Compression.__ACCEPT_ENCODING)
+            encoding = request.accept_encodings.best_match(Compression.get_encodings())
+            if encoding is None:
+                return response
+            # Static files are sent straight from disk, so the file is closed before sending its compressed copy
+            if hasattr(response.response, "close"):
+                response.response.close()
+            response.direct_passthrough = False
+            response.set_data(precompressed[encoding])
+        elif response.status_code == HttpStatuses.NOT_MODIFIED.value:
+            # The body would have been compressed as well, so caches have to keep telling the representations apart
+            response.vary.add(Compression.__ACCEPT_ENCODING)
+            return response
+        elif not Compression.__is_compressible(response):
+            return response
+        else:
+            response.vary.add(Compression.__ACCEPT_ENCODING)
+            encoding = request.accept_encodings.best_match(Compression.get_encodings())
+            if encoding is None:
+                return response
+            if response.is_streamed:
+                response.response = Compression.__compress_chunks(response.response, encoding)
+                # The size of the body isn't known until the whole response is sent
+                response.headers.pop("Content-Length", None)
+            elif response.direct_passthrough or \
+                    response.calculate_content_length() < current_app.config[Compression.MIN_SIZE_CONFIG]:
+                return response
+            else:
+                compressed_bodies = getattr(response, Compression.__COMPRESSED_BODIES, {})
+                compressed_body = compressed_bodies.get(encoding)
+                if compressed_body is None:
+                    compressed_body = Compression.__compress(response.get_data(), encoding,
+                                                             Compression.__DYNAMIC_LEVELS[encoding])
+                    compressed_bodies[encoding] = compressed_body
+                response.set_data(compressed_body)
+
+        response.content_encoding = encoding
+        # The compressed body isn't byte-for-byte the same as the uncompressed one, but it's semantically equivalent
+        etag, is_weak = response.get_etag()
+        if etag is not None and not is_weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    @staticmethod
+    def __is_compressible(response: Response) -> bool:
+        """
+        :param response: response of the current request
+        :return: C{True} if the response has a body that is worth compressing and isn't compressed yet, C{False}
+        otherwise
+        """
+        if response.status_code < HttpStatuses.OK.value or response.status_code in Compression.__EMPTY_STATUSES or \
+                response.content_encoding is not None:
+            return False
+        mimetype = response.mimetype or ""
+        return mimetype.startswith("text/") or mimetype in Compression.__COMPRESSIBLE_MIMETYPES
+
+    @staticmethod
+    def __compress_chunks(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+        """
+        Compresses the chunks of a streamed response as they're generated. The compressor buffers them until it has
+        enough data to emit a compressed block, so the client still gets the body in pieces
+        :param chunks: chunks of the uncompressed body
+        :param encoding: encoding to compress them with
+        :return: generator of the chunks of the compressed body
+        """
+        compress, flush = Compression.__make_compressor(encoding, Compression.__DYNAMIC_LEVELS[encoding])
+        try:
+            for chunk in chunks:
+                compressed_chunk = compress(chunk.encode() if isinstance(chunk, str) else chunk)
+                if compressed_chunk:
+                    yield compressed_chunk
+            yield flush()
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+
+    @staticmethod
+    def __compress(data: bytes, encoding: str, level: int) -> bytes:
+        """
+        :param data: bytes to compress
+        :param encoding: encoding to compress them with
+        :param level: compression level (or quality, for brotli)
+        :return: compressed bytes
+        """
+        compress, flush = Compression.__make_compressor(encoding, level)
+        return compress(data) + flush()
+
+    @staticmethod
+    def __make_compressor(encoding: str, level: int) -> tuple[Callable[[bytes], bytes], Callable[[], bytes]]:
+        """
+        Builds an incremental compressor
+        :param encoding: encoding to compress with
+        :param level: compression level (or quality, for brotli)
+        :return: tuple with a function that compresses a chunk of data, and a function that returns the rest of the
+        compressed data once every chunk has been compressed
+        """
+        if encoding == Compression.BROTLI:
+            compressor = brotli.Compressor(quality=level)
+            return compressor.process, compressor.finish
+        if encoding == Compression.ZSTD:
+            compressor = zstandard.ZstdCompressor(level=level).compressobj()
+            return compressor.compress, compressor.flush
+        compressor = zlib.compressobj(level, zlib.DEFLATED, Compression.__GZIP_WBITS)
+        return compressor.compress, compressor.flush
+
+    """ Setting (of the app, or environment variable) with the size in bytes below which responses aren't compressed """
+    MIN_SIZE_CONFIG = "COMPRESSION_MIN_SIZE"
+
+    """ Brotli content coding """
+    BROTLI = "br"
+
+    """ Zstandard content coding """
+    ZSTD = "zstd"
+
+    """ Gzip content coding """
+    GZIP = "gzip"
+
+    """ Default size in bytes below which responses aren't compressed """
+    __DEFAULT_MIN_SIZE = 1024
+
+    """ Compression level of each encoding for the responses, which favours speed """
+    __DYNAMIC_LEVELS = {BROTLI: 4, ZSTD: 3, GZIP: 6}
+
+    """ Compression level of each encoding for the files compressed at startup, which favours size """
+    __STATIC_LEVELS = {BROTLI: 11, ZSTD: 19, GZIP: 9}
+
+    """ Window bits that make zlib write a gzip header and trailer """
+    __GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+    """ Key of the uncompressed body of the routes compressed at startup """
+    __IDENTITY = "identity"
+
+    """ Attribute of the responses with the copies of their body compressed so far (see C{reuse_compressed_bodies}) """
+    __COMPRESSED_BODIES = "compressed_bodies"
+
+    """ Key of the routes compressed at startup in the extensions of the app """
+    __EXTENSION = "compression"
+
+    """ Header with the encodings the client accepts, which the responses vary by """
+    __ACCEPT_ENCODING = "Accept-Encoding"
+
+    """ Status codes of the responses that never have a body """
+    __EMPTY_STATUSES = frozenset({HttpStatuses.NO_CONTENT.value, HttpStatuses.NOT_MODIFIED.value})
+
+    """ Mimetypes of the responses worth compressing, besides text """
+    __COMPRESSIBLE_MIMETYPES = frozenset({"application/json", "application/x-ndjson", "application/javascript",
+                                          "application/yaml", "application/x-yaml", "image/svg+xml"})
@@ -7,10 +7,13 @@ from flask_restful import Api
 from flask_sqlalchemy_session import flask_scoped_session
 
 from config import DATABASE_URL
+from config.Compression import Compression
 from config.JSONEncoder import CustomJSONEncoder
 from config.SwaggerConfig import SWAGGERUI_BLUEPRINT
 from db.ConnectionManager import ConnectionManager
+from db.PostgresInvalidationBus import PostgresInvalidationBus
 from utils.HerokuUtils import HerokuUtils
+from utils.LocalInvalidationBus import LocalInvalidationBus
 
 
 def create_app(is_testing_context: bool = False):
@@ -37,25 +40,56 @@ def create_app(is_testing_context: bool = False):
     connection_manager = ConnectionManager(db_url)
     session = flask_scoped_session(connection_manager.get_session_factory(), app)
 
-    @app.route("/")
+    # Keep the caches of every worker coherent, by letting them know about the writes made by the rest. Tests run in a
+    # single process, so they get a stand-in of the bus
+    from api.service.CacheInvalidator import CacheInvalidator
+    if is_testing_context:
+        CacheInvalidator().set_bus(LocalInvalidationBus())
+    else:
+        CacheInvalidator().set_bus(PostgresInvalidationBus(connection_manager.get_engine()))
+
+    @app.route(Routes.INDEX.value)
     def index():
         return render_template("index.html")
 
+    # Compress the responses, and the files that never change once and for all
+    Compression.init_app(app)
+    with app.app_context():
+        Compression.precompress(app, Routes.INDEX.value, render_template("index.html").encode())
+    with open(os.path.join(app.static_folder, os.path.basename(Routes.SWAGGER_CONFIG.value)), "rb") as f:
+        Compression.precompress(app, Routes.SWAGGER_CONFIG.value, f.read())
+
     # Register routes for the API, binding a controller to each route
+    from api.controllers.custom.AvailableRoomsController import AvailableRoomsController
+    from api.controllers.custom.RoomAvailabilityBatchController import RoomAvailabilityBatchController
     from api.controllers.custom.RoomAvailabilityController import RoomAvailabilityController
     from api.controllers.guest.GuestByIdController import GuestByIdController
+    from api.controllers.guest.GuestChangesController import GuestChangesController
     from api.controllers.guest.GuestController import GuestController
+    from api.controllers.reservation.ReservationBulkController import ReservationBulkController
     from api.controllers.reservation.ReservationByIdController import ReservationByIdController
+    from api.controllers.reservation.ReservationChangesController import ReservationChangesController
     from api.controllers.reservation.ReservationController import ReservationController
     from api.controllers.room.RoomByIdController import RoomByIdController
+    from api.controllers.room.RoomCalendarByIdController import RoomCalendarByIdController
+    from api.controllers.room.RoomCalendarController import RoomCalendarController
+    from api.controllers.room.RoomChangesController import RoomChangesController
     from api.controllers.room.RoomController import RoomController
 
     api.add_resource(GuestController, Routes.GUESTS.value)
     api.add_resource(GuestByIdController, Routes.GUESTS_BY_ID.value)
+    api.add_resource(GuestChangesController, Routes.GUESTS_CHANGES.value)
     api.add_resource(RoomController, Routes.ROOMS.value)
     api.add_resource(RoomByIdController, Routes.ROOMS_BY_ID.value)
+    api.add_resource(RoomChangesController, Routes.ROOMS_CHANGES.value)
+    api.add_resource(RoomCalendarController, Routes.ROOMS_CALENDAR.value)
+    api.add_resource(RoomCalendarByIdController, Routes.ROOMS_CALENDAR_BY_ID.value)
+    api.add_resource(AvailableRoomsController, Routes.ROOMS_AVAILABLE.value)
     api.add_resource(ReservationController, Routes.RESERVATIONS.value)
+    api.add_resource(ReservationBulkController, Routes.RESERVATIONS_BULK.value)
     api.add_resource(ReservationByIdController, Routes.RESERVATIONS_BY_ID.value)
+    api.add_resource(ReservationChangesController, Routes.RESERVATIONS_CHANGES.value)
     api.add_resource(RoomAvailabilityController, Routes.ROOM_AVAILABILITY.value)
+    api.add_resource(RoomAvailabilityBatchController, Routes.ROOM_AVAILABILITY_BATCH.value)
 
     return app
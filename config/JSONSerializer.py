@@ -0,0 +1,133 @@
+import dataclasses
+import json
+from operator import attrgetter
+from typing import Any, Callable, Optional
+
+from flask import Response, current_app
+from sqlalchemy import inspect
+from sqlalchemy.orm import InstrumentedAttribute
+
+from config.JSONEncoder import CustomJSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    # orjson is optional: without it, responses are encoded by the standard library, which is slower
+    orjson = None
+
+
+class JSONSerializer:
+    """
+    Serializes the responses straight to JSON bytes, in the same format as C{flask.jsonify} with C{CustomJSONEncoder}
+    (sorted keys, no whitespace, ISO 8601 datetimes and enums by value).
+
+    Entities (dataclasses) are turned into dictionaries by a serializer compiled once per class, instead of
+    C{dataclasses.asdict} deep copying each one of their fields. Then, orjson encodes the datetimes and enums natively,
+    instead of the encoder checking the type of each value in Python. The only difference with C{flask.jsonify} is that
+    orjson doesn't escape non-ASCII characters (the JSON is UTF-8 either way)
+    """
+    @staticmethod
+    def dumps(o: Any) -> bytes:
+        """
+        Serializes an object with the fastest encoder available
+        :param o: object to serialize (i.e. an entity, or a list of them)
+        :return: JSON bytes
+        """
+        if orjson is None:
+            return JSONSerializer.dumps_with_stdlib(o)
+        # Dataclasses are passed through to __to_serializable, so that they're serialized like C{jsonify} does
+        return orjson.dumps(o, default=JSONSerializer.__to_serializable,
+                            option=orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    @staticmethod
+    def dumps_with_stdlib(o: Any) -> bytes:
+        """
+        Serializes an object with the encoder of the standard library. Used when orjson isn't installed
+        :param o: object to serialize (i.e. an entity, or a list of them)
+        :return: JSON bytes
+        """
+        return json.dumps(o, default=JSONSerializer.__to_serializable, sort_keys=True, separators=(",", ":")).encode()
+
+    @staticmethod
+    def jsonify(o: Any) -> Response:
+        """
+        Drop-in replacement of C{flask.jsonify} for a single object
+        :param o: object to serialize (i.e. an entity, or a list of them)
+        :return: response with the JSON of the object
+        """
+        return current_app.response_class(JSONSerializer.dumps(o) + b"\n",
+                                          mimetype=current_app.config["JSONIFY_MIMETYPE"])
+
+    @staticmethod
+    def __to_serializable(o: Any) -> Any:
+        """
+        Turns the objects that the encoders don't handle into ones they do
+        :param o: object to turn into a serializable one
+        :return: dictionary with the fields of dataclasses, or what C{CustomJSONEncoder} turns other objects into
+        """
+        if dataclasses.is_dataclass(o):
+            serializer = JSONSerializer.__SERIALIZERS.get(o.__class__)
+            if serializer is None:
+                serializer = JSONSerializer.__SERIALIZERS[o.__class__] = JSONSerializer.__compile(o.__class__)
+            return serializer(o)
+        return JSONSerializer.__ENCODER.default(o)
+
+    @staticmethod
+    def __compile(dataclass: type) -> Callable[[Any], dict]:
+        """
+        Builds the serializer of a dataclass
+        :param dataclass: class of the objects to serialize
+        :return: function that turns an object of the class into a dictionary with its fields
+        """
+        names = tuple(x.name for x in dataclasses.fields(dataclass))
+        # attrgetter returns a single value (instead of a tuple) for a single field
+        get_values = attrgetter(*names) if len(names) > 1 else lambda o: (getattr(o, names[0]),)
+
+        def serialize(o: Any) -> dict:
+            return dict(zip(names, get_values(o)))
+
+        column_keys = JSONSerializer.__get_column_keys(dataclass, names)
+        if column_keys is None:
+            return serialize
+
+        fields = tuple(zip(names, column_keys))
+
+        def serialize_entity(o: Any) -> dict:
+            values = o.__dict__
+            try:
+                return {name: values[key] for name, key in fields}
+            except KeyError:
+                # Some column isn't loaded (i.e. it was left out of a sparse fieldset), so it's fetched as usual
+                return serialize(o)
+
+        return serialize_entity
+
+    @staticmethod
+    def __get_column_keys(dataclass: type, names: tuple[str, ...]) -> Optional[tuple[str, ...]]:
+        """
+        The fields of the entities are hybrid properties that return their (private) columns as they are. The columns
+        that are loaded are kept in the C{__dict__} of the entities, so they're read from there, without going through
+        the properties and the instrumentation of SQLAlchemy (which takes most of the time of serializing an entity)
+        :param dataclass: class of the objects to serialize
+        :param names: names of the fields of the class
+        :return: keys of the columns of the fields in the C{__dict__} of the entities, or C{None} if the class isn't an
+        entity, or some of the fields aren't columns
+        """
+        mapper = inspect(dataclass, raiseerr=False)
+        if mapper is None:
+            return None
+
+        column_keys = []
+        for name in names:
+            # On the class, the properties evaluate to the attributes of their columns
+            attribute = getattr(dataclass, name, None)
+            if not isinstance(attribute, InstrumentedAttribute) or attribute.key not in mapper.column_attrs:
+                return None
+            column_keys.append(attribute.key)
+        return tuple(column_keys)
+
+    """ Serializer of each dataclass, compiled the first time an object of the class is serialized """
+    __SERIALIZERS: dict[type, Callable[[Any], dict]] = {}
+
+    """ Encoder that turns the rest of the objects into serializable ones, as they have always been """
+    __ENCODER = CustomJSONEncoder()
@@ -1,9 +1,27 @@
 from abc import ABC
+from typing import Iterable, Iterator, Optional
 
-from sqlalchemy.orm import scoped_session
+from sqlalchemy import BigInteger, Text, cast, event, extract, func, tuple_
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import NoResultFound
+from sqlalchemy.orm import Load, Session, load_only, scoped_session
 
 from db.ConnectionManager import ConnectionManager
 
+""" Key of the session info that holds the entities memoized by C{AbstractDAO.generic_get_by_id} """
+LOADED_ENTITIES_KEY = "loaded_entities"
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def clear_loaded_entities(session: Session):
+    """
+    Drops the entities memoized by C{AbstractDAO.generic_get_by_id} once the transaction ends, since they may have
+    changed (or be gone) by then
+    :param session: session whose transaction ended
+    """
+    session.info.pop(LOADED_ENTITIES_KEY, None)
+
 
 class AbstractDAO(ABC):
     """
@@ -40,6 +58,160 @@ class AbstractDAO(ABC):
                 .filter(entity.__class__.id == entity.id)
                 .one())
 
+    @staticmethod
+    def generic_get_by_id(entity_class, entity_id: int):
+        """
+        Generic implementation to fetch a single entity by id, memoized for the current request.
+        Sessions are request-scoped, so entities fetched through here are kept in the session until its transaction
+        is committed or rolled back. Until then, fetching them again (i.e. once while validating the request, and
+        again while performing it) doesn't go to the DB
+        :param entity_class: SQLAlchemy entity class
+        :param entity_id: id of the entity
+        :return matching SQLAlchemy entity
+        :raises sqlalchemy.exc.NoResultFound: when no matching entity is found
+        """
+        session = AbstractDAO.get_connection()
+        # The identity map of the session only keeps weak references to the entities, so they're held here as well
+        loaded_entities = session.info.setdefault(LOADED_ENTITIES_KEY, {})
+
+        entity = loaded_entities.get((entity_class, entity_id))
+        if entity is None:
+            # Entities aren't expired on commit, so the ones still in the session are refreshed instead of reused
+            entity = session.get(entity_class, entity_id, populate_existing=True)
+            if entity is None:
+                raise NoResultFound(f"No {entity_class.__name__} was found with id {entity_id}")
+            loaded_entities[(entity_class, entity_id)] = entity
+        return entity
+
+    @staticmethod
+    def generic_get_version(entity_class, entity_id: int) -> Optional[Row]:
+        """
+        Generic implementation to fetch the version of an entity (its timestamps), without loading the entity. Every
+        update of the entity sets its updated_at, so the version changes whenever the entity does
+        :param entity_class: SQLAlchemy entity class
+        :param entity_id: id of the entity
+        :return: row with the created_at and updated_at of the entity, or C{None} if there's no such entity
+        """
+        return (AbstractDAO.get_connection()
+                .query(entity_class.created_at, entity_class.updated_at)
+                .filter(entity_class.id == entity_id)
+                .one_or_none())
+
+    @staticmethod
+    def generic_get_collection_version(entity_class, after_id: Optional[int] = None, criteria: Iterable = ()) -> Row:
+        """
+        Generic implementation to fetch the version of a set of entities with a single aggregate, without loading them.
+        The version changes whenever an entity of the set is created (count and max id), deleted (count) or updated
+        (checksum of the timestamps). A sum is used instead of the latest updated_at, since timestamps are taken when
+        transactions start: a long transaction may commit an update with an older timestamp than the latest one
+        :param entity_class: SQLAlchemy entity class
+        :param after_id: if included, only entities with a greater id are considered (i.e. the ones a page can hold)
+        :param criteria: if included, only entities matching all of these SQLAlchemy predicates are considered
+        :return: row with the count, max id and timestamps checksum of the matching entities
+        """
+        # Entities are only stamped with an updated_at once they're updated, so they last changed at their updated_at
+        # or, if they were never updated, at their created_at
+        timestamp = func.coalesce(entity_class.updated_at, entity_class.created_at)
+        versions = (AbstractDAO.get_connection()
+                    .query(func.count(entity_class.id),
+                           func.max(entity_class.id),
+                           # Microseconds since the epoch, so that the checksum is exact
+                           func.sum(cast(extract("epoch", timestamp) * AbstractDAO.__MICROSECONDS_PER_SECOND,
+                                         BigInteger)))
+                    .filter(*criteria))
+        if after_id:
+            versions = versions.filter(entity_class.id > after_id)
+        return versions.one()
+
+    @staticmethod
+    def generic_get_page(entity_class, limit: int, after_id: Optional[int] = None, criteria: Iterable = (),
+                         fields: Optional[Iterable[str]] = None) -> list:
+        """
+        Generic implementation to fetch a page of entities ordered by id (keyset pagination). Pages run as
+        C{WHERE id > :after_id ORDER BY id LIMIT :limit} on the primary key index, so deep pages cost the same as the
+        first one, unlike OFFSET
+        :param entity_class: SQLAlchemy entity class
+        :param limit: max amount of entities to fetch
+        :param after_id: if included, only entities with a greater id are fetched (i.e. the last id of the previous
+        page)
+        :param criteria: if included, only entities matching all of these SQLAlchemy predicates are fetched
+        :param fields: if included, only these fields are loaded (see C{generic_load_only})
+        :return: list of matching SQLAlchemy entities, ordered by id
+        """
+        entities = (AbstractDAO.get_connection()
+                    .query(entity_class)
+                    .options(*AbstractDAO.generic_load_only(entity_class, fields))
+                    .filter(*criteria))
+        if after_id:
+            entities = entities.filter(entity_class.id > after_id)
+        return entities.order_by(entity_class.id).limit(limit).all()
+
+    @staticmethod
+    def generic_stream(entity_class, criteria: Iterable = (), fields: Optional[Iterable[str]] = None) -> Iterator:
+        """
+        Generic implementation to iterate over all the entities, ordered by id, without loading them all at once.
+        Rows are read from a server-side cursor, and turned into entities a batch at a time, so memory stays the same
+        no matter how many entities there are. The session doesn't keep the entities that callers are done with
+        :param entity_class: SQLAlchemy entity class
+        :param criteria: if included, only entities matching all of these SQLAlchemy predicates are iterated over
+        :param fields: if included, only these fields are loaded (see C{generic_load_only})
+        :return: iterator of matching SQLAlchemy entities, ordered by id
+        """
+        yield from (AbstractDAO.get_connection()
+                    .query(entity_class)
+                    .options(*AbstractDAO.generic_load_only(entity_class, fields))
+                    .filter(*criteria)
+                    .order_by(entity_class.id)
+                    .execution_options(stream_results=True)
+                    .yield_per(AbstractDAO.__STREAM_BATCH_SIZE))
+
+    @staticmethod
+    def generic_get_changes(entity_class, limit: int, after: Optional[tuple[int, int]] = None) -> list:
+        """
+        Generic implementation to fetch the entities that were created or updated after a point of the change feed, in
+        the order they changed. Runs as C{WHERE (xact_id, id) > (:xact_id, :id) ORDER BY xact_id, id LIMIT n} on the
+        (xact_id, id) index, so its cost depends on how many entities changed since then, not on how many there are.
+        Entities are stamped with the id of the transaction that last wrote them, and transactions may commit in a
+        different order than they got their ids. Only the changes of transactions older than the oldest one still
+        running are fetched (see C{get_changes_watermark}), so no matter how long a transaction takes, its changes can't
+        be committed behind a point of the feed that was already fetched
+        :param entity_class: SQLAlchemy entity class
+        :param limit: max amount of entities to fetch
+        :param after: if included, only entities that changed after this (xact_id, id) point are fetched (i.e. the ones
+        of the last entity of the previous page)
+        :return: list of matching SQLAlchemy entities, in the order they changed
+        """
+        entities = (AbstractDAO.get_connection()
+                    .query(entity_class)
+                    .filter(entity_class.xact_id < AbstractDAO.get_changes_watermark()))
+        if after:
+            entities = entities.filter(tuple_(entity_class.xact_id, entity_class.id) > tuple_(*after))
+        return entities.order_by(entity_class.xact_id, entity_class.id).limit(limit).all()
+
+    @staticmethod
+    def get_changes_watermark():
+        """
+        Every transaction with a lower id than the oldest one that is still running has already committed (or rolled
+        back), and no new transaction can get one of those ids, so the changes below this point are final
+        :return: SQL expression with the id of the oldest transaction that is still running, or the next one to start
+        """
+        return cast(cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger)
+
+    @staticmethod
+    def generic_load_only(entity_class, fields: Optional[Iterable[str]]) -> list[Load]:
+        """
+        Generic implementation of the loader options to load only some fields of the entities (sparse fieldsets), so
+        that the rest of the columns aren't selected nor sent over by the DB. The primary key is always loaded.
+        Accessing a field that wasn't loaded fetches it from the DB, so callers should stick to the ones they asked for
+        :param entity_class: SQLAlchemy entity class
+        :param fields: names of the fields to load, or C{None} to load all of them
+        :return: list with the loader options for the query
+        """
+        if fields is None:
+            return []
+        # Fields are hybrid properties on top of private columns: on the class, they evaluate to the column attributes
+        return [load_only(*(getattr(entity_class, x) for x in fields))]
+
     @staticmethod
     def begin():
         AbstractDAO.get_connection().begin()
@@ -56,6 +228,20 @@ class AbstractDAO(ABC):
     def flush():
         AbstractDAO.get_connection().flush()
 
+    @staticmethod
+    def get_dialect_name() -> str:
+        """
+        Name of the dialect of the DB we're connected to
+        :return: dialect name (i.e. "postgresql" or "sqlite")
+        """
+        return AbstractDAO.get_connection().get_bind().dialect.name
+
     @staticmethod
     def get_connection() -> scoped_session:
         return ConnectionManager().get_session()
+
+    """ Amount of rows turned into entities at a time while streaming them (see C{generic_stream}) """
+    __STREAM_BATCH_SIZE = 1000
+
+    """ Amount of microseconds in a second, to checksum timestamps (see C{generic_get_collection_version}) """
+    __MICROSECONDS_PER_SECOND = 1000000
@@ -1,5 +1,6 @@
 from flask_sqlalchemy_session import current_session
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from utils.singleton import Singleton
@@ -19,7 +20,16 @@ class ConnectionManager(metaclass=Singleton):
 
         engine = create_engine(database_url)
         self.__engine = engine
-        self.__session_factory = sessionmaker(bind=engine, autocommit=True)
+        # Entities keep the values they were written with (and the ones returned by the DB) after the commit, so they
+        # can be serialized right away instead of being loaded again
+        self.__session_factory = sessionmaker(bind=engine, autocommit=True, expire_on_commit=False)
+
+    def get_engine(self) -> Engine:
+        """
+        Returns the engine originally created for the DB
+        :return: Engine object
+        """
+        return self.__engine
 
     def get_session_factory(self) -> sessionmaker:
         """
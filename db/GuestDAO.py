@@ -1,3 +1,7 @@
+from typing import Iterable, Optional
+
+from sqlalchemy.engine import Row
+
 from db.AbstractDAO import AbstractDAO
 from db.entities.Guest import Guest
 
@@ -6,11 +10,29 @@ class GuestDAO(AbstractDAO):
 
     @staticmethod
     def get(guest_id: int) -> Guest:
-        return (GuestDAO.get_connection()
-                .query(Guest)
-                .filter(Guest.id == guest_id)
-                .one())
+        return GuestDAO.generic_get_by_id(Guest, guest_id)
+
+    @staticmethod
+    def get_many(guest_ids: Iterable[int]) -> list[Guest]:
+        """
+        Fetches several guests with a single query
+        :param guest_ids: ids of the guests to fetch
+        :return: matching Guests. Missing guests are left out
+        """
+        return [x for x in GuestDAO.get_connection().query(Guest).filter(Guest.id.in_(list(guest_ids)))]
 
     @staticmethod
     def get_all() -> list[Guest]:
-        return [x for x in GuestDAO.get_connection().query(Guest).all()]
+        return GuestDAO.get_connection().query(Guest).all()
+
+    @staticmethod
+    def get_page(limit: int, after_id: Optional[int] = None, fields: Optional[Iterable[str]] = None) -> list[Guest]:
+        return GuestDAO.generic_get_page(Guest, limit, after_id, fields=fields)
+
+    @staticmethod
+    def get_changes(limit: int, after: Optional[tuple[int, int]] = None) -> list[Guest]:
+        return GuestDAO.generic_get_changes(Guest, limit, after)
+
+    @staticmethod
+    def get_page_version(after_id: Optional[int] = None) -> Row:
+        return GuestDAO.generic_get_collection_version(Guest, after_id)
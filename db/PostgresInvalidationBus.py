@@ -0,0 +1,147 @@
+import json
+import logging
+import select
+import uuid
+from threading import Event, Thread
+from typing import Any, Iterable, Optional
+
+from sqlalchemy import func
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import select as sql_select
+
+from utils.InvalidationBus import InvalidationBus
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresInvalidationBus(InvalidationBus):
+    """
+    Bus backed by Postgres C{LISTEN/NOTIFY}, so that every process connected to the same DB gets the messages. Each bus
+    keeps a connection of its own (outside of the pool) listening on the channel, from a background thread that hands
+    the messages to the subscribers as soon as they arrive. Messages are published with C{pg_notify}, and they carry the
+    id of the bus that published them, so that it can skip its own ones.
+
+    The listening thread is started by C{start}, which has to be called from the process that serves the requests
+    (i.e. after gunicorn forks the workers), since threads don't survive a fork
+    """
+    def __init__(self, engine: Engine, channel: str = "cache_invalidation"):
+        """
+        :param engine: engine of the DB the processes share
+        :param channel: name of the channel the bus publishes to and listens on
+        """
+        super().__init__()
+        self.__engine = engine
+        self.__channel = channel
+        self.__sender_id = uuid.uuid4().hex
+        self.__stopped = Event()
+        self.__listening = Event()
+        self.__thread: Optional[Thread] = None
+
+    def publish(self, keys: Iterable[str]):
+        """
+        Sends the keys with as few notifications as possible, within the size limit of their payloads
+        :param keys: keys of the cached values that were invalidated
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        with self.__engine.begin() as connection:
+            for i in range(0, len(keys), PostgresInvalidationBus.__MAX_KEYS_PER_NOTIFICATION):
+                payload = json.dumps({
+                    PostgresInvalidationBus.__SENDER: self.__sender_id,
+                    PostgresInvalidationBus.__KEYS: keys[i:i + PostgresInvalidationBus.__MAX_KEYS_PER_NOTIFICATION],
+                }, separators=(",", ":"))
+                connection.execute(sql_select(func.pg_notify(self.__channel, payload)))
+
+    def start(self):
+        if self.__thread is not None:
+            return
+        self.__stopped.clear()
+        self.__thread = Thread(target=self.__listen, name=f"{self.__channel}-listener", daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        if self.__thread is None:
+            return
+        self.__stopped.set()
+        self.__thread.join()
+        self.__thread = None
+
+    def wait_until_listening(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits for the bus to be listening on the channel. Messages published before that aren't received
+        :param timeout: max amount of seconds to wait, or C{None} to wait indefinitely
+        :return: C{True} if the bus is listening
+        """
+        return self.__listening.wait(timeout)
+
+    def __listen(self):
+        """
+        Receives the messages of the channel until the bus is stopped, connecting again whenever the connection is lost
+        """
+        while not self.__stopped.is_set():
+            connection = None
+            try:
+                connection = self.__connect()
+                with connection.cursor() as cursor:
+                    cursor.execute(f'LISTEN "{self.__channel}"')
+                # Any message published while the bus wasn't listening was missed
+                self.deliver([InvalidationBus.ALL])
+                self.__listening.set()
+
+                while not self.__stopped.is_set():
+                    # Wait for the connection to have something to read, waking up once in a while to check if the bus
+                    # was stopped
+                    if select.select([connection], [], [], PostgresInvalidationBus.__POLL_SECONDS)[0]:
+                        connection.poll()
+                        notifications = list(connection.notifies)
+                        connection.notifies.clear()
+                        self.__receive(notifications)
+            except Exception:
+                logger.exception("Lost the connection listening for cache invalidations. Connecting again")
+                self.__stopped.wait(PostgresInvalidationBus.__RECONNECT_SECONDS)
+            finally:
+                self.__listening.clear()
+                if connection is not None:
+                    connection.close()
+
+    def __connect(self) -> Any:
+        """
+        :return: new DBAPI connection to the DB, in autocommit mode so that notifications are received right away
+        """
+        connect_args, connect_kwargs = self.__engine.dialect.create_connect_args(self.__engine.url)
+        connection = self.__engine.dialect.connect(*connect_args, **connect_kwargs)
+        connection.autocommit = True
+        return connection
+
+    def __receive(self, notifications: list):
+        """
+        Delivers the keys of the notifications published by other buses, all at once. Payloads that can't be read are
+        skipped
+        :param notifications: notifications received on the channel
+        """
+        keys = []
+        for notification in notifications:
+            try:
+                message = json.loads(notification.payload)
+                if message[PostgresInvalidationBus.__SENDER] != self.__sender_id:
+                    keys.extend(message[PostgresInvalidationBus.__KEYS])
+            except (ValueError, TypeError, KeyError):
+                logger.warning("Skipped an invalid cache invalidation: %s", notification.payload)
+        if keys:
+            self.deliver(keys)
+
+    """ Key of the id of the bus that published a message, in the payloads """
+    __SENDER = "sender"
+
+    """ Key of the invalidated keys of a message, in the payloads """
+    __KEYS = "keys"
+
+    """ Max amount of keys sent in a single notification, since payloads must be shorter than 8000 bytes """
+    __MAX_KEYS_PER_NOTIFICATION = 200
+
+    """ Max amount of seconds the listening thread waits for notifications before checking if the bus was stopped """
+    __POLL_SECONDS = 1
+
+    """ Amount of seconds to wait before connecting again after the connection is lost """
+    __RECONNECT_SECONDS = 1
@@ -1,19 +1,75 @@
+from datetime import datetime, time, timedelta
+from typing import Iterable, Iterator, Optional
+
+from pytz import utc
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Query
+from sqlalchemy.sql.elements import ColumnElement
+
+from api.entities.ReservationFilters import ReservationFilters
+from api.entities.ReservationStatus import ReservationStatus
 from db.AbstractDAO import AbstractDAO
+from db.entities.Guest import Guest
 from db.entities.Reservation import Reservation
+from db.entities.Room import Room
 
 
 class ReservationDAO(AbstractDAO):
 
     @staticmethod
     def get(reservation_id: int) -> Reservation:
-        return (ReservationDAO.get_connection()
-                .query(Reservation)
-                .filter(Reservation.id == reservation_id)
-                .one())
+        return ReservationDAO.generic_get_by_id(Reservation, reservation_id)
 
     @staticmethod
     def get_all() -> list[Reservation]:
-        return [x for x in ReservationDAO.get_connection().query(Reservation).all()]
+        return ReservationDAO.get_connection().query(Reservation).all()
+
+    @staticmethod
+    def get_page(limit: int, after_id: Optional[int] = None, filters: Optional[ReservationFilters] = None,
+                 fields: Optional[Iterable[str]] = None) -> list[Reservation]:
+        """
+        Gets a page of the reservations matching the filters, ordered by id (see C{generic_get_page})
+        :param limit: max amount of reservations to return
+        :param after_id: if included, only reservations with a greater id are returned
+        :param filters: if included, filters the reservations have to match
+        :param fields: if included, only these fields of the reservations are loaded (see C{generic_load_only})
+        :return: list of matching Reservations
+        """
+        return ReservationDAO.generic_get_page(Reservation, limit, after_id, ReservationDAO.__get_criteria(filters),
+                                               fields)
+
+    @staticmethod
+    def get_changes(limit: int, after: Optional[tuple[int, int]] = None) -> list[Reservation]:
+        return ReservationDAO.generic_get_changes(Reservation, limit, after)
+
+    @staticmethod
+    def get_version(reservation_id: int) -> Optional[Row]:
+        return ReservationDAO.generic_get_version(Reservation, reservation_id)
+
+    @staticmethod
+    def get_page_version(after_id: Optional[int] = None, filters: Optional[ReservationFilters] = None) -> Row:
+        """
+        Gets the version of the reservations matching the filters (see C{generic_get_collection_version})
+        :param after_id: if included, only reservations with a greater id are considered
+        :param filters: if included, filters the reservations have to match
+        :return: row with the version of the matching reservations
+        """
+        return ReservationDAO.generic_get_collection_version(Reservation, after_id,
+                                                             ReservationDAO.__get_criteria(filters))
+
+    @staticmethod
+    def stream(filters: Optional[ReservationFilters] = None,
+               fields: Optional[Iterable[str]] = None) -> Iterator[Reservation]:
+        """
+        Iterates over all the reservations matching the filters, ordered by id, without loading them all at once
+        (see C{generic_stream})
+        :param filters: if included, filters the reservations have to match
+        :param fields: if included, only these fields of the reservations are loaded (see C{generic_load_only})
+        :return: iterator of matching Reservations
+        """
+        return ReservationDAO.generic_stream(Reservation, ReservationDAO.__get_criteria(filters), fields)
 
     @staticmethod
     def get_reservations_for_guest(guest_id: int) -> list[Reservation]:
@@ -32,3 +88,144 @@ class ReservationDAO(AbstractDAO):
         :return: list of matching Reservations
         """
         return [x for x in ReservationDAO.get_connection().query(Reservation).filter(Reservation.room_id == room_id)]
+
+    @staticmethod
+    def get_overlapping_reservations_query(start_date: datetime, end_date: datetime) -> Query:
+        """
+        Builds a query for the SCHEDULED reservations overlapping the given date range, which callers can narrow down
+        (i.e. to a single room). Reservations that only touch the date range at its edges are considered to overlap
+        :param start_date: start of the date range
+        :param end_date: end of the date range
+        :return: query for the overlapping reservations
+        """
+        return (ReservationDAO.get_connection()
+                .query(Reservation)
+                .filter(Reservation.status == ReservationStatus.SCHEDULED,
+                        Reservation.start_date <= end_date,
+                        Reservation.end_date >= start_date))
+
+    @staticmethod
+    def get_booking_details(room_id: int, guest_id: int, start_date: datetime, end_date: datetime,
+                            excluded_reservation_id: int = None) -> Row:
+        """
+        Fetches everything needed to validate a booking with a single statement, instead of one round trip for each
+        of the room, the guest and the overlapping reservations. The overlap check is an EXISTS backed by the partial
+        index on (room_id, start_date, end_date). The statement only reads committed rows, so the pending changes of
+        the session aren't flushed for it
+        :param room_id: room being booked
+        :param guest_id: guest making the booking
+        :param start_date: start of the date range being booked
+        :param end_date: end of the date range being booked
+        :param excluded_reservation_id: if included, that reservation is taken out of the overlap check
+        :return: single row with the room_is_active, room_capacity, guest_is_active and has_overlapping_reservations
+        columns. The room and guest columns are C{None} when they don't exist
+        """
+        session = ReservationDAO.get_connection()
+        overlapping_reservations = (ReservationDAO.get_overlapping_reservations_query(start_date, end_date)
+                                    .filter(Reservation.room_id == room_id))
+        if excluded_reservation_id:
+            overlapping_reservations = overlapping_reservations.filter(Reservation.id != excluded_reservation_id)
+
+        with session.no_autoflush:
+            return session.query(
+                select(Room.is_active).where(Room.id == room_id).scalar_subquery().label("room_is_active"),
+                select(Room.capacity).where(Room.id == room_id).scalar_subquery().label("room_capacity"),
+                select(Guest.is_active).where(Guest.id == guest_id).scalar_subquery().label("guest_is_active"),
+                overlapping_reservations.exists().label("has_overlapping_reservations")
+            ).one()
+
+    @staticmethod
+    def get_scheduled_reservation_spans(room_ids: Iterable[int], start_date: datetime = None,
+                                        end_date: datetime = None) -> list[tuple[int, int, datetime, datetime]]:
+        """
+        Gets the room_id, id, start_date and end_date of the SCHEDULED reservations of the given rooms, without loading
+        the entities
+        :param room_ids: room_ids to look for in the reservations
+        :param start_date: if included along with end_date, only reservations overlapping the date range are included
+        :param end_date: if included along with start_date, only reservations overlapping the date range are included
+        :return: list of (room_id, id, start_date, end_date) tuples
+        """
+        if start_date and end_date:
+            reservations = ReservationDAO.get_overlapping_reservations_query(start_date, end_date)
+        else:
+            reservations = (ReservationDAO.get_connection()
+                            .query(Reservation)
+                            .filter(Reservation.status == ReservationStatus.SCHEDULED))
+
+        return [tuple(x) for x in reservations
+                .filter(Reservation.room_id.in_(list(room_ids)))
+                .with_entities(Reservation.room_id, Reservation.id, Reservation.start_date, Reservation.end_date)]
+
+    @staticmethod
+    def insert_many(reservations: list[Reservation]) -> list[Reservation]:
+        """
+        Inserts several reservations with a single multi-row INSERT ... RETURNING statement, instead of one statement
+        per reservation
+        :param reservations: Reservations to insert
+        :return: inserted Reservations, loaded from the returned rows, in the same order
+        """
+        assert len(reservations) > 0
+        reservation_table = Reservation.__table__
+        statement = (insert(reservation_table)
+                     .values([{
+                         "room_id": x.room_id,
+                         "guest_id": x.guest_id,
+                         "start_date": x.start_date,
+                         "end_date": x.end_date,
+                         "amount_of_guests": x.amount_of_guests,
+                         "status": ReservationStatus(x.status)
+                     } for x in reservations])
+                     .returning(*reservation_table.columns))
+
+        inserted_reservations = (ReservationDAO.get_connection()
+                                 .execute(select(Reservation).from_statement(statement))
+                                 .scalars()
+                                 .all())
+        # Ids are handed out in the order of the rows, which is the same order as the given reservations
+        return sorted(inserted_reservations, key=lambda x: x.id)
+
+    @staticmethod
+    def is_scheduling_conflict(error: IntegrityError) -> bool:
+        """
+        Checks if an integrity error was raised by the constraint that prevents overlapping SCHEDULED reservations
+        :param error: error raised by the DB when writing a reservation
+        :return: C{True} if the error is a scheduling conflict, C{False} otherwise
+        """
+        return ReservationDAO.SCHEDULING_CONFLICT_CONSTRAINT in str(error.orig)
+
+    @staticmethod
+    def __get_criteria(filters: Optional[ReservationFilters]) -> list[ColumnElement]:
+        """
+        Compiles the filters into SQLAlchemy predicates. Filtering by room or guest is backed by the (room_id, id) and
+        (guest_id, id) indexes, and filtering by date is backed by the index on end_date, since most of the history
+        ends before the dates that are usually looked up
+        :param filters: filters the reservations have to match, if any
+        :return: list of predicates, which reservations have to match all of
+        """
+        criteria = []
+        if filters is None:
+            return criteria
+
+        if filters.room_id:
+            criteria.append(Reservation.room_id == filters.room_id)
+        if filters.guest_id:
+            criteria.append(Reservation.guest_id == filters.guest_id)
+        if filters.status:
+            criteria.append(Reservation.status == filters.status)
+        if filters.starts_before:
+            criteria.append(Reservation.start_date < filters.starts_before)
+        if filters.ends_after:
+            criteria.append(Reservation.end_date > filters.ends_after)
+        if filters.active_on:
+            # Same as overlapping the whole day, where reservations that only touch it at its edges are included
+            day_start = datetime.combine(filters.active_on, time.min, tzinfo=utc)
+            criteria.extend((Reservation.start_date < day_start + timedelta(days=1),
+                             Reservation.end_date >= day_start))
+        if filters.in_house_on:
+            # Reservations that start during the day or before it, and are still going on when the night is over
+            next_day_start = datetime.combine(filters.in_house_on + timedelta(days=1), time.min, tzinfo=utc)
+            criteria.extend((Reservation.start_date < next_day_start, Reservation.end_date >= next_day_start))
+        return criteria
+
+    """ Name of the exclusion constraint that prevents overlapping SCHEDULED reservations for the same room """
+    SCHEDULING_CONFLICT_CONSTRAINT = "excl_reservation_room_id_dates_scheduled"
@@ -1,4 +1,12 @@
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.engine import Row
+
 from db.AbstractDAO import AbstractDAO
+from db.ReservationDAO import ReservationDAO
+from db.entities.Reservation import Reservation
 from db.entities.Room import Room
 
 
@@ -6,11 +14,84 @@ class RoomDAO(AbstractDAO):
 
     @staticmethod
     def get(room_id: int) -> Room:
+        return RoomDAO.generic_get_by_id(Room, room_id)
+
+    @staticmethod
+    def lock(room_id: int):
+        """
+        Locks the row of a room until the end of the current transaction (SELECT ... FOR UPDATE), so that writes that
+        depend on the room (i.e. booking it) are serialized, while writes for other rooms aren't blocked. Only the id is
+        selected, since the room itself is validated separately. Missing rooms are left alone
+        :param room_id: id of the room to lock
+        """
+        RoomDAO.get_connection().query(Room.id).filter(Room.id == room_id).with_for_update().all()
+
+    @staticmethod
+    def get_many_for_update(room_ids: Iterable[int]) -> list[Room]:
+        """
+        Fetches several rooms and locks their rows until the end of the current transaction (see C{lock}).
+        Rows are locked in id order, so that transactions locking several of the same rooms can't deadlock
+        :param room_ids: ids of the rooms to lock
+        :return: matching Rooms, refreshed with the values of the locked rows. Missing rooms are left out
+        """
         return (RoomDAO.get_connection()
                 .query(Room)
-                .filter(Room.id == room_id)
-                .one())
+                .filter(Room.id.in_(list(room_ids)))
+                .order_by(Room.id)
+                .populate_existing()
+                .with_for_update()
+                .all())
 
     @staticmethod
     def get_all() -> list[Room]:
-        return [x for x in RoomDAO.get_connection().query(Room).all()]
+        return RoomDAO.get_connection().query(Room).all()
+
+    @staticmethod
+    def get_page(limit: int, after_id: Optional[int] = None, fields: Optional[Iterable[str]] = None) -> list[Room]:
+        return RoomDAO.generic_get_page(Room, limit, after_id, fields=fields)
+
+    @staticmethod
+    def get_changes(limit: int, after: Optional[tuple[int, int]] = None) -> list[Room]:
+        return RoomDAO.generic_get_changes(Room, limit, after)
+
+    @staticmethod
+    def get_page_version(after_id: Optional[int] = None) -> Row:
+        return RoomDAO.generic_get_collection_version(Room, after_id)
+
+    @staticmethod
+    def get_existing_ids(room_ids: Iterable[int]) -> set[int]:
+        """
+        Checks which of the given room ids exist, in a single query
+        :param room_ids: ids of the rooms to look for
+        :return: set with the ids that belong to existing rooms
+        """
+        return {x for x, in RoomDAO.get_connection().query(Room.id).filter(Room.id.in_(list(room_ids)))}
+
+    @staticmethod
+    def get_available(start_date: datetime, end_date: datetime, guests: Optional[int], limit: int,
+                      after_id: Optional[int] = None, fields: Optional[Iterable[str]] = None) -> list[Room]:
+        """
+        Gets a page of the active rooms that can hold the amount of guests and have no SCHEDULED reservation
+        overlapping the date range. This runs as a single anti-join query, ordered by id
+        :param start_date: start of the date range
+        :param end_date: end of the date range
+        :param guests: if included, only rooms that can hold this amount of guests are returned
+        :param limit: max amount of rooms to return
+        :param after_id: if included, only rooms with a greater id are returned (i.e. the last id of the previous page)
+        :param fields: if included, only these fields of the rooms are loaded (see C{generic_load_only})
+        :return: list of matching Rooms
+        """
+        overlapping_reservations = (ReservationDAO.get_overlapping_reservations_query(start_date, end_date)
+                                    .filter(Reservation.room_id == Room.id))
+
+        available_rooms = (RoomDAO.get_connection()
+                           .query(Room)
+                           .options(*RoomDAO.generic_load_only(Room, fields))
+                           .filter(Room.is_active.is_(True), ~overlapping_reservations.exists()))
+        if guests:
+            # Rooms without a capacity can hold any amount of guests
+            available_rooms = available_rooms.filter(or_(Room.capacity.is_(None), Room.capacity >= guests))
+        if after_id:
+            available_rooms = available_rooms.filter(Room.id > after_id)
+
+        return available_rooms.order_by(Room.id).limit(limit).all()
@@ -0,0 +1,41 @@
+from typing import Iterable, Optional
+
+from sqlalchemy import tuple_
+
+from db.AbstractDAO import AbstractDAO
+from db.entities.Tombstone import Tombstone
+
+
+class TombstoneDAO(AbstractDAO):
+
+    @staticmethod
+    def save_many(entity_class, entity_ids: Iterable[int]):
+        """
+        Leaves a tombstone behind for each of the deleted entities, within the current transaction
+        :param entity_class: SQLAlchemy entity class of the deleted entities
+        :param entity_ids: ids of the deleted entities
+        """
+        for entity_id in entity_ids:
+            tombstone = Tombstone()
+            tombstone.init_fields(entity_class.__tablename__, entity_id)
+            TombstoneDAO.save(tombstone)
+
+    @staticmethod
+    def get_page(entity_class, limit: int, after: Optional[tuple[int, int]] = None) -> list[Tombstone]:
+        """
+        Gets the tombstones of the entities of a class that were deleted after a point of the change feed, in the order
+        they were deleted, from the (entity_type, xact_id, id) index. Like the changes, they're only fetched once every
+        transaction older than theirs is done (see C{generic_get_changes})
+        :param entity_class: SQLAlchemy entity class of the deleted entities
+        :param limit: max amount of tombstones to return
+        :param after: if included, only tombstones left after this (xact_id, id) point are returned (i.e. the ones
+        of the last tombstone of the previous page)
+        :return: list of matching Tombstones, in the order the entities were deleted
+        """
+        tombstones = (TombstoneDAO.get_connection()
+                      .query(Tombstone)
+                      .filter(Tombstone.entity_type == entity_class.__tablename__,
+                              Tombstone.xact_id < TombstoneDAO.get_changes_watermark()))
+        if after:
+            tombstones = tombstones.filter(tuple_(Tombstone.xact_id, Tombstone.id) > tuple_(*after))
+        return tombstones.order_by(Tombstone.xact_id, Tombstone.id).limit(limit).all()
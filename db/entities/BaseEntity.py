@@ -4,8 +4,8 @@ from datetime import datetime
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import declared_attr
 from sqlalchemy.schema import Column
-from sqlalchemy.sql import func
-from sqlalchemy.types import DateTime, Integer
+from sqlalchemy.sql import cast, func
+from sqlalchemy.types import BigInteger, DateTime, Integer, Text
 
 
 @dataclass
@@ -78,8 +78,25 @@ class BaseEntity:
         assert isinstance(updated_at, datetime), type(updated_at)
         self.__updated_at = updated_at
 
+    @hybrid_property
+    def xact_id(self) -> int:
+        """
+        Gets the id of the transaction that last wrote the entity, which the change feed reads the entities by. It's
+        generated by the DB on every write, so it's not part of the fields of the entity
+        :return: id of the transaction that created or last updated the entity
+        """
+        return self.__xact_id
+
+    """ Fetch the values generated by the DB (i.e. id, created_at) when flushing, with RETURNING where possible """
+    __mapper_args__ = {"eager_defaults": True}
+
     __id = Column("id", Integer, primary_key=True)
 
     __created_at = Column("created_at", DateTime(timezone=True), server_default=func.now())
 
     __updated_at = Column("updated_at", DateTime(timezone=True), onupdate=func.now())
+
+    """ Id of the current transaction (xid8 can't be cast to bigint directly, but its text can) """
+    __CURRENT_XACT_ID = cast(cast(func.pg_current_xact_id(), Text), BigInteger)
+
+    __xact_id = Column("xact_id", BigInteger, nullable=False, default=__CURRENT_XACT_ID, onupdate=__CURRENT_XACT_ID)
@@ -38,7 +38,7 @@ class Reservation(Base):
         self.start_date = start_date
         self.end_date = end_date
         self.amount_of_guests = amount_of_guests
-        self.status = status.value
+        self.status = status
 
     @hybrid_property
     def room_id(self) -> int:
@@ -153,7 +153,7 @@ class Reservation(Base):
         """
         assert isinstance(status, ReservationStatus), type(status)
 
-        self.__status = status.value
+        self.__status = status
 
     __room_id = Column("room_id",
                        BigInteger,
@@ -182,4 +182,4 @@ class Reservation(Base):
     __status = Column("status",
                       Enum(ReservationStatus),
                       nullable=False,
-                      default="SCHEDULED")
+                      default=ReservationStatus.SCHEDULED)
@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+
+from sqlalchemy import BigInteger, Column, String
+from sqlalchemy.ext.hybrid import hybrid_property
+
+from db.entities import Base
+
+
+@dataclass
+class Tombstone(Base):
+    """
+    Tombstone SQLAlchemy entity. It's left behind when an entity is deleted, so that the change feed can tell clients
+    about the deletion. Its created_at is when the entity was deleted
+    """
+    entity_type: str
+    entity_id: int
+
+    def init_fields(self, entity_type: str, entity_id: int):
+        """
+        Initializes the tombstone entity with data
+        :param entity_type: table of the deleted entity (i.e. "room")
+        :param entity_id: id of the deleted entity
+        """
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+
+    @hybrid_property
+    def entity_type(self) -> str:
+        """
+        Gets the type of the deleted entity
+        :return: table of the deleted entity (i.e. "room")
+        """
+        return self.__entity_type
+
+    @entity_type.setter
+    def entity_type(self, entity_type: str):
+        """
+        Sets the type of the deleted entity
+        :param entity_type: table of the deleted entity (i.e. "room")
+        """
+        assert isinstance(entity_type, str), type(entity_type)
+        assert entity_type.strip()
+        self.__entity_type = entity_type
+
+    @hybrid_property
+    def entity_id(self) -> int:
+        """
+        Gets the id of the deleted entity
+        :return: id of the deleted entity
+        """
+        return self.__entity_id
+
+    @entity_id.setter
+    def entity_id(self, entity_id: int):
+        """
+        Sets the id of the deleted entity
+        :param entity_id: id of the deleted entity
+        """
+        assert isinstance(entity_id, int), type(entity_id)
+        assert entity_id > 0, entity_id
+        self.__entity_id = entity_id
+
+    __entity_type = Column("entity_type", String, nullable=False)
+
+    __entity_id = Column("entity_id", BigInteger, nullable=False)
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+from urllib.parse import urlencode
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ReservationService import ReservationService
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestAvailableRoomsController(TestAppBase):
+    def test_searching_available_rooms(self):
+        booked_room_id, small_room_id, inactive_room_id, big_room_id = self.__create_rooms_data()
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=4)
+        end_date = datetime.now(tz=pytz.utc) + timedelta(days=6)
+
+        response = self.client.get(
+            f"{Routes.ROOMS_AVAILABLE.value}?"
+            f"{urlencode({'start_date': start_date.isoformat(), 'end_date': end_date.isoformat(), 'guests': 2})}"
+        )
+        assert response.status_code == HttpStatuses.OK.value
+        # The booked room overlaps with the dates, the small one can't hold 2 guests and the inactive one can't be
+        # booked
+        assert [x["id"] for x in response.json] == [big_room_id]
+
+        response = self.client.get(
+            f"{Routes.ROOMS_AVAILABLE.value}?"
+            f"{urlencode({'start_date': start_date.isoformat(), 'end_date': end_date.isoformat()})}"
+        )
+        assert [x["id"] for x in response.json] == [small_room_id, big_room_id]
+
+    def test_searching_available_rooms_by_page(self):
+        self.__create_rooms_data()
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=10)
+        end_date = datetime.now(tz=pytz.utc) + timedelta(days=12)
+
+        response = self.client.get(
+            f"{Routes.ROOMS_AVAILABLE.value}?"
+            f"{urlencode({'start_date': start_date.isoformat(), 'end_date': end_date.isoformat(), 'limit': 2})}"
+        )
+        assert len(response.json) == 2
+        assert "next" in response.headers["Link"]
+
+        # Follow the link to the next page, which is the last one
+        next_page_url = response.headers["Link"].split(";")[0].strip("<>")
+        response = self.client.get(next_page_url)
+        assert len(response.json) == 1
+        assert "Link" not in response.headers
+
+    def test_searching_available_rooms_bad_request(self):
+        # start_date and end_date are required
+        response = self.client.get(f"{Routes.ROOMS_AVAILABLE.value}?guests=2")
+        assert response.status_code == HttpStatuses.BAD_REQUEST.value
+
+        # Pages take the same limit and opaque cursor as the rest of the collections, so raw ids are rejected. Only
+        # positive amounts of guests are accepted
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=10)
+        end_date = start_date + timedelta(days=2)
+        dates = urlencode({"start_date": start_date.isoformat(), "end_date": end_date.isoformat()})
+        for query_string in ("guests=0", "guests=%C2%B2", "limit=0", "limit=%C2%B2", "after=1", "after=wrI"):
+            response = self.client.get(f"{Routes.ROOMS_AVAILABLE.value}?{dates}&{query_string}")
+            assert response.status_code == HttpStatuses.BAD_REQUEST.value, query_string
+
+    def __create_rooms_data(self) -> tuple[int, int, int, int]:
+        """
+        Creates a booked room, a small room, an inactive room and a big room
+        :return: returns the IDs of the created rooms in a tuple. (booked_room_id, small_room_id, inactive_room_id,
+        big_room_id)
+        """
+        booked_room = Room()
+        booked_room.init_fields("Room 1", 2)
+        small_room = Room()
+        small_room.init_fields("Room 2", 1)
+        inactive_room = Room()
+        inactive_room.init_fields("Room 3", 2, False)
+        big_room = Room()
+        big_room.init_fields("Room 4", 4)
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+
+        AbstractDAO.begin()
+        for room in (booked_room, small_room, inactive_room, big_room):
+            RoomDAO.save(room)
+        GuestDAO.save(guest)
+        AbstractDAO.commit()
+
+        ReservationService.create(
+            {
+                "room_id": booked_room.id,
+                "guest_id": guest.id,
+                "start_date": (datetime.now(tz=pytz.utc) + timedelta(days=3)).isoformat("T"),
+                "end_date": (datetime.now(tz=pytz.utc) + timedelta(days=5)).isoformat("T"),
+                "amount_of_guests": 1
+            }
+        )
+        return booked_room.id, small_room.id, inactive_room.id, big_room.id
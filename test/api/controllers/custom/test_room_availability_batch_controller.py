@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ReservationService import ReservationService
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestRoomAvailabilityBatchController(TestAppBase):
+    def test_checking_availability_of_several_rooms(self):
+        room_id, other_room_id = self.__create_reservation_data()
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=3)
+        end_date = datetime.now(tz=pytz.utc) + timedelta(days=5)
+
+        response = self.client.post(
+            Routes.ROOM_AVAILABILITY_BATCH.value, json=[
+                # Overlaps with the existing reservation
+                {"room_id": room_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+                # Same dates, but for a room without reservations
+                {"room_id": other_room_id, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+                # After the existing reservation
+                {"room_id": room_id, "start_date": (end_date + timedelta(days=2)).isoformat(),
+                 "end_date": (end_date + timedelta(days=3)).isoformat()},
+            ]
+        )
+
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.json == [False, True, True]
+
+    def test_checking_availability_of_a_missing_room(self):
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=3)
+        end_date = datetime.now(tz=pytz.utc) + timedelta(days=5)
+
+        response = self.client.post(
+            Routes.ROOM_AVAILABILITY_BATCH.value, json=[
+                {"room_id": 25, "start_date": start_date.isoformat(), "end_date": end_date.isoformat()},
+            ]
+        )
+        assert response.status_code == HttpStatuses.NOT_FOUND.value
+
+    def test_checking_availability_without_timezones(self):
+        room_id, _ = self.__create_reservation_data()
+
+        # Items follow the same validations as the single availability check, so dates without tz info are rejected
+        response = self.client.post(
+            Routes.ROOM_AVAILABILITY_BATCH.value, json=[
+                {"room_id": room_id, "start_date": "2021-08-30T00:00:00", "end_date": "2021-08-31T00:00:00"},
+            ]
+        )
+        assert response.status_code == HttpStatuses.BAD_REQUEST.value
+
+    def __create_reservation_data(self) -> tuple[int, int]:
+        """
+        Creates 2 rooms and a guest, and books the first room
+        :return: returns the IDs of the created rooms in a tuple. (room_id, other_room_id)
+        """
+        room = Room()
+        room.init_fields("Room 1", 2)
+        other_room = Room()
+        other_room.init_fields("Room 2", 2)
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+
+        AbstractDAO.begin()
+        RoomDAO.save(room)
+        RoomDAO.save(other_room)
+        GuestDAO.save(guest)
+        AbstractDAO.commit()
+
+        ReservationService.create(
+            {
+                "room_id": room.id,
+                "guest_id": guest.id,
+                "start_date": (datetime.now(tz=pytz.utc) + timedelta(days=3)).isoformat("T"),
+                "end_date": (datetime.now(tz=pytz.utc) + timedelta(days=5)).isoformat("T"),
+                "amount_of_guests": 1
+            }
+        )
+        return room.id, other_room.id
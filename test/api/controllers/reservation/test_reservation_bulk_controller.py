@@ -0,0 +1,132 @@
+from datetime import datetime, timedelta
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ReservationService import ReservationService
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestReservationBulkController(TestAppBase):
+    def test_creating_several_reservations(self):
+        room_id, other_room_id, guest_id = self.__create_rooms_and_guest()
+
+        response = self.client.post(Routes.RESERVATIONS_BULK.value, json={"reservations": [
+            self.__build_item(room_id, guest_id, 2, 4),
+            self.__build_item(other_room_id, guest_id, 2, 4),
+            # Same room as the first one, right after it
+            self.__build_item(room_id, guest_id, 5, 7),
+        ]})
+
+        assert response.status_code == HttpStatuses.CREATED.value
+        assert [x["status"] for x in response.json] == [HttpStatuses.CREATED.value] * 3
+        assert [x["reservation"]["room_id"] for x in response.json] == [room_id, other_room_id, room_id]
+        assert len(ReservationService.get_all()) == 3
+
+        # The availability index picks up the created reservations
+        assert ReservationService.check_room_availability(
+            room_id, self.__get_date(5), self.__get_date(6)) is False
+
+    def test_nothing_is_created_if_any_reservation_fails(self):
+        room_id, _, guest_id = self.__create_rooms_and_guest()
+        self.__create_reservation(room_id, guest_id, 2, 4)
+
+        response = self.client.post(Routes.RESERVATIONS_BULK.value, json={"reservations": [
+            self.__build_item(room_id, guest_id, 6, 8),
+            # Conflicts with the reservation in the DB
+            self.__build_item(room_id, guest_id, 3, 5),
+        ]})
+
+        assert response.status_code == HttpStatuses.BAD_REQUEST.value
+        assert [x["status"] for x in response.json] == [HttpStatuses.BAD_REQUEST.value] * 2
+        assert len(ReservationService.get_all()) == 1
+
+    def test_creating_the_valid_reservations_only(self):
+        room_id, other_room_id, guest_id = self.__create_rooms_and_guest()
+        self.__create_reservation(room_id, guest_id, 2, 4)
+
+        response = self.client.post(Routes.RESERVATIONS_BULK.value, json={"all_or_nothing": False, "reservations": [
+            # Conflicts with the reservation in the DB
+            self.__build_item(room_id, guest_id, 3, 5),
+            self.__build_item(other_room_id, guest_id, 2, 4),
+            # Conflicts with the previous reservation in the request
+            self.__build_item(other_room_id, guest_id, 3, 5),
+            # Breaks the max stay rule
+            self.__build_item(room_id, guest_id, 6, 12),
+            # Room doesn't exist
+            self.__build_item(25, guest_id, 6, 8),
+            # Invalid values
+            {**self.__build_item(room_id, guest_id, 6, 8), "status": "UNKNOWN"},
+            # CANCELED reservations don't conflict with other reservations
+            {**self.__build_item(room_id, guest_id, 2, 4), "status": "CANCELED"},
+        ]})
+
+        assert response.status_code == HttpStatuses.MULTI_STATUS.value
+        assert [x["status"] for x in response.json] == [
+            HttpStatuses.BAD_REQUEST.value,
+            HttpStatuses.CREATED.value,
+            HttpStatuses.BAD_REQUEST.value,
+            HttpStatuses.BAD_REQUEST.value,
+            HttpStatuses.BAD_REQUEST.value,
+            HttpStatuses.BAD_REQUEST.value,
+            HttpStatuses.CREATED.value,
+        ]
+        assert "not available" in response.json[2]["message"]
+        assert response.json[6]["reservation"]["status"] == "CANCELED"
+        assert len(ReservationService.get_all()) == 3
+
+    def test_creating_reservations_with_an_invalid_body(self):
+        for body in ({}, {"reservations": []}, {"reservations": {}}, {"reservations": [{}], "unknown": 1},
+                     {"reservations": [{}], "all_or_nothing": "yes"}):
+            response = self.client.post(Routes.RESERVATIONS_BULK.value, json=body)
+            assert response.status_code == HttpStatuses.BAD_REQUEST.value, body
+
+    def __get_date(self, days_from_now: int) -> datetime:
+        """
+        :param days_from_now: amount of days from now
+        :return: datetime that many days from now
+        """
+        return datetime.now(tz=pytz.utc).replace(microsecond=0) + timedelta(days=days_from_now)
+
+    def __build_item(self, room_id: int, guest_id: int, start_day: int, end_day: int) -> dict:
+        """
+        :return: data of a reservation for the room and guest, between the given days from now
+        """
+        return {
+            "room_id": room_id,
+            "guest_id": guest_id,
+            "start_date": self.__get_date(start_day).isoformat(),
+            "end_date": self.__get_date(end_day).isoformat(),
+            "amount_of_guests": 1
+        }
+
+    def __create_reservation(self, room_id: int, guest_id: int, start_day: int, end_day: int):
+        """
+        Books the room for the guest between the given days from now
+        """
+        ReservationService.create(self.__build_item(room_id, guest_id, start_day, end_day))
+
+    def __create_rooms_and_guest(self) -> tuple[int, int, int]:
+        """
+        Creates 2 rooms and a guest
+        :return: returns the IDs of the created entities in a tuple. (room_id, other_room_id, guest_id)
+        """
+        room = Room()
+        room.init_fields("Room 1", 2)
+        other_room = Room()
+        other_room.init_fields("Room 2", 2)
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+
+        AbstractDAO.begin()
+        RoomDAO.save(room)
+        RoomDAO.save(other_room)
+        GuestDAO.save(guest)
+        AbstractDAO.commit()
+        return room.id, other_room.id, guest.id
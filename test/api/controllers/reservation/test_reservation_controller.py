@@ -0,0 +1,291 @@
+import json
+from datetime import datetime, timedelta
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.controllers.Streaming import Streaming
+from api.entities.HttpStatuses import HttpStatuses
+from api.entities.ReservationStatus import ReservationStatus
+from api.service.ReservationService import ReservationService
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.ReservationDAO import ReservationDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Reservation import Reservation
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestReservationController(TestAppBase):
+    def test_creating_a_reservation_validates_it_with_a_single_query(self):
+        room_id, guest_id = self.__create_room_and_guest()
+
+        # The room is locked, then the room, the guest and the overlapping reservations are all checked with a single
+        # query. The created reservation comes back from the INSERT instead of being fetched
+        with self.assert_query_count(3) as queries:
+            response = self.client.post(Routes.RESERVATIONS.value, json=self.__build_reservation(room_id, guest_id))
+
+        assert response.status_code == HttpStatuses.CREATED.value
+        assert "FOR UPDATE" in queries[0]
+        assert "FROM guest" in queries[1] and "EXISTS" in queries[1]
+        assert queries[2].startswith("INSERT INTO reservation")
+        assert response.json["id"] > 0
+        assert response.json["created_at"] is not None
+        assert response.json["status"] == "SCHEDULED"
+
+    def test_creating_a_reservation_for_missing_resources(self):
+        room_id, guest_id = self.__create_room_and_guest()
+
+        response = self.client.post(Routes.RESERVATIONS.value, json=self.__build_reservation(room_id + 1, guest_id))
+        assert response.status_code == HttpStatuses.BAD_REQUEST.value
+        assert f"Room with id {room_id + 1} does not exist" in response.json["message"]
+
+        response = self.client.post(Routes.RESERVATIONS.value, json=self.__build_reservation(room_id, guest_id + 1))
+        assert response.status_code == HttpStatuses.BAD_REQUEST.value
+        assert f"Guest with id {guest_id + 1} does not exist" in response.json["message"]
+
+    def test_updating_a_reservation(self):
+        room_id, guest_id = self.__create_room_and_guest()
+        reservation_id = ReservationService.create(self.__build_reservation(room_id, guest_id)).id
+        AbstractDAO.get_connection().remove()
+
+        # Only the updated_at set by the DB is fetched after the UPDATE, instead of the whole reservation
+        with self.assert_query_count(5):
+            response = self.client.put(
+                Routes.RESERVATIONS_BY_ID.value.replace("<int:reservation_id>", str(reservation_id)),
+                json={"amount_of_guests": 2}
+            )
+
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.json["amount_of_guests"] == 2
+
+    def test_polling_a_reservation_with_etags(self):
+        room_id, guest_id = self.__create_room_and_guest()
+        reservation_id = ReservationService.create(self.__build_reservation(room_id, guest_id)).id
+        AbstractDAO.get_connection().remove()
+        url = Routes.RESERVATIONS_BY_ID.value.replace("<int:reservation_id>", str(reservation_id))
+
+        response = self.client.get(url)
+        etag = response.headers["ETag"]
+
+        # Nothing changed, so the reservation isn't loaded: only its version is
+        with self.assert_query_count(1):
+            response = self.client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == HttpStatuses.NOT_MODIFIED.value
+
+        # Streamed lists have their own ETag. The stream is closed, so that its cursor doesn't outlive the test
+        response = self.client.get(Routes.RESERVATIONS.value)
+        headers = {"Accept": Streaming.NDJSON_MIMETYPE}
+        with self.client.get(Routes.RESERVATIONS.value, headers=headers) as streamed_response:
+            assert response.headers["ETag"] != streamed_response.headers["ETag"]
+
+        # Updating the reservation changes its ETag
+        assert self.client.put(url, json={"amount_of_guests": 2}).status_code == HttpStatuses.OK.value
+        response = self.client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.json["amount_of_guests"] == 2
+        assert response.headers["ETag"] != etag
+
+        assert self.client.get(url.replace(str(reservation_id), "999")).status_code == HttpStatuses.NOT_FOUND.value
+
+    def test_moving_a_reservation_to_a_missing_room(self):
+        room_id, guest_id = self.__create_room_and_guest()
+        reservation_id = ReservationService.create(self.__build_reservation(room_id, guest_id)).id
+
+        response = self.client.put(
+            Routes.RESERVATIONS_BY_ID.value.replace("<int:reservation_id>", str(reservation_id)),
+            json={"room_id": room_id + 1}
+        )
+
+        assert response.status_code == HttpStatuses.BAD_REQUEST.value
+        assert f"Room with id {room_id + 1} does not exist" in response.json["message"]
+        assert ReservationService.get_by_id(reservation_id).room_id == room_id
+
+    def test_filtering_reservations(self):
+        room_id, guest_id = self.__create_room_and_guest()
+        other_room_id, other_guest_id = self.__create_room_and_guest()
+        today = datetime(2021, 9, 1, tzinfo=pytz.utc)
+        reservation_ids = self.__create_reservations([
+            # Checked out yesterday morning
+            (room_id, guest_id, today - timedelta(days=3, hours=-12), today - timedelta(hours=12),
+             ReservationStatus.SCHEDULED),
+            # In house tonight
+            (room_id, other_guest_id, today + timedelta(hours=12), today + timedelta(days=2, hours=12),
+             ReservationStatus.SCHEDULED),
+            (other_room_id, guest_id, today - timedelta(days=1), today + timedelta(days=1),
+             ReservationStatus.SCHEDULED),
+            # Would have been in house tonight
+            (other_room_id, other_guest_id, today + timedelta(hours=14), today + timedelta(days=1),
+             ReservationStatus.CANCELED),
+            # Checks out this morning
+            (room_id, other_guest_id, today - timedelta(hours=10), today + timedelta(hours=10),
+             ReservationStatus.SCHEDULED),
+        ])
+
+        def get_reservation_ids(query_string: str) -> list[int]:
+            response = self.client.get(f"{Routes.RESERVATIONS.value}?{query_string}")
+            assert response.status_code == HttpStatuses.OK.value
+            return [reservation_ids.index(x["id"]) for x in response.json]
+
+        assert get_reservation_ids(f"room_id={room_id}") == [0, 1, 4]
+        assert get_reservation_ids(f"guest_id={guest_id}") == [0, 2]
+        assert get_reservation_ids(f"room_id={room_id}&guest_id={guest_id}") == [0]
+        assert get_reservation_ids("status=CANCELED") == [3]
+        assert get_reservation_ids("active_on=2021-09-01") == [1, 2, 3, 4]
+        assert get_reservation_ids("active_on=2021-09-01&status=SCHEDULED") == [1, 2, 4]
+        assert get_reservation_ids("in_house_on=2021-09-01&status=SCHEDULED") == [1, 2]
+        assert get_reservation_ids("in_house_on=2021-08-31") == [2, 4]
+        assert get_reservation_ids("starts_before=2021-09-01T00:00:00%2B00:00") == [0, 2, 4]
+        assert get_reservation_ids("ends_after=2021-09-02T00:00:00%2B00:00") == [1]
+
+        # Filters are kept in the link to the next page
+        response = self.client.get(f"{Routes.RESERVATIONS.value}?active_on=2021-09-01&limit=1")
+        assert "active_on=2021-09-01" in response.headers["Link"]
+
+    def test_streaming_reservations(self):
+        room_id, guest_id = self.__create_room_and_guest()
+        other_room_id, _ = self.__create_room_and_guest()
+        start_date = datetime(2021, 9, 1, tzinfo=pytz.utc)
+        reservation_ids = self.__create_reservations([
+            (room_id if i % 2 else other_room_id, guest_id, start_date + timedelta(days=i),
+             start_date + timedelta(days=i, hours=12), ReservationStatus.SCHEDULED)
+            for i in range(10)
+        ])
+
+        # Every reservation is streamed as a line of JSON, regardless of the page size
+        response = self.client.get(f"{Routes.RESERVATIONS.value}?limit=2",
+                                   headers={"Accept": Streaming.NDJSON_MIMETYPE})
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.mimetype == Streaming.NDJSON_MIMETYPE
+        assert [json.loads(x)["id"] for x in response.get_data(as_text=True).splitlines()] == reservation_ids
+
+        # Filters still apply
+        response = self.client.get(f"{Routes.RESERVATIONS.value}?room_id={room_id}",
+                                   headers={"Accept": Streaming.NDJSON_MIMETYPE})
+        assert [json.loads(x)["id"] for x in response.get_data(as_text=True).splitlines()] == reservation_ids[1::2]
+
+        # Regular JSON is preferred when the client accepts both
+        response = self.client.get(Routes.RESERVATIONS.value,
+                                   headers={"Accept": f"application/json, {Streaming.NDJSON_MIMETYPE}"})
+        assert response.mimetype == "application/json"
+        assert len(response.json) == 10
+
+    def test_streaming_a_sparse_fieldset_of_the_reservations(self):
+        room_id, guest_id = self.__create_room_and_guest()
+        start_date = datetime(2021, 9, 1, tzinfo=pytz.utc)
+        reservation_ids = self.__create_reservations([
+            (room_id, guest_id, start_date + timedelta(days=i), start_date + timedelta(days=i, hours=12),
+             ReservationStatus.SCHEDULED)
+            for i in range(3)
+        ])
+
+        response = self.client.get(f"{Routes.RESERVATIONS.value}?fields=status,start_date",
+                                   headers={"Accept": Streaming.NDJSON_MIMETYPE})
+        assert response.status_code == HttpStatuses.OK.value
+        assert [json.loads(x) for x in response.get_data(as_text=True).splitlines()] == [
+            {"id": x, "status": ReservationStatus.SCHEDULED.value,
+             "start_date": (start_date + timedelta(days=i)).isoformat()}
+            for i, x in enumerate(reservation_ids)
+        ]
+
+    def test_filtering_reservations_with_invalid_values(self):
+        for query_string in ("room_id=abc", "room_id=%C2%B2", "guest_id=0", "status=ACTIVE", "active_on=tonight",
+                             "in_house_on=2021-09-31",
+                             "starts_before=2021-09-01", "ends_after=2021-09-01T00:00:00"):
+            response = self.client.get(f"{Routes.RESERVATIONS.value}?{query_string}")
+            assert response.status_code == HttpStatuses.BAD_REQUEST.value, query_string
+
+    def test_syncing_the_reservations_deleted_along_with_their_room_and_guest(self):
+        room_id, guest_id = self.__create_room_and_guest()
+        other_room_id, other_guest_id = self.__create_room_and_guest()
+        start_date = datetime(2021, 9, 1, tzinfo=pytz.utc)
+        reservation_ids = self.__create_reservations([
+            (room_id, guest_id, start_date, start_date + timedelta(days=1), ReservationStatus.SCHEDULED),
+            (other_room_id, other_guest_id, start_date, start_date + timedelta(days=1), ReservationStatus.SCHEDULED),
+            (other_room_id, guest_id, start_date + timedelta(days=2), start_date + timedelta(days=3),
+             ReservationStatus.SCHEDULED),
+        ])
+
+        response = self.client.get(Routes.RESERVATIONS_CHANGES.value)
+        assert [x["id"] for x in response.json["changes"]] == reservation_ids
+        cursor = response.json["cursor"]
+
+        # Deleting a room or a guest deletes their reservations, which leave tombstones behind as well
+        self.client.delete(f"{Routes.ROOMS.value}/{room_id}")
+        self.client.delete(f"{Routes.GUESTS.value}/{other_guest_id}")
+        response = self.client.get(f"{Routes.RESERVATIONS_CHANGES.value}?since={cursor}")
+        assert response.json["changes"] == []
+        assert [x["id"] for x in response.json["deletions"]] == reservation_ids[:2]
+
+        response = self.client.get(Routes.ROOMS_CHANGES.value)
+        assert [x["id"] for x in response.json["deletions"]] == [room_id]
+        response = self.client.get(Routes.GUESTS_CHANGES.value)
+        assert [x["id"] for x in response.json["deletions"]] == [other_guest_id]
+
+    def test_fetched_entities_are_reloaded_after_a_commit(self):
+        room_id, _ = self.__create_room_and_guest()
+
+        with self.assert_query_count(1):
+            room = RoomDAO.get(room_id)
+            assert RoomDAO.get(room_id) is room
+
+        AbstractDAO.begin()
+        room.name = "Room 2"
+        AbstractDAO.commit()
+
+        # The commit drops the memoized room, so it's loaded again
+        with self.assert_query_count(1):
+            assert RoomDAO.get(room_id).name == "Room 2"
+
+    def __build_reservation(self, room_id: int, guest_id: int) -> dict:
+        """
+        :return: data of a reservation for the room and guest, 3 to 5 days from now
+        """
+        return {
+            "room_id": room_id,
+            "guest_id": guest_id,
+            "start_date": (datetime.now(tz=pytz.utc) + timedelta(days=3)).isoformat(),
+            "end_date": (datetime.now(tz=pytz.utc) + timedelta(days=5)).isoformat(),
+            "amount_of_guests": 1
+        }
+
+    def __create_reservations(self, reservations: list[tuple]) -> list[int]:
+        """
+        Creates the reservations straight through the DAO, so that they can be in the past
+        :param reservations: list of (room_id, guest_id, start_date, end_date, status) tuples
+        :return: IDs of the created reservations, in the same order
+        """
+        entities = []
+        for room_id, guest_id, start_date, end_date, status in reservations:
+            reservation = Reservation()
+            reservation.init_fields(room_id, guest_id, start_date, end_date, 1, status)
+            entities.append(reservation)
+
+        AbstractDAO.begin()
+        for reservation in entities:
+            ReservationDAO.save(reservation)
+            AbstractDAO.flush()
+        AbstractDAO.commit()
+        return [x.id for x in entities]
+
+    def __create_room_and_guest(self) -> tuple[int, int]:
+        """
+        Creates a room and a guest. Then, the session is dropped (like at the end of a request), so that the tests
+        start from a clean slate
+        :return: returns the IDs of the created resources in a tuple. (room_id, guest_id)
+        """
+        room = Room()
+        room.init_fields("Room 1", 2)
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+
+        AbstractDAO.begin()
+        RoomDAO.save(room)
+        GuestDAO.save(guest)
+        AbstractDAO.commit()
+
+        room_id, guest_id = room.id, guest.id
+        AbstractDAO.get_connection().remove()
+        return room_id, guest_id
@@ -0,0 +1,118 @@
+from datetime import datetime, time, timedelta
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.ReservationService import ReservationService
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestRoomCalendarController(TestAppBase):
+    def test_fetching_the_calendar_of_a_room(self):
+        room_id, _, guest_id = self.__create_rooms_and_guest()
+        # Books the nights 3 to 5 days from now
+        self.__create_reservation(room_id, guest_id, 3, 5)
+
+        response = self.client.get(Routes.ROOMS_CALENDAR_BY_ID.value.replace("<int:room_id>", str(room_id)))
+
+        assert response.status_code == HttpStatuses.OK.value
+        calendar = response.json
+        today = datetime.now(tz=pytz.utc).date()
+        assert calendar["room_id"] == room_id
+        assert calendar["start_date"] == today.isoformat()
+        assert calendar["end_date"] == calendar["nights"][-1]["date"]
+        assert calendar["nights"][1]["date"] == (today + timedelta(days=1)).isoformat()
+        assert [i for i, x in enumerate(calendar["nights"]) if not x["is_available"]] == [3, 4, 5]
+
+    def test_calendar_follows_reservation_changes(self):
+        room_id, _, guest_id = self.__create_rooms_and_guest()
+        reservation_id = self.__create_reservation(room_id, guest_id, 3, 5)
+        route = Routes.ROOMS_CALENDAR_BY_ID.value.replace("<int:room_id>", str(room_id))
+
+        # Loads the calendar in memory, so that the following changes have to update it
+        self.client.get(route)
+        other_reservation_id = self.__create_reservation(room_id, guest_id, 10, 11)
+        response = self.client.get(route)
+        assert [i for i, x in enumerate(response.json["nights"]) if not x["is_available"]] == [3, 4, 5, 10, 11]
+
+        ReservationService.delete(reservation_id)
+        ReservationService.update(other_reservation_id, {
+            "start_date": self.__get_date(20).isoformat(),
+            "end_date": self.__get_date(21).isoformat(),
+        })
+        response = self.client.get(route)
+        assert [i for i, x in enumerate(response.json["nights"]) if not x["is_available"]] == [20, 21]
+
+    def test_fetching_the_calendar_of_several_rooms(self):
+        room_id, other_room_id, guest_id = self.__create_rooms_and_guest()
+        self.__create_reservation(room_id, guest_id, 3, 5)
+
+        response = self.client.get(f"{Routes.ROOMS_CALENDAR.value}?room_ids={other_room_id},{room_id}")
+
+        assert response.status_code == HttpStatuses.OK.value
+        assert [x["room_id"] for x in response.json] == [other_room_id, room_id]
+        assert all(x["is_available"] for x in response.json[0]["nights"])
+        assert [i for i, x in enumerate(response.json[1]["nights"]) if not x["is_available"]] == [3, 4, 5]
+
+    def test_fetching_the_calendar_of_missing_rooms(self):
+        room_id, _, _ = self.__create_rooms_and_guest()
+
+        response = self.client.get(Routes.ROOMS_CALENDAR_BY_ID.value.replace("<int:room_id>", "25"))
+        assert response.status_code == HttpStatuses.NOT_FOUND.value
+
+        response = self.client.get(f"{Routes.ROOMS_CALENDAR.value}?room_ids={room_id},25")
+        assert response.status_code == HttpStatuses.NOT_FOUND.value
+
+    def test_fetching_the_calendar_with_invalid_room_ids(self):
+        for query in ("", "?room_ids=", "?room_ids=1,abc", "?room_ids=%C2%B2", "?room_ids=0", "?room_ids=1&guests=2",
+                      "?room_ids=" + ",".join(str(x) for x in range(1, 202))):
+            response = self.client.get(f"{Routes.ROOMS_CALENDAR.value}{query}")
+            assert response.status_code == HttpStatuses.BAD_REQUEST.value, query
+
+    def __get_date(self, days_from_today: int) -> datetime:
+        """
+        :param days_from_today: amount of days from today (in UTC)
+        :return: noon of that day, in UTC
+        """
+        return datetime.combine(datetime.now(tz=pytz.utc).date() + timedelta(days=days_from_today), time(12),
+                                tzinfo=pytz.utc)
+
+    def __create_reservation(self, room_id: int, guest_id: int, start_day: int, end_day: int) -> int:
+        """
+        Books a room from noon of the start day until noon of the end day (in days from today)
+        :return: id of the created reservation
+        """
+        return ReservationService.create(
+            {
+                "room_id": room_id,
+                "guest_id": guest_id,
+                "start_date": self.__get_date(start_day).isoformat(),
+                "end_date": self.__get_date(end_day).isoformat(),
+                "amount_of_guests": 1
+            }
+        ).id
+
+    def __create_rooms_and_guest(self) -> tuple[int, int, int]:
+        """
+        Creates 2 rooms and a guest
+        :return: returns the IDs of the created entities in a tuple. (room_id, other_room_id, guest_id)
+        """
+        room = Room()
+        room.init_fields("Room 1", 2)
+        other_room = Room()
+        other_room.init_fields("Room 2", 2)
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+
+        AbstractDAO.begin()
+        RoomDAO.save(room)
+        RoomDAO.save(other_room)
+        GuestDAO.save(guest)
+        AbstractDAO.commit()
+        return room.id, other_room.id, guest.id
@@ -0,0 +1,98 @@
+from sqlalchemy import insert
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from db.ConnectionManager import ConnectionManager
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestRoomChangesController(TestAppBase):
+    def test_syncing_the_changes_of_the_rooms(self):
+        room_ids = [self.__create_room(f"Room {i}") for i in range(3)]
+
+        # The first sync lists every room
+        response = self.client.get(Routes.ROOMS_CHANGES.value)
+        assert response.status_code == HttpStatuses.OK.value
+        assert [x["id"] for x in response.json["changes"]] == room_ids
+        assert response.json["deletions"] == []
+        assert not response.json["has_more"]
+        cursor = response.json["cursor"]
+
+        # Nothing changed since then
+        response = self.client.get(f"{Routes.ROOMS_CHANGES.value}?since={cursor}")
+        assert response.json["changes"] == [] and response.json["deletions"] == []
+        assert response.json["cursor"] == cursor
+
+        # Only the rooms that were updated, created or deleted since the last sync are listed, in the order they changed
+        self.client.put(f"{Routes.ROOMS.value}/{room_ids[1]}", json={"name": "Suite"})
+        new_room_id = self.__create_room("Room 3")
+        assert self.client.delete(f"{Routes.ROOMS.value}/{room_ids[0]}").status_code == HttpStatuses.NO_CONTENT.value
+
+        # The query reads the changes from the index, past the cursor
+        with self.assert_query_count(2) as queries:
+            response = self.client.get(f"{Routes.ROOMS_CHANGES.value}?since={cursor}")
+        assert [(x["id"], x["name"]) for x in response.json["changes"]] == [(room_ids[1], "Suite"),
+                                                                            (new_room_id, "Room 3")]
+        assert [x["id"] for x in response.json["deletions"]] == [room_ids[0]]
+        assert "deleted_at" in response.json["deletions"][0]
+        assert "pg_snapshot_xmin" in queries[0] and "ORDER BY room.xact_id, room.id" in queries[0]
+        cursor = response.json["cursor"]
+
+        response = self.client.get(f"{Routes.ROOMS_CHANGES.value}?since={cursor}")
+        assert response.json["changes"] == [] and response.json["deletions"] == []
+
+    def test_syncing_the_changes_of_the_rooms_a_page_at_a_time(self):
+        room_ids = [self.__create_room(f"Room {i}") for i in range(5)]
+        for room_id in room_ids[:3]:
+            self.client.delete(f"{Routes.ROOMS.value}/{room_id}")
+
+        changed_room_ids = []
+        deleted_room_ids = []
+        url = f"{Routes.ROOMS_CHANGES.value}?limit=2"
+        while True:
+            response = self.client.get(url)
+            assert len(response.json["changes"]) <= 2 and len(response.json["deletions"]) <= 2
+            changed_room_ids.extend(x["id"] for x in response.json["changes"])
+            deleted_room_ids.extend(x["id"] for x in response.json["deletions"])
+            url = f"{Routes.ROOMS_CHANGES.value}?limit=2&since={response.json['cursor']}"
+            if not response.json["has_more"]:
+                break
+
+        assert changed_room_ids == room_ids[3:]
+        assert deleted_room_ids == room_ids[:3]
+
+    def test_changes_of_running_transactions_are_not_skipped(self):
+        # A slow transaction writes a room, and a later one writes another room and commits before it
+        with ConnectionManager().get_engine().connect() as connection:
+            transaction = connection.begin()
+            connection.execute(insert(Room.__table__).values(name="Room 1", capacity=2))
+            room_id = self.__create_room("Room 2")
+
+            # The room of the later transaction is held back until the slow one is done, since it could still commit
+            # changes that come before it
+            response = self.client.get(Routes.ROOMS_CHANGES.value)
+            assert response.json["changes"] == []
+            transaction.commit()
+
+        response = self.client.get(f"{Routes.ROOMS_CHANGES.value}?since={response.json['cursor']}")
+        assert [x["name"] for x in response.json["changes"]] == ["Room 1", "Room 2"]
+        assert response.json["changes"][1]["id"] == room_id
+
+    def test_syncing_with_invalid_parameters(self):
+        for query_string in ("since=not-a-cursor", "since=", "since=WyJhIiwxXQ", "after=1", "limit=0"):
+            response = self.client.get(f"{Routes.ROOMS_CHANGES.value}?{query_string}")
+            assert response.status_code == HttpStatuses.BAD_REQUEST.value, query_string
+
+        # A cursor of the first sync, without changes nor deletions, is valid
+        response = self.client.get(f"{Routes.ROOMS_CHANGES.value}?since=W251bGwsbnVsbF0")
+        assert response.status_code == HttpStatuses.OK.value
+
+    def __create_room(self, name: str) -> int:
+        """
+        :param name: name of the room
+        :return: id of the created room
+        """
+        response = self.client.post(Routes.ROOMS.value, json={"name": name, "capacity": 2})
+        assert response.status_code == HttpStatuses.CREATED.value
+        return response.json["id"]
@@ -0,0 +1,227 @@
+import re
+import zlib
+from unittest import mock
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.EntityCache import EntityCache
+from api.service.ResponseCache import ResponseCache
+from config.JSONSerializer import JSONSerializer
+from db.AbstractDAO import AbstractDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+from utils.LocalInvalidationBus import LocalInvalidationBus
+
+
+class TestRoomController(TestAppBase):
+    def test_listing_rooms_a_page_at_a_time(self):
+        room_ids = self.__create_rooms(5)
+
+        listed_room_ids = []
+        url = f"{Routes.ROOMS.value}?limit=2"
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == HttpStatuses.OK.value
+            assert len(response.json) <= 2
+            listed_room_ids.extend(x["id"] for x in response.json)
+
+            # The next page is linked until the last one
+            next_link = re.match(r'<(.+)>; rel="next"', response.headers.get("Link", ""))
+            url = next_link.group(1) if next_link else None
+
+        assert listed_room_ids == room_ids
+
+    def test_listing_rooms_with_the_default_page_size(self):
+        room_ids = self.__create_rooms(3)
+
+        response = self.client.get(Routes.ROOMS.value)
+
+        assert response.status_code == HttpStatuses.OK.value
+        assert [x["id"] for x in response.json] == room_ids
+        assert "Link" not in response.headers
+
+    def test_listing_rooms_with_invalid_parameters(self):
+        self.__create_rooms(1)
+
+        for query_string in ("limit=0", "limit=abc", "limit=%C2%B2", "after=not-a-cursor", "after=", "after=wrI",
+                             "page=2"):
+            response = self.client.get(f"{Routes.ROOMS.value}?{query_string}")
+            assert response.status_code == HttpStatuses.BAD_REQUEST.value, query_string
+
+    def test_listing_rooms_with_a_sparse_fieldset(self):
+        room_ids = self.__create_rooms(2)
+
+        # Only the requested columns are selected, and the id is always included. The first query gets the version of
+        # the page (see test_polling_rooms_with_etags)
+        with self.assert_query_count(2) as queries:
+            response = self.client.get(f"{Routes.ROOMS.value}?fields=name")
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.json == [{"id": room_ids[0], "name": "Room 0"}, {"id": room_ids[1], "name": "Room 1"}]
+        assert "room.name" in queries[1]
+        assert "room.capacity" not in queries[1] and "room.created_at" not in queries[1]
+
+        # Single rooms can be trimmed as well
+        response = self.client.get(f"{Routes.ROOMS.value}/{room_ids[0]}?fields=capacity,is_active")
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.json == {"id": room_ids[0], "capacity": 2, "is_active": True}
+
+        for query_string in ("fields=name,price", "fields=", "fields=room_ids"):
+            response = self.client.get(f"{Routes.ROOMS.value}?{query_string}")
+            assert response.status_code == HttpStatuses.BAD_REQUEST.value, query_string
+
+    def test_polling_rooms_with_etags(self):
+        room_ids = self.__create_rooms(3)
+
+        response = self.client.get(Routes.ROOMS.value)
+        etag = response.headers["ETag"]
+
+        # Nothing changed, so the page is answered from memory (see test_caching_pages_of_rooms)
+        with self.assert_query_count(0):
+            response = self.client.get(Routes.ROOMS.value, headers={"If-None-Match": etag})
+        assert response.status_code == HttpStatuses.NOT_MODIFIED.value
+        assert response.headers["ETag"] == etag
+        assert not response.data
+
+        # Even without the page in memory, the rooms aren't loaded again: only their version is
+        ResponseCache().clear()
+        with self.assert_query_count(1) as queries:
+            response = self.client.get(Routes.ROOMS.value, headers={"If-None-Match": etag})
+        assert response.status_code == HttpStatuses.NOT_MODIFIED.value
+        assert "count" in queries[0]
+
+        # The ETag depends on the query parameters as well
+        response = self.client.get(f"{Routes.ROOMS.value}?fields=name", headers={"If-None-Match": etag})
+        assert response.status_code == HttpStatuses.OK.value
+
+        # Updates, creates and deletes change the ETag
+        for method, url, body in ((self.client.put, f"{Routes.ROOMS.value}/{room_ids[0]}", {"capacity": 3}),
+                                  (self.client.post, Routes.ROOMS.value, {"name": "Room 3"}),
+                                  (self.client.delete, f"{Routes.ROOMS.value}/{room_ids[1]}", None)):
+            assert method(url, json=body).status_code < 300
+            response = self.client.get(Routes.ROOMS.value, headers={"If-None-Match": etag})
+            assert response.status_code == HttpStatuses.OK.value, url
+            assert response.headers["ETag"] != etag
+            etag = response.headers["ETag"]
+
+        # Single rooms have their own ETag
+        url = f"{Routes.ROOMS.value}/{room_ids[0]}"
+        response = self.client.get(url)
+        assert response.json["capacity"] == 3
+        response = self.client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+        assert response.status_code == HttpStatuses.NOT_MODIFIED.value
+
+    def test_fetching_rooms_from_the_cache(self):
+        room_ids = self.__create_rooms(2)
+        url = f"{Routes.ROOMS.value}/{room_ids[0]}"
+
+        # The room is loaded once. Then, it's sent from memory, along with the ETag of the copy being sent
+        room_response = self.client.get(url)
+        with self.assert_query_count(0):
+            cached_response = self.client.get(url)
+            assert self.client.get(url, headers={"If-None-Match": room_response.headers["ETag"]}).status_code == \
+                HttpStatuses.NOT_MODIFIED.value
+        assert cached_response.json == room_response.json
+        assert cached_response.headers["ETag"] == room_response.headers["ETag"]
+        assert EntityCache().get_stats()["room"]["hits"] == 2
+
+        # Checking the availability of a cached room doesn't look it up either: only its reservations are loaded
+        with self.assert_query_count(1) as queries:
+            response = self.client.get(f"{Routes.ROOMS_CALENDAR.value}?room_ids={room_ids[0]}")
+        assert response.status_code == HttpStatuses.OK.value
+        assert "FROM reservation" in queries[0] and "FROM room" not in queries[0]
+
+        # Updating the room invalidates it, so its next lookup loads it again
+        self.client.put(url, json={"name": "Suite"})
+        with self.assert_query_count(1):
+            updated_response = self.client.get(url)
+        assert updated_response.json["name"] == "Suite"
+        assert updated_response.headers["ETag"] != room_response.headers["ETag"]
+
+        # Writes from other workers that weren't published (i.e. the bus was down) are only seen once the room expires,
+        # but the ETag always matches the body sent with it, so clients aren't stuck with an old body
+        AbstractDAO.begin()
+        RoomDAO.get(room_ids[0]).name = "Penthouse"
+        AbstractDAO.commit()
+        stale_response = self.client.get(url)
+        assert stale_response.json["name"] == "Suite"
+        assert stale_response.headers["ETag"] == updated_response.headers["ETag"]
+        EntityCache().clear()
+        fresh_response = self.client.get(url, headers={"If-None-Match": stale_response.headers["ETag"]})
+        assert fresh_response.status_code == HttpStatuses.OK.value
+        assert fresh_response.json["name"] == "Penthouse"
+
+        # Deleting it as well
+        self.client.delete(url)
+        assert self.client.get(url).status_code == HttpStatuses.NOT_FOUND.value
+        assert self.client.get(f"{Routes.ROOMS_CALENDAR.value}?room_ids={room_ids[0]}").status_code == \
+            HttpStatuses.NOT_FOUND.value
+
+    def test_caching_pages_of_rooms(self):
+        room_ids = self.__create_rooms(30)
+        url = f"{Routes.ROOMS.value}?limit=20"
+        response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert response.content_encoding == "gzip"
+
+        # The page is sent again as it was, without loading, encoding nor compressing the rooms again
+        with self.assert_query_count(0), \
+                mock.patch.object(JSONSerializer, "jsonify", wraps=JSONSerializer.jsonify) as jsonify, \
+                mock.patch("zlib.compressobj", wraps=zlib.compressobj) as compressobj:
+            cached_response = self.client.get(url, headers={"Accept-Encoding": "gzip"})
+            uncompressed_response = self.client.get(url)
+        assert not jsonify.called and not compressobj.called
+        assert cached_response.get_data() == response.get_data()
+        assert cached_response.headers["ETag"] == response.headers["ETag"]
+        assert cached_response.headers["Link"] == response.headers["Link"]
+        assert cached_response.content_encoding == "gzip" and "Accept-Encoding" in cached_response.vary
+        assert uncompressed_response.content_encoding is None
+        assert [x["id"] for x in uncompressed_response.json] == room_ids[:20]
+        assert ResponseCache().get_stats()["room"]["hits"] == 2
+
+        # Pages are cached by URL
+        with self.assert_query_count(2):
+            assert [x["id"] for x in self.client.get(f"{Routes.ROOMS.value}?limit=10").json] == room_ids[:10]
+
+        # Writing a room drops the pages, since any of them could hold it
+        self.client.put(f"{Routes.ROOMS.value}/{room_ids[0]}", json={"name": "Suite"})
+        assert self.client.get(url).json[0]["name"] == "Suite"
+
+        # The same goes for the rooms written by other workers
+        other_worker = LocalInvalidationBus()
+        other_worker.start()
+        other_worker.publish([f"room:{room_ids[0]}"])
+        other_worker.stop()
+        with self.assert_query_count(2):
+            assert self.client.get(url).status_code == HttpStatuses.OK.value
+
+    def test_looking_up_missing_rooms(self):
+        room_id = self.__create_rooms(1)[0]
+        missing_url = f"{Routes.ROOMS.value}/{room_id + 1}"
+
+        # Once a room is found missing, lookups are answered without going to the DB for a while
+        with self.assert_query_count(1):
+            assert self.client.get(missing_url).status_code == HttpStatuses.NOT_FOUND.value
+        with self.assert_query_count(0):
+            assert self.client.get(missing_url).status_code == HttpStatuses.NOT_FOUND.value
+
+        # Until the id is taken by a new room
+        response = self.client.post(Routes.ROOMS.value, json={"name": "Suite", "capacity": 2})
+        assert response.json["id"] == room_id + 1
+        assert self.client.get(missing_url).json["name"] == "Suite"
+
+    def __create_rooms(self, amount: int) -> list[int]:
+        """
+        Creates the given amount of rooms
+        :return: IDs of the created rooms, in ascending order
+        """
+        rooms = []
+        for i in range(amount):
+            room = Room()
+            room.init_fields(f"Room {i}", 2)
+            rooms.append(room)
+
+        AbstractDAO.begin()
+        for room in rooms:
+            RoomDAO.save(room)
+        AbstractDAO.commit()
+        return sorted(x.id for x in rooms)
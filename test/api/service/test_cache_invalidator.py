@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from api.service.EntityCache import EntityCache
+from api.service.ReservationService import ReservationService
+from api.service.RoomAvailabilityIndex import RoomAvailabilityIndex
+from db.ReservationDAO import ReservationDAO
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+from utils.InvalidationBus import InvalidationBus
+from utils.LocalInvalidationBus import LocalInvalidationBus
+
+
+class TestCacheInvalidator(TestAppBase):
+    def setUp(self):
+        super().setUp()
+        # Stands for another worker, sharing the bus with the app
+        self.__other_worker = LocalInvalidationBus()
+        self.__published_keys = []
+        self.__other_worker.subscribe(self.__published_keys.extend)
+        self.__other_worker.start()
+
+    def tearDown(self):
+        self.__other_worker.stop()
+        super().tearDown()
+
+    def test_writes_are_published_to_the_other_workers(self):
+        room_id = self.client.post(Routes.ROOMS.value, json={"name": "Room 1", "capacity": 2}).json["id"]
+        guest_id = self.client.post(Routes.GUESTS.value, json={"document": "123", "first_name": "Jorge",
+                                                               "last_name": "Ocampo"}).json["id"]
+        # The ids of new entities may have been looked up while they were missing
+        assert self.__pop_published_keys() == [f"room:{room_id}", f"guest:{guest_id}"]
+
+        self.client.put(f"{Routes.ROOMS.value}/{room_id}", json={"name": "Suite"})
+        self.client.put(f"{Routes.GUESTS.value}/{guest_id}", json={"first_name": "Jorge Luis"})
+        assert self.__pop_published_keys() == [f"room:{room_id}", f"guest:{guest_id}"]
+
+        reservation_id = self.client.post(Routes.RESERVATIONS.value, json=self.__build_reservation(room_id, guest_id))\
+            .json["id"]
+        self.client.put(f"{Routes.RESERVATIONS.value}/{reservation_id}", json={"amount_of_guests": 2})
+        assert self.__pop_published_keys() == [f"room_reservations:{room_id}", f"reservation:{reservation_id}",
+                                               f"room_reservations:{room_id}"]
+
+        self.client.delete(f"{Routes.GUESTS.value}/{guest_id}")
+        assert self.__pop_published_keys() == [f"guest:{guest_id}", f"room_reservations:{room_id}"]
+
+        self.client.delete(f"{Routes.ROOMS.value}/{room_id}")
+        assert self.__pop_published_keys() == [f"room:{room_id}", f"room_reservations:{room_id}"]
+
+    def test_writes_of_the_other_workers_are_dropped_from_the_caches(self):
+        room_id = self.client.post(Routes.ROOMS.value, json={"name": "Room 1", "capacity": 2}).json["id"]
+        guest_id = self.client.post(Routes.GUESTS.value, json={"document": "123", "first_name": "Jorge",
+                                                               "last_name": "Ocampo"}).json["id"]
+        self.__load_caches(room_id, guest_id)
+
+        self.__other_worker.publish([f"room:{room_id}"])
+        assert EntityCache().get_cached_ids(Room, {room_id}) == set()
+        assert RoomAvailabilityIndex().get_stats()["size"] == 1
+
+        self.__other_worker.publish([f"guest:{guest_id}", f"room_reservations:{room_id}"])
+        assert EntityCache().get_cached_ids(Guest, {guest_id}) == set()
+        assert RoomAvailabilityIndex().get_stats()["size"] == 0
+
+        # Everything is dropped when the other workers' messages may have been missed
+        self.__load_caches(room_id, guest_id)
+        self.__other_worker.publish([InvalidationBus.ALL])
+        assert EntityCache().get_cached_ids(Room, {room_id}) == set()
+        assert EntityCache().get_cached_ids(Guest, {guest_id}) == set()
+        assert RoomAvailabilityIndex().get_stats()["size"] == 0
+
+        # The workers that made the writes don't drop their own caches, since they already updated them
+        self.__load_caches(room_id, guest_id)
+        assert self.client.post(Routes.RESERVATIONS.value, json=self.__build_reservation(room_id, guest_id))\
+            .status_code == HttpStatuses.CREATED.value
+        assert RoomAvailabilityIndex().get_stats()["size"] == 1
+
+    def test_rooms_loaded_while_everything_is_dropped_are_not_kept(self):
+        room_id = self.client.post(Routes.ROOMS.value, json={"name": "Room 1", "capacity": 2}).json["id"]
+        now = datetime.now(tz=pytz.utc)
+
+        # The other workers' messages may have been missed while the room was being loaded, so it may be stale
+        get_scheduled_reservation_spans = ReservationDAO.get_scheduled_reservation_spans
+
+        def load_and_drop_everything(room_ids):
+            spans = get_scheduled_reservation_spans(room_ids)
+            self.__other_worker.publish([InvalidationBus.ALL])
+            return spans
+
+        with mock.patch.object(ReservationDAO, "get_scheduled_reservation_spans", load_and_drop_everything):
+            assert ReservationService.check_room_availability(room_id, now, now + timedelta(days=1))
+        assert RoomAvailabilityIndex().get_stats()["size"] == 0
+
+        # Neither is the answer given from it
+        assert ReservationService.check_room_availability(room_id, now, now + timedelta(days=1))
+        stats = RoomAvailabilityIndex().get_answer_stats()
+        assert (stats["hits"], stats["misses"]) == (0, 1)
+        assert RoomAvailabilityIndex().get_stats()["size"] == 1
+
+    def __load_caches(self, room_id: int, guest_id: int):
+        """
+        Loads the room, the guest and the reservations of the room into the caches
+        """
+        assert self.client.get(f"{Routes.ROOMS.value}/{room_id}").status_code == HttpStatuses.OK.value
+        assert self.client.get(f"{Routes.GUESTS.value}/{guest_id}").status_code == HttpStatuses.OK.value
+        now = datetime.now(tz=pytz.utc)
+        assert ReservationService.check_room_availability(room_id, now, now + timedelta(days=1))
+        assert EntityCache().get_cached_ids(Room, {room_id}) == {room_id}
+        assert EntityCache().get_cached_ids(Guest, {guest_id}) == {guest_id}
+        assert RoomAvailabilityIndex().get_stats()["size"] == 1
+
+    def __pop_published_keys(self) -> list[str]:
+        """
+        :return: keys published to the other worker since the last call
+        """
+        published_keys = list(self.__published_keys)
+        self.__published_keys.clear()
+        return published_keys
+
+    def __build_reservation(self, room_id: int, guest_id: int) -> dict:
+        """
+        :return: data of a reservation for the room and guest, 3 to 5 days from now
+        """
+        return {
+            "room_id": room_id,
+            "guest_id": guest_id,
+            "start_date": (datetime.now(tz=pytz.utc) + timedelta(days=3)).isoformat(),
+            "end_date": (datetime.now(tz=pytz.utc) + timedelta(days=5)).isoformat(),
+            "amount_of_guests": 1
+        }
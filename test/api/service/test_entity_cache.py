@@ -0,0 +1,105 @@
+import dataclasses
+from datetime import datetime
+
+import pytest
+import pytz
+from sqlalchemy.exc import NoResultFound
+
+from api.service.EntityCache import EntityCache
+from config.JSONSerializer import JSONSerializer
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+
+
+class TestEntityCache:
+    def setup_method(self):
+        EntityCache().clear()
+
+    def teardown_method(self):
+        EntityCache().clear()
+
+    def test_entities_are_loaded_once(self):
+        loads = []
+        room = self.__build_room(1)
+
+        def load_room():
+            loads.append(room.id)
+            return room
+
+        first_snapshot = EntityCache().get(Room, 1, load_room)
+        second_snapshot = EntityCache().get(Room, 1, load_room)
+
+        assert loads == [1]
+        assert first_snapshot is second_snapshot
+        assert EntityCache().get_stats()["room"] == {"size": 1, "max_size": 4096, "hits": 1, "misses": 1,
+                                                     "evictions": 0}
+        # Rooms and guests are cached apart
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+        guest.id = 1
+        assert EntityCache().get(Guest, 1, lambda: guest).first_name == "Jorge"
+        assert EntityCache().get_cached_ids(Room, {1, 2}) == {1}
+
+    def test_snapshots_are_immutable_and_serialize_like_the_entities(self):
+        room = self.__build_room(1)
+        snapshot = EntityCache().get(Room, 1, lambda: room)
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            snapshot.name = "Suite"
+        # The snapshot is a copy, so it isn't affected by changes to the entity either
+        room.name = "Suite"
+        assert snapshot.name == "Room 1"
+        room.name = "Room 1"
+        assert JSONSerializer.dumps(snapshot) == JSONSerializer.dumps(room)
+
+    def test_invalidating_entities(self):
+        EntityCache().get(Room, 1, lambda: self.__build_room(1))
+        EntityCache().invalidate(Room, 1)
+        assert EntityCache().get_cached_ids(Room, {1}) == set()
+
+        # An entity that is invalidated while it's being loaded may be outdated, so it isn't cached
+        def load_room_while_it_changes():
+            EntityCache().invalidate(Room, 1)
+            return self.__build_room(1)
+
+        assert EntityCache().get(Room, 1, load_room_while_it_changes).id == 1
+        assert EntityCache().get_cached_ids(Room, {1}) == set()
+
+    def test_missing_entities_are_remembered_until_they_are_invalidated(self):
+        loads = []
+
+        def load_missing_room():
+            loads.append(1)
+            raise NoResultFound()
+
+        for _ in range(2):
+            with pytest.raises(NoResultFound):
+                EntityCache().get(Room, 1, load_missing_room)
+        assert loads == [1]
+        # Lookups that don't load the entity itself know it's missing too
+        assert EntityCache().find(Room, 1, lambda: loads.append(1)) is None
+        assert loads == [1]
+        assert EntityCache().get_missing_stats()["room"]["hits"] == 2
+
+        # i.e. once the room is created
+        EntityCache().invalidate(Room, 1)
+        assert EntityCache().get(Room, 1, lambda: self.__build_room(1)).id == 1
+
+        # Other errors aren't remembered
+        def fail_to_load_room():
+            raise ValueError()
+
+        with pytest.raises(ValueError):
+            EntityCache().get(Room, 2, fail_to_load_room)
+        assert EntityCache().get(Room, 2, lambda: self.__build_room(2)).id == 2
+
+    def __build_room(self, room_id: int) -> Room:
+        """
+        :param room_id: id of the room
+        :return: room with all of its fields set
+        """
+        room = Room()
+        room.init_fields(f"Room {room_id}", 2)
+        room.id = room_id
+        room.created_at = datetime(2021, 9, 1, tzinfo=pytz.utc)
+        return room
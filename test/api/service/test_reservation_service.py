@@ -4,7 +4,9 @@ import pytest
 import pytz
 
 from api.entities.APIErrors import ReservationError
+from api.entities.ReservationStatus import ReservationStatus
 from api.service.ReservationService import ReservationService
+from api.service.RoomAvailabilityIndex import RoomAvailabilityIndex
 from db.AbstractDAO import AbstractDAO
 from db.GuestDAO import GuestDAO
 from db.RoomDAO import RoomDAO
@@ -26,7 +28,7 @@ class TestReservationService(TestAppBase):
                 "end_date": end_date.isoformat("T"),
                 "amount_of_guests": 1
             }
-        )
+        ).id
         assert isinstance(reservation_id, int)
         assert reservation_id > 0
 
@@ -43,7 +45,7 @@ class TestReservationService(TestAppBase):
                 "end_date": end_date.isoformat("T"),
                 "amount_of_guests": 1
             }
-        )
+        ).id
 
         start_date = datetime.now(tz=pytz.utc) + timedelta(days=4)
         end_date = datetime.now(tz=pytz.utc) + timedelta(days=5)
@@ -72,11 +74,100 @@ class TestReservationService(TestAppBase):
                 "end_date": end_date.isoformat("T"),
                 "amount_of_guests": 1
             }
-        )
+        ).id
 
         assert isinstance(reservation_id2, int)
         assert reservation_id2 > 0
 
+    def test_updating_a_reservation_into_a_conflict(self):
+        guest_id, room_id = self.__create_reservation_prerequisites()
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=3)
+        end_date = datetime.now(tz=pytz.utc) + timedelta(days=5)
+        ReservationService.create(
+            {
+                "room_id": room_id,
+                "guest_id": guest_id,
+                "start_date": start_date.isoformat("T"),
+                "end_date": end_date.isoformat("T"),
+                "amount_of_guests": 1
+            }
+        )
+        reservation_id = ReservationService.create(
+            {
+                "room_id": room_id,
+                "guest_id": guest_id,
+                "start_date": (start_date + timedelta(days=3)).isoformat("T"),
+                "end_date": (end_date + timedelta(days=3)).isoformat("T"),
+                "amount_of_guests": 1
+            }
+        ).id
+
+        # Moving the second reservation on top of the first one should FAIL, and leave the reservation untouched
+        with pytest.raises(ReservationError):
+            ReservationService.update(reservation_id, {"start_date": (start_date + timedelta(days=1)).isoformat("T")})
+
+        assert ReservationService.get_by_id(reservation_id).start_date == start_date + timedelta(days=3)
+
+    def test_checking_room_availability(self):
+        guest_id, room_id = self.__create_reservation_prerequisites()
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=3)
+        end_date = datetime.now(tz=pytz.utc) + timedelta(days=5)
+        reservation_id = ReservationService.create(
+            {
+                "room_id": room_id,
+                "guest_id": guest_id,
+                "start_date": start_date.isoformat("T"),
+                "end_date": end_date.isoformat("T"),
+                "amount_of_guests": 1
+            }
+        ).id
+
+        # Overlapping ranges (including the ones that touch the existing reservation) are not available
+        assert ReservationService.check_room_availability(
+            room_id, start_date + timedelta(days=1), end_date + timedelta(days=1)) is False
+        assert ReservationService.check_room_availability(
+            room_id, end_date, end_date + timedelta(days=1)) is False
+        assert ReservationService.check_room_availability(
+            room_id, end_date + timedelta(seconds=1), end_date + timedelta(days=1)) is True
+
+        # The reservation itself can be excluded from the check (i.e. when updating it)
+        assert ReservationService.check_room_availability(room_id, start_date, end_date, reservation_id) is True
+
+        # CANCELED reservations don't take the room
+        ReservationService.update(reservation_id, {"status": ReservationStatus.CANCELED})
+        assert ReservationService.check_room_availability(room_id, start_date, end_date) is True
+
+    def test_memoizing_room_availability(self):
+        guest_id, room_id = self.__create_reservation_prerequisites()
+        start_date = datetime.now(tz=pytz.utc) + timedelta(days=3)
+        end_date = datetime.now(tz=pytz.utc) + timedelta(days=5)
+
+        # Repeated checks (one at a time, or in batches) are answered from the memo
+        assert ReservationService.check_room_availability(room_id, start_date, end_date) is True
+        with self.assert_query_count(0):
+            assert ReservationService.check_room_availability(room_id, start_date, end_date) is True
+            assert ReservationService.check_rooms_availability([(room_id, start_date, end_date)]) == [True]
+        stats = RoomAvailabilityIndex().get_answer_stats()
+        assert (stats["hits"], stats["misses"]) == (2, 1)
+
+        # Writes to the reservations of the room bump its version, so the answers given before aren't read again
+        reservation_id = ReservationService.create(
+            {
+                "room_id": room_id,
+                "guest_id": guest_id,
+                "start_date": start_date.isoformat("T"),
+                "end_date": end_date.isoformat("T"),
+                "amount_of_guests": 1
+            }
+        ).id
+        assert ReservationService.check_room_availability(room_id, start_date, end_date) is False
+        assert ReservationService.check_rooms_availability([(room_id, start_date, end_date)]) == [False]
+
+        ReservationService.delete(reservation_id)
+        assert ReservationService.check_room_availability(room_id, start_date, end_date) is True
+        assert ReservationService.check_room_availability(room_id, start_date, end_date) is True
+        assert RoomAvailabilityIndex().get_answer_stats()["hit_rate"] == 4 / 7
+
     def __create_reservation_prerequisites(self) -> tuple[int, int]:
         """
         Creates a room and guest to be used for reservation purposes
@@ -0,0 +1,94 @@
+import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.entities.HttpStatuses import HttpStatuses
+from api.entities.ReservationStatus import ReservationStatus
+from api.service.ReservationService import ReservationService
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.ReservationDAO import ReservationDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestReservationServiceConcurrency(TestAppBase):
+    def test_concurrent_bookings_never_double_book_a_room(self):
+        room_ids, guest_id = self.__create_rooms_and_guest()
+        base_date = datetime.now(tz=pytz.utc).replace(minute=0, second=0, microsecond=0)
+
+        def book(worker: int) -> list[int]:
+            # Each worker has its own client (and therefore its own DB session), and tries to book random, mostly
+            # overlapping, date ranges for every room
+            client = self.app.test_client()
+            rng = random.Random(worker)
+            status_codes = []
+            for _ in range(TestReservationServiceConcurrency.__ATTEMPTS_PER_WORKER):
+                start_date = base_date + timedelta(hours=rng.randint(24, 24 * 10))
+                response = client.post(Routes.RESERVATIONS.value, json={
+                    "room_id": rng.choice(room_ids),
+                    "guest_id": guest_id,
+                    "start_date": start_date.isoformat(),
+                    "end_date": (start_date + timedelta(hours=rng.randint(6, 48))).isoformat(),
+                    "amount_of_guests": 1
+                })
+                status_codes.append(response.status_code)
+            return status_codes
+
+        # Counts the conflicts that made it past the locked check, only to be caught by the exclusion constraint
+        with mock.patch.object(ReservationDAO, "is_scheduling_conflict",
+                               wraps=ReservationDAO.is_scheduling_conflict) as is_scheduling_conflict:
+            with ThreadPoolExecutor(TestReservationServiceConcurrency.__WORKERS) as executor:
+                status_codes = [x for worker_status_codes in executor.map(book, range(self.__WORKERS))
+                                for x in worker_status_codes]
+
+        # The throughput under contention is measured by benchmarks/benchmark_concurrent_bookings.py
+        assert set(status_codes) <= {HttpStatuses.CREATED.value, HttpStatuses.BAD_REQUEST.value}
+        assert is_scheduling_conflict.call_count == 0
+
+        reservations_by_room = defaultdict(list)
+        for reservation in ReservationService.get_all():
+            if reservation.status == ReservationStatus.SCHEDULED:
+                reservations_by_room[reservation.room_id].append(reservation)
+        assert sum(len(x) for x in reservations_by_room.values()) == status_codes.count(HttpStatuses.CREATED.value)
+
+        for reservations in reservations_by_room.values():
+            reservations.sort(key=lambda x: x.start_date)
+            for reservation, next_reservation in zip(reservations, reservations[1:]):
+                assert reservation.end_date < next_reservation.start_date
+
+    def __create_rooms_and_guest(self) -> tuple[list[int], int]:
+        """
+        Creates the rooms that the workers compete for, and a guest to book them
+        :return: returns the IDs of the created resources in a tuple. (room_ids, guest_id)
+        """
+        rooms = []
+        for i in range(TestReservationServiceConcurrency.__ROOMS):
+            room = Room()
+            room.init_fields(f"Room {i}", 2)
+            rooms.append(room)
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+
+        AbstractDAO.begin()
+        for room in rooms:
+            RoomDAO.save(room)
+        GuestDAO.save(guest)
+        AbstractDAO.commit()
+        return [x.id for x in rooms], guest.id
+
+    """ Amount of threads booking rooms at the same time """
+    __WORKERS = 8
+
+    """ Amount of rooms the workers compete for """
+    __ROOMS = 4
+
+    """ Amount of bookings each worker attempts """
+    __ATTEMPTS_PER_WORKER = 25
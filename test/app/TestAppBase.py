@@ -1,11 +1,18 @@
+from contextlib import contextmanager
+from typing import Iterator
 from unittest import mock
 
 from alembic.command import downgrade, upgrade
 from alembic.config import Config
 from flask_testing import TestCase
+from sqlalchemy import event
 
+from api.service.EntityCache import EntityCache
+from api.service.ResponseCache import ResponseCache
+from api.service.RoomAvailabilityIndex import RoomAvailabilityIndex
 from config.CreateApp import create_app
 from db.AbstractDAO import AbstractDAO
+from db.ConnectionManager import ConnectionManager
 from test.config import MOCK_DATABASE_URL
 
 
@@ -43,5 +50,30 @@ class TestAppBase(TestCase):
         """
         # Remove the existing session
         AbstractDAO.get_connection().remove()
+        # Drop the in-process caches, since ids are reused once the db objects are recreated
+        RoomAvailabilityIndex().clear()
+        EntityCache().clear()
+        ResponseCache().clear()
         # Cleanup all the db objects
         downgrade(self.__alembic_cfg, "base")
+
+    @contextmanager
+    def assert_query_count(self, expected_query_count: int) -> Iterator[list[str]]:
+        """
+        Asserts that the code run inside of the context sends exactly the expected amount of queries to the DB
+        :param expected_query_count: amount of queries the code should send
+        :return: list where the queries are recorded as they're sent
+        """
+        queries = []
+
+        def record_query(conn, cursor, statement, parameters, context, executemany):
+            queries.append(statement)
+
+        engine = ConnectionManager().get_engine()
+        event.listen(engine, "before_cursor_execute", record_query)
+        try:
+            yield queries
+        finally:
+            event.remove(engine, "before_cursor_execute", record_query)
+
+        assert len(queries) == expected_query_count, "\n\n".join(queries)
@@ -0,0 +1,49 @@
+import numpy as np
+
+from benchmarks.OccupancyMatrix import OccupancyMatrix
+
+
+class TestOccupancyMatrix:
+    def test_building_the_matrix(self):
+        occupancy = OccupancyMatrix.build(
+            3, 5,
+            room_indexes=np.array([0, 0, 2, 2]),
+            start_nights=np.array([1, 2, -3, 4]),
+            end_nights=np.array([2, 3, 0, 10])
+        )
+
+        # Overlapping reservations and reservations partially outside the matrix are marked as expected
+        assert occupancy.tolist() == [
+            [False, True, True, True, False],
+            [False, False, False, False, False],
+            [True, False, False, False, True],
+        ]
+
+    def test_building_an_empty_matrix(self):
+        occupancy = OccupancyMatrix.build(2, 3, np.array([]), np.array([]), np.array([]))
+        assert occupancy.shape == (2, 3)
+        assert not occupancy.any()
+
+    def test_matches_a_linear_scan(self):
+        rng = np.random.default_rng(42)
+        rooms, nights = 20, 30
+        room_indexes = rng.integers(0, rooms, 200)
+        start_nights = rng.integers(-5, nights + 5, 200)
+        end_nights = start_nights + rng.integers(0, 4, 200)
+
+        occupancy = OccupancyMatrix.build(rooms, nights, room_indexes, start_nights, end_nights)
+
+        expected = np.zeros((rooms, nights), dtype=bool)
+        for room_index, start_night, end_night in zip(room_indexes, start_nights, end_nights):
+            for night in range(max(start_night, 0), min(end_night, nights - 1) + 1):
+                expected[room_index, night] = True
+        assert (occupancy == expected).all()
+
+        # Free rooms for each range agree with the matrix
+        check_rooms = rng.integers(0, rooms, 100)
+        check_starts = rng.integers(0, nights, 100)
+        check_ends = np.minimum(check_starts + rng.integers(0, 5, 100), nights - 1)
+        are_free = OccupancyMatrix.are_free(occupancy, check_rooms, check_starts, check_ends)
+        for is_free, room_index, start_night, end_night in zip(are_free, check_rooms, check_starts, check_ends):
+            assert is_free == (not expected[room_index, start_night:end_night + 1].any())
+            assert is_free == OccupancyMatrix.get_free_rooms(occupancy, start_night, end_night)[room_index]
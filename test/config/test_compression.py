@@ -0,0 +1,155 @@
+import gzip
+import json
+import os
+import zlib
+from datetime import datetime, timedelta
+
+import pytz
+
+from api.controllers.Routes import Routes
+from api.controllers.Streaming import Streaming
+from api.entities.HttpStatuses import HttpStatuses
+from api.entities.ReservationStatus import ReservationStatus
+from config.Compression import Compression
+from db.AbstractDAO import AbstractDAO
+from db.GuestDAO import GuestDAO
+from db.ReservationDAO import ReservationDAO
+from db.RoomDAO import RoomDAO
+from db.entities.Guest import Guest
+from db.entities.Reservation import Reservation
+from db.entities.Room import Room
+from test.app.TestAppBase import TestAppBase
+
+
+class TestCompression(TestAppBase):
+    def test_compressing_responses(self):
+        room_ids = self.__create_rooms(30)
+
+        response = self.client.get(Routes.ROOMS.value, headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.content_encoding == Compression.GZIP
+        assert "Accept-Encoding" in response.vary
+        assert [x["id"] for x in json.loads(gzip.decompress(response.get_data()))] == room_ids
+        # The ETag is weak, since the body isn't the same as the uncompressed one
+        etag, is_weak = response.get_etag()
+        assert is_weak
+
+        # The compressed response can still be revalidated
+        response = self.client.get(Routes.ROOMS.value,
+                                   headers={"Accept-Encoding": "gzip", "If-None-Match": f'W/"{etag}"'})
+        assert response.status_code == HttpStatuses.NOT_MODIFIED.value
+        assert "Accept-Encoding" in response.vary
+
+        # Clients that don't accept any encoding get the uncompressed response
+        for headers in ({}, {"Accept-Encoding": "identity"}, {"Accept-Encoding": "gzip;q=0"}):
+            response = self.client.get(Routes.ROOMS.value, headers=headers)
+            assert response.content_encoding is None
+            assert [x["id"] for x in response.json] == room_ids
+
+    def test_small_responses_are_not_compressed(self):
+        room_id = self.__create_rooms(1)[0]
+
+        response = self.client.get(f"{Routes.ROOMS.value}/{room_id}", headers={"Accept-Encoding": "gzip"})
+        assert response.content_encoding is None
+        assert response.json["id"] == room_id
+
+        # Unless the threshold is lowered
+        self.app.config[Compression.MIN_SIZE_CONFIG] = 0
+        response = self.client.get(f"{Routes.ROOMS.value}/{room_id}", headers={"Accept-Encoding": "gzip"})
+        assert response.content_encoding == Compression.GZIP
+        assert json.loads(gzip.decompress(response.get_data()))["id"] == room_id
+
+    def test_compressing_streamed_responses(self):
+        reservation_ids = self.__create_reservations(50)
+
+        response = self.client.get(Routes.RESERVATIONS.value,
+                                   headers={"Accept": Streaming.NDJSON_MIMETYPE, "Accept-Encoding": "gzip"})
+        assert response.status_code == HttpStatuses.OK.value
+        assert response.content_encoding == Compression.GZIP
+        assert response.content_length is None
+        lines = gzip.decompress(response.get_data()).splitlines()
+        assert [json.loads(x)["id"] for x in lines] == reservation_ids
+
+    def test_precompressed_files(self):
+        with open(os.path.join(self.app.static_folder, "swagger.yaml"), "rb") as f:
+            swagger = f.read()
+
+        for encoding in Compression.get_encodings():
+            response = self.client.get(Routes.SWAGGER_CONFIG.value, headers={"Accept-Encoding": encoding})
+            assert response.status_code == HttpStatuses.OK.value
+            assert response.content_encoding == encoding
+            assert self.__decompress(response.get_data(), encoding) == swagger
+            response.close()
+
+            response = self.client.get(Routes.INDEX.value, headers={"Accept-Encoding": encoding})
+            assert response.content_encoding == encoding
+            assert b"</html>" in self.__decompress(response.get_data(), encoding)
+
+        # The encoding the client prefers wins, and the server's preference breaks ties
+        response = self.client.get(Routes.INDEX.value, headers={"Accept-Encoding": "gzip, br;q=0.5, zstd;q=0.5"})
+        assert response.content_encoding == Compression.GZIP
+        response = self.client.get(Routes.INDEX.value, headers={"Accept-Encoding": "*"})
+        assert response.content_encoding == Compression.get_encodings()[0]
+
+        # Partial content is sent as it is
+        response = self.client.get(Routes.SWAGGER_CONFIG.value,
+                                   headers={"Accept-Encoding": "gzip", "Range": "bytes=0-9"})
+        assert response.status_code == HttpStatuses.PARTIAL_CONTENT.value
+        assert response.content_encoding is None
+        assert response.get_data() == swagger[:10]
+        response.close()
+
+    def __decompress(self, data: bytes, encoding: str) -> bytes:
+        """
+        :param data: compressed bytes
+        :param encoding: encoding they were compressed with
+        :return: decompressed bytes
+        """
+        if encoding == Compression.BROTLI:
+            import brotli
+            return brotli.decompress(data)
+        if encoding == Compression.ZSTD:
+            import zstandard
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        return zlib.decompress(data, 16 + zlib.MAX_WBITS)
+
+    def __create_rooms(self, amount: int) -> list[int]:
+        """
+        :param amount: amount of rooms to create
+        :return: IDs of the created rooms, in order
+        """
+        rooms = []
+        AbstractDAO.begin()
+        for i in range(amount):
+            room = Room()
+            room.init_fields(f"Room {i + 1}", 2)
+            RoomDAO.save(room)
+            rooms.append(room)
+        AbstractDAO.commit()
+        return [x.id for x in rooms]
+
+    def __create_reservations(self, amount: int) -> list[int]:
+        """
+        Creates the reservations of a guest for a room, one per day
+        :param amount: amount of reservations to create
+        :return: IDs of the created reservations, in order
+        """
+        room_id = self.__create_rooms(1)[0]
+        guest = Guest()
+        guest.init_fields("123", "Jorge", "Ocampo")
+        AbstractDAO.begin()
+        GuestDAO.save(guest)
+        AbstractDAO.commit()
+
+        start_date = datetime(2021, 9, 1, tzinfo=pytz.utc)
+        reservations = []
+        AbstractDAO.begin()
+        for i in range(amount):
+            reservation = Reservation()
+            reservation.init_fields(room_id, guest.id, start_date + timedelta(days=i),
+                                    start_date + timedelta(days=i, hours=12), 1, ReservationStatus.SCHEDULED)
+            ReservationDAO.save(reservation)
+            AbstractDAO.flush()
+            reservations.append(reservation)
+        AbstractDAO.commit()
+        return [x.id for x in reservations]
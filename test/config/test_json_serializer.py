@@ -0,0 +1,57 @@
+import json
+from datetime import datetime, timedelta
+
+import pytz
+from flask import Flask, jsonify
+
+from api.entities.ReservationStatus import ReservationStatus
+from api.entities.RoomCalendar import RoomCalendar
+from config.JSONEncoder import CustomJSONEncoder
+from config.JSONSerializer import JSONSerializer
+from db.entities.Guest import Guest
+from db.entities.Reservation import Reservation
+from db.entities.Room import Room
+
+
+class TestJSONSerializer:
+    def test_same_output_as_jsonify(self):
+        app = Flask(__name__)
+        app.json_encoder = CustomJSONEncoder
+
+        with app.app_context():
+            entities = self.__build_entities()
+            calendar = RoomCalendar(1, "2021-09-01", "2021-09-02", [{"date": "2021-09-01", "is_available": True}])
+
+            for o in (entities, entities[2], {"id": 1, "status": ReservationStatus.CANCELED}, calendar,
+                      {"duration": timedelta(days=1)}, []):
+                expected = jsonify(o).get_data()
+                assert JSONSerializer.jsonify(o).get_data() == expected
+                assert JSONSerializer.dumps_with_stdlib(o) + b"\n" == expected
+
+    def test_non_ascii_characters(self):
+        room = Room()
+        room.init_fields("Habitación 1", 2)
+
+        # orjson doesn't escape them, but they decode the same
+        assert json.loads(JSONSerializer.dumps(room))["name"] == "Habitación 1"
+        assert json.loads(JSONSerializer.dumps_with_stdlib(room))["name"] == "Habitación 1"
+
+    def __build_entities(self) -> list:
+        """
+        :return: list with a room, a guest and a reservation with all of their fields set
+        """
+        created_at = datetime(2021, 9, 1, 10, 30, tzinfo=pytz.utc)
+
+        room = Room()
+        room.init_fields("Room 1", 2)
+        guest = Guest()
+        guest.init_fields("12345678", "John", "Doe", False)
+        reservation = Reservation()
+        reservation.init_fields(1, 1, created_at + timedelta(days=1), created_at + timedelta(days=2, microseconds=5), 2,
+                                ReservationStatus.SCHEDULED)
+
+        for i, entity in enumerate((room, guest, reservation)):
+            entity.id = i + 1
+            entity.created_at = created_at
+        reservation.updated_at = created_at + timedelta(hours=1)
+        return [room, guest, reservation]
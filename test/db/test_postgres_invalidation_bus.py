@@ -0,0 +1,43 @@
+import time
+from threading import Event
+
+from db.ConnectionManager import ConnectionManager
+from db.PostgresInvalidationBus import PostgresInvalidationBus
+from test.app.TestAppBase import TestAppBase
+from utils.InvalidationBus import InvalidationBus
+
+
+class TestPostgresInvalidationBus(TestAppBase):
+    def test_messages_reach_the_other_processes_right_away(self):
+        # Each bus stands for a different worker
+        buses = [PostgresInvalidationBus(ConnectionManager().get_engine(), "test_cache_invalidation") for _ in range(3)]
+        received = [[] for _ in buses]
+        delivered = [Event() for _ in buses]
+        for bus, bus_received, bus_delivered in zip(buses, received, delivered):
+            bus.subscribe(lambda keys, r=bus_received, d=bus_delivered: (r.append(keys), d.set()))
+            bus.start()
+        try:
+            assert all(x.wait_until_listening(5) for x in buses)
+            # Messages may have been missed before listening, so everything is dropped first
+            assert received == [[[InvalidationBus.ALL]]] * len(buses)
+            for bus_received, bus_delivered in zip(received, delivered):
+                bus_received.clear()
+                bus_delivered.clear()
+
+            published_at = time.perf_counter()
+            buses[0].publish(["room:1", "room_reservations:1"])
+            assert delivered[1].wait(1) and delivered[2].wait(1)
+            assert time.perf_counter() - published_at < 0.5
+            assert received[1] == received[2] == [["room:1", "room_reservations:1"]]
+
+            # Publishers don't get their own messages back, and large messages are split
+            buses[1].publish([f"room:{x}" for x in range(1, 501)])
+            assert delivered[0].wait(1)
+            time.sleep(0.2)
+            assert [x for keys in received[0] for x in keys] == [f"room:{x}" for x in range(1, 501)]
+            assert received[1] == [["room:1", "room_reservations:1"]]
+        finally:
+            for bus in buses:
+                bus.stop()
+
+        assert not buses[0].wait_until_listening(0)
@@ -0,0 +1,86 @@
+import random
+
+from utils.IntervalIndex import IntervalIndex
+
+
+class TestIntervalIndex:
+    def test_overlaps(self):
+        index = IntervalIndex([(1, 10, 20), (2, 30, 40)])
+
+        assert index.overlaps(0, 5) is False
+        assert index.overlaps(21, 29) is False
+        assert index.overlaps(15, 25) is True
+        # Intervals touching at their edges overlap
+        assert index.overlaps(20, 30) is True
+        assert index.overlaps(41, 50) is False
+
+    def test_overlaps_excluding_an_interval(self):
+        index = IntervalIndex([(1, 10, 20), (2, 30, 40)])
+
+        assert index.overlaps(15, 25, excluded_key=1) is False
+        assert index.overlaps(15, 35, excluded_key=1) is True
+
+    def test_adding_and_removing_intervals(self):
+        index = IntervalIndex()
+        index.add(1, 10, 20)
+        index.add(2, 30, 40)
+        assert len(index) == 2
+        assert index.overlaps(15, 16) is True
+
+        # Adding an existing key moves the interval
+        index.add(1, 50, 60)
+        assert len(index) == 2
+        assert index.overlaps(15, 16) is False
+        assert index.overlaps(55, 56) is True
+
+        index.remove(2)
+        assert 2 not in index
+        assert index.overlaps(35, 36) is False
+
+    def test_matches_a_linear_scan(self):
+        rng = random.Random(42)
+        intervals = {}
+        index = IntervalIndex()
+        for key in range(200):
+            start = rng.randint(0, 1000)
+            intervals[key] = (start, start + rng.randint(0, 50))
+            index.add(key, *intervals[key])
+        for key in rng.sample(range(200), 50):
+            del intervals[key]
+            index.remove(key)
+
+        for _ in range(500):
+            start = rng.randint(0, 1100)
+            end = start + rng.randint(0, 30)
+            expected = any(s <= end and e >= start for s, e in intervals.values())
+            assert index.overlaps(start, end) is expected
+
+    def test_iterating_over_the_overlapping_intervals(self):
+        index = IntervalIndex([(1, 10, 20), (2, 30, 40), (3, 12, 14)])
+
+        assert sorted(index.iter_overlapping(13, 30)) == [(1, 10, 20), (2, 30, 40), (3, 12, 14)]
+        assert sorted(index.iter_overlapping(15, 25)) == [(1, 10, 20)]
+        assert list(index.iter_overlapping(41, 50)) == []
+
+    def test_iterating_over_long_histories(self):
+        rng = random.Random(7)
+        # A long interval that starts first, followed by many short ones, some of them starting at the same time
+        intervals = {0: (0, 10000)}
+        index = IntervalIndex([(0, 0, 10000)])
+        for key in range(1, 2000):
+            start = rng.randint(0, 10000) // 2 * 2
+            intervals[key] = (start, start + rng.randint(0, 5))
+            index.add(key, *intervals[key])
+        for key in rng.sample(range(1, 2000), 500):
+            del intervals[key]
+            index.remove(key)
+
+        for _ in range(200):
+            start = rng.randint(0, 10000)
+            end = start + rng.randint(0, 20)
+            overlapping = list(index.iter_overlapping(start, end))
+            expected = [(k, s, e) for k, (s, e) in intervals.items() if s <= end and e >= start]
+            assert sorted(overlapping) == sorted(expected)
+            # From the one that starts last to the one that starts first
+            assert [s for _, s, _ in overlapping] == sorted((s for _, s, _ in overlapping), reverse=True)
+            assert index.overlaps(start, end, excluded_key=0) is (len(overlapping) > 1)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 
 from utils.DateRange import DateRange
 
@@ -29,6 +29,28 @@ class DateUtils:
         assert isinstance(dt, datetime), type(dt)
         return dt.isoformat()
 
+    @staticmethod
+    def convert_datetime_to_epoch_microseconds(dt: datetime) -> int:
+        """
+        Converts a timezone aware datetime into the amount of microseconds since the unix epoch. Unlike
+        C{datetime.timestamp}, the result is exact, so it can be safely compared
+        :param dt: datetime to be converted
+        :return: microseconds since the unix epoch
+        """
+        assert isinstance(dt, datetime), type(dt)
+        assert dt.tzinfo is not None
+        return (dt - DateUtils.__EPOCH) // timedelta(microseconds=1)
+
+    @staticmethod
+    def convert_date_to_epoch_days(d: date) -> int:
+        """
+        Converts a date into the amount of days since the unix epoch
+        :param d: date to be converted
+        :return: days since the unix epoch
+        """
+        assert isinstance(d, date), type(d)
+        return (d - DateUtils.__EPOCH.date()).days
+
     @staticmethod
     def check_if_date_ranges_overlap(start_date_a: datetime, end_date_a: datetime, start_date_b: datetime,
                                      end_date_b: datetime) -> bool:
@@ -58,3 +80,6 @@ class DateUtils:
         delta = int((earliest_end - latest_start).total_seconds()) + 1
         overlap = max(0, delta)
         return overlap > 0
+
+    """ Unix epoch, as a timezone aware datetime """
+    __EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
@@ -0,0 +1,166 @@
+import itertools
+import random
+from typing import Hashable, Iterable, Iterator, Optional
+
+
+class IntervalIndex:
+    """
+    Interval tree of closed intervals: a binary search tree ordered by the start of the intervals, where each node also
+    keeps the max end of its subtree. Overlap checks skip the subtrees whose max end comes before the range being
+    checked, and the ones that start after it, so they take O(log n) plus O(log n) per overlapping interval found, no
+    matter how long the intervals are.
+
+    The tree is kept balanced as a treap: each node gets a random priority, and parents have higher priorities than
+    their children. Adding or removing an interval then takes O(log n) (expected) as well.
+    """
+    def __init__(self, intervals: Iterable[tuple[Hashable, int, int]] = ()):
+        """
+        Builds the index from the given intervals
+        :param intervals: tuples of (key, start, end) that identify each interval
+        """
+        self.__root: Optional[IntervalIndex.__Node] = None
+        # Node of each interval, by key
+        self.__nodes = {}
+        # Breaks the ties between intervals with the same start, so that every node has its own place in the tree
+        self.__sequence = itertools.count()
+
+        for key, start, end in intervals:
+            self.add(key, start, end)
+
+    def __len__(self) -> int:
+        return len(self.__nodes)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.__nodes
+
+    def add(self, key: Hashable, start: int, end: int):
+        """
+        Adds an interval to the index. If an interval with the same key exists, it's replaced
+        :param key: identifier of the interval
+        :param start: start of the interval
+        :param end: end of the interval
+        """
+        assert end >= start, (start, end)
+        self.remove(key)
+
+        node = IntervalIndex.__Node(key, start, end, next(self.__sequence))
+        left, right = IntervalIndex.__split(self.__root, node.start, node.sequence)
+        self.__root = IntervalIndex.__merge(IntervalIndex.__merge(left, node), right)
+        self.__nodes[key] = node
+
+    def remove(self, key: Hashable):
+        """
+        Removes an interval from the index, if it exists
+        :param key: identifier of the interval
+        """
+        node = self.__nodes.pop(key, None)
+        if node is None:
+            return
+
+        left, rest = IntervalIndex.__split(self.__root, node.start, node.sequence)
+        _, right = IntervalIndex.__split(rest, node.start, node.sequence + 1)
+        self.__root = IntervalIndex.__merge(left, right)
+
+    def overlaps(self, start: int, end: int, excluded_key: Hashable = None) -> bool:
+        """
+        Checks if any interval in the index overlaps with the given one. Intervals that only touch at their edges are
+        considered to overlap
+        :param start: start of the interval to check
+        :param end: end of the interval to check
+        :param excluded_key: if included, that interval is taken out of consideration
+        :return: C{True} if at least one interval overlaps, C{False} otherwise
+        """
+        return any(key != excluded_key for key, _, _ in self.iter_overlapping(start, end))
+
+    def iter_overlapping(self, start: int, end: int) -> Iterator[tuple[Hashable, int, int]]:
+        """
+        Iterates over the intervals that overlap with the given one, from the one that starts last to the one that
+        starts first. Intervals that only touch at their edges are considered to overlap
+        :param start: start of the interval to check
+        :param end: end of the interval to check
+        :return: iterator of (key, start, end) tuples
+        """
+        # Holds the subtrees left to visit, and the overlapping intervals left to yield, in reverse order
+        pending = [self.__root]
+        while pending:
+            item = pending.pop()
+            if isinstance(item, tuple):
+                yield item
+                continue
+
+            # None of the intervals of the subtree end after the start of the one being checked
+            if item is None or item.max_end < start:
+                continue
+            pending.append(item.left)
+            # Only the intervals that start before the end of the one being checked can overlap with it
+            if item.start <= end:
+                if item.end >= start:
+                    pending.append((item.key, item.start, item.end))
+                pending.append(item.right)
+
+    @staticmethod
+    def __split(node: Optional["IntervalIndex.__Node"], start: int,
+                sequence: int) -> tuple[Optional["IntervalIndex.__Node"], Optional["IntervalIndex.__Node"]]:
+        """
+        Splits a subtree in two, around a position of the tree
+        :param node: root of the subtree
+        :param start: start of the position
+        :param sequence: sequence number of the position, to break ties between intervals with the same start
+        :return: tuple with the roots of the subtree with the nodes before the position, and the one with the rest
+        """
+        if node is None:
+            return None, None
+        if (node.start, node.sequence) < (start, sequence):
+            node.right, right = IntervalIndex.__split(node.right, start, sequence)
+            node.update()
+            return node, right
+        left, node.left = IntervalIndex.__split(node.left, start, sequence)
+        node.update()
+        return left, node
+
+    @staticmethod
+    def __merge(left: Optional["IntervalIndex.__Node"],
+                right: Optional["IntervalIndex.__Node"]) -> Optional["IntervalIndex.__Node"]:
+        """
+        Merges two subtrees, where every node of the left one comes before every node of the right one
+        :param left: root of the left subtree
+        :param right: root of the right subtree
+        :return: root of the merged subtree
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = IntervalIndex.__merge(left.right, right)
+            left.update()
+            return left
+        right.left = IntervalIndex.__merge(left, right.left)
+        right.update()
+        return right
+
+    class __Node:
+        """
+        Node of the tree, holding an interval along with the max end of its subtree
+        """
+        __slots__ = ("key", "start", "end", "sequence", "priority", "max_end", "left", "right")
+
+        def __init__(self, key: Hashable, start: int, end: int, sequence: int):
+            self.key = key
+            self.start = start
+            self.end = end
+            self.sequence = sequence
+            self.priority = random.random()
+            self.max_end = end
+            self.left = None
+            self.right = None
+
+        def update(self):
+            """
+            Recomputes the max end of the subtree after its children changed
+            """
+            self.max_end = self.end
+            if self.left is not None and self.left.max_end > self.max_end:
+                self.max_end = self.left.max_end
+            if self.right is not None and self.right.max_end > self.max_end:
+                self.max_end = self.right.max_end
@@ -0,0 +1,54 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable
+
+
+class InvalidationBus(ABC):
+    """
+    Broadcasts the keys of the cached values that a write invalidated to the rest of the processes serving the app
+    (i.e. the other gunicorn workers), so that they drop them as well. Processes publish the keys once the write is
+    committed, and subscribe to the ones published by the rest. Messages aren't delivered back to the bus that published
+    them, since its process already updated its own caches.
+
+    Delivery is best effort: whenever a backend may have missed messages (i.e. while it was reconnecting), it delivers
+    C{ALL}, so that the subscribers drop everything. The TTLs of the caches bound how stale they can get otherwise
+    """
+    def __init__(self):
+        self.__handlers: list[Callable[[list[str]], None]] = []
+
+    def subscribe(self, handler: Callable[[list[str]], None]):
+        """
+        :param handler: function called with the keys of every message published by other processes. It may be called
+        from a background thread
+        """
+        self.__handlers.append(handler)
+
+    @abstractmethod
+    def publish(self, keys: Iterable[str]):
+        """
+        Sends the keys to the other processes
+        :param keys: keys of the cached values that were invalidated
+        """
+        pass
+
+    def start(self):
+        """
+        Starts receiving the messages published by other processes
+        """
+        pass
+
+    def stop(self):
+        """
+        Stops receiving messages, and releases the resources of the bus
+        """
+        pass
+
+    def deliver(self, keys: list[str]):
+        """
+        Hands the keys of a message that arrived to the subscribers. Called by the backends
+        :param keys: keys of the cached values that were invalidated
+        """
+        for handler in self.__handlers:
+            handler(keys)
+
+    """ Key delivered when every cached value has to be dropped """
+    ALL = "*"
@@ -0,0 +1,136 @@
+import time
+from collections import OrderedDict
+from threading import RLock
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded cache that evicts the least recently used entries first.
+    Entries can optionally expire after a given amount of time.
+    """
+    def __init__(self, max_size: int, ttl_seconds: Optional[float] = None):
+        """
+        :param max_size: max amount of entries held by the cache
+        :param ttl_seconds: if included, entries expire after this amount of seconds
+        """
+        assert isinstance(max_size, int), type(max_size)
+        assert max_size > 0, max_size
+        assert ttl_seconds is None or ttl_seconds > 0, ttl_seconds
+
+        self.__max_size = max_size
+        self.__ttl_seconds = ttl_seconds
+        self.__entries = OrderedDict()
+        self.__lock = RLock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Fetches the value cached for the key, marking it as the most recently used
+        :param key: key of the entry
+        :param default: value to return if the key isn't cached (or has expired)
+        :return: the cached value if found, C{default} otherwise
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or self.__is_expired(entry):
+                if entry is not None:
+                    del self.__entries[key]
+                self.__misses += 1
+                return default
+
+            self.__entries.move_to_end(key)
+            self.__hits += 1
+            return entry[0]
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Fetches the value cached for the key. If it isn't cached, it's loaded and then cached
+        :param key: key of the entry
+        :param loader: function that returns the value for the key
+        :return: the cached or loaded value
+        """
+        value = self.get(key, LRUCache.__MISSING)
+        if value is LRUCache.__MISSING:
+            # The lock isn't held while loading, since that could take a while (i.e. a DB query). At worst, concurrent
+            # misses for the same key load it more than once
+            value = loader()
+            self.put(key, value)
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Caches the value for the key, evicting the least recently used entry if the cache is full
+        :param key: key of the entry
+        :param value: value to cache
+        """
+        with self.__lock:
+            self.__entries[key] = (value, time.monotonic())
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+                self.__evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Removes the entry for the key from the cache
+        :param key: key of the entry
+        :param default: value to return if the key isn't cached
+        :return: the value that was cached, C{default} if there was none
+        """
+        with self.__lock:
+            entry = self.__entries.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def peek(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Fetches the value cached for the key, without affecting the LRU order nor the counters
+        :param key: key of the entry
+        :param default: value to return if the key isn't cached (or has expired)
+        :return: the cached value if found, C{default} otherwise
+        """
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None or self.__is_expired(entry):
+                return default
+            return entry[0]
+
+    def clear(self):
+        """
+        Removes all the entries from the cache and resets its counters
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+
+    def get_stats(self) -> dict:
+        """
+        Counters that show how the cache is performing
+        :return: dictionary with the size of the cache and its hits, misses and evictions
+        """
+        with self.__lock:
+            return {
+                "size": len(self.__entries),
+                "max_size": self.__max_size,
+                "hits": self.__hits,
+                "misses": self.__misses,
+                "evictions": self.__evictions,
+            }
+
+    def __is_expired(self, entry: tuple[Any, float]) -> bool:
+        """
+        Checks if an entry has outlived the TTL of the cache
+        :param entry: tuple of (value, time when it was cached)
+        :return: C{True} if the entry has expired, C{False} otherwise
+        """
+        return self.__ttl_seconds is not None and time.monotonic() - entry[1] > self.__ttl_seconds
+
+    """ Sentinel to tell apart missing entries from cached None values """
+    __MISSING = object()
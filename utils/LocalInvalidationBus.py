@@ -0,0 +1,36 @@
+from collections import defaultdict
+from typing import Iterable
+from weakref import WeakSet
+
+from utils.InvalidationBus import InvalidationBus
+
+
+class LocalInvalidationBus(InvalidationBus):
+    """
+    In-process stand-in of the bus, for tests and single-process deployments. The started buses of the same channel
+    stand for different processes: the messages published by any of them are delivered to the rest right away, from the
+    thread that published them
+    """
+    def __init__(self, channel: str = "default"):
+        """
+        :param channel: name of the channel the bus publishes to and receives from
+        """
+        super().__init__()
+        self.__channel = channel
+
+    def publish(self, keys: Iterable[str]):
+        keys = list(keys)
+        if not keys:
+            return
+        for bus in list(LocalInvalidationBus.__BUSES[self.__channel]):
+            if bus is not self:
+                bus.deliver(keys)
+
+    def start(self):
+        LocalInvalidationBus.__BUSES[self.__channel].add(self)
+
+    def stop(self):
+        LocalInvalidationBus.__BUSES[self.__channel].discard(self)
+
+    """ Started buses of each channel """
+    __BUSES: dict[str, WeakSet] = defaultdict(WeakSet)